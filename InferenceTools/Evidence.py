@@ -1,32 +1,74 @@
 from typing import List
+
+import numpy as np
+
 from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.RunLengthWord import RunLengthWord
 from WordsAndSymbols.Word import Word
 
 class Evidence:
-    def __init__(self, strings: List[str], alphabet: Alphabet, k: int, l: int):
+    def __init__(self, strings: List[str], alphabet: Alphabet, k: int, l: int, run_length: bool = False):
         """
         Initialize the Evidence object.
 
         :type problem: The parameters of the problem to be solved, raw strings, k, l, etc.
         :param alphabet: The Alphabet object for symbol management.
+        :param run_length: Store the words as RunLengthWords, for evidence dominated by long runs of one symbol.
         """
         self.alphabet = alphabet
         self.k = k
         self.l = l
-        self.words = [Word.from_string(string=s, alphabet=self.alphabet, k=self.k, l=self.l) for s in strings]
+        word_class = RunLengthWord if run_length else Word
+        self.words = [word_class.from_string(string=s, alphabet=self.alphabet, k=self.k, l=self.l) for s in strings]
         self.sacs = list()
         self.sacs_to_solve = list()
+        self._sac_count_matrix = None
+        self._parikh_matrix = None
 
         for i, w in enumerate(self.words):
             w.original_string = strings[i]
 
+        # Maps a SaC's ID in the alphabet's registry to its position in self.sacs (-1 if not in the evidence)
+        registry = self.alphabet.sac_registry
+        self.sac_index = [-1 for _ in range(len(registry))]
+        self.sac_ids = list()  # The registry ID of each SaC in self.sacs
+
         for w in self.words[:-1]:
-            sacs_in_word = set(w)
-            for sac in sacs_in_word:
-                if self.alphabet.get_symbol(sac.symbol) in self.alphabet.variables and sac not in self.sacs_to_solve:
-                    self.sacs_to_solve.append(sac)
-                if sac not in self.sacs:
+            for sac_id in dict.fromkeys(w.runs()[0].tolist()):
+                if self.sac_index[sac_id] == -1:
+                    sac = registry[sac_id]
+                    self.sac_index[sac_id] = len(self.sacs)
                     self.sacs.append(sac)
+                    self.sac_ids.append(sac_id)
+                    if self.alphabet.get_symbol(sac.symbol) in self.alphabet.variables:
+                        self.sacs_to_solve.append(sac)
 
     def get_sac_id(self, sac):
-        return self.sacs.index(sac)
\ No newline at end of file
+        sac_id = self.alphabet.sac_registry.get_id(sac)
+        if sac_id is None or sac_id >= len(self.sac_index) or self.sac_index[sac_id] == -1:
+            raise ValueError(f"{sac} is not in the evidence")
+        return self.sac_index[sac_id]
+
+
+    def sac_count_matrix(self) -> np.ndarray:
+        """
+        Count every evidence SaC in every word.
+
+        :return: A (words x SaCs) int64 matrix, the columns are in the order of self.sacs.
+        """
+        if self._sac_count_matrix is None:
+            num_sacs = len(self.alphabet.sac_registry)
+            self._sac_count_matrix = np.array([w.sac_count_vector(num_sacs)[self.sac_ids] for w in self.words],
+                                              dtype=np.int64).reshape(len(self.words), len(self.sacs))
+        return self._sac_count_matrix
+
+    def parikh_matrix(self) -> np.ndarray:
+        """
+        Count every symbol of the alphabet in every word.
+
+        :return: A (words x symbols) int64 matrix of Parikh vectors, the columns are indexed by symbol ID.
+        """
+        if self._parikh_matrix is None:
+            num_symbols = self.alphabet.num_symbol_ids()
+            self._parikh_matrix = np.array([w.parikh_vector(num_symbols) for w in self.words], dtype=np.int64)
+        return self._parikh_matrix
@@ -1,5 +1,6 @@
 import importlib
 from InferenceTools.MasterAnalysisObject import MasterAnalysisObject
+from InferenceTools.PropagationScheduler import PropagationScheduler
 from LSystems.LSystemsSettings import LSystemSettings
 from Utility.parikh_analysis import analyze_words_growth, analyze_words_length
 
@@ -53,50 +54,48 @@ class LSystemInference:
         print(f"\n Check for Ambiguity")
         self.MAO.compute_length_absolute_min_max()
 
-        while self.MAO.flag:
-            print(f"\n RESET MAO FLAG")
-            self.MAO.flag = False
-
-            print(f"\n STEP 1 - COMPUTE LENGTH | Total Length Production")
-
-            print(f"\n STEP 1 - REFINE WORD METRICS")
-            # Refine unaccounted for growth & length
-            self.MAO.compute_unaccounted_growth_matrix()
-            self.MAO.compute_unaccounted_length_matrix()
-
-            print(f"\n STEP 3 - PARIKH ANALYSIS")
-            # A. Parikh Analysis
-            print(f"   Solve Parikh Growth Matrix")
-            growth_matrix = analyze_words_growth(self.problem)
-            print(f"   Solve Parikh Length Matrix")
-            length_matrix = analyze_words_length(self.problem)
-
-            print(f"\n STEP 4 - Computing Length from Total Symbol Production")
-            self.MAO.compute_length_total_symbol_production()
-
-            print(f"\n STEP 5 - Computing Total Length from Total Symbol Production")
-            #print(f"\n          Without Identities")
-            self.MAO.compute_total_length_total_symbol_production(include_identities=False)
-            # TODO: Check this later with other L-systems there is potential information here, maybe. It is odd.
-            #print(f"\n          With Identities")
-            #self.MAO.compute_total_length_total_symbol_production(include_identities=True)
-
-            print(f"\n STEP 5 - Computing Length from Total Length")
-            #print(f"\n          Without Identities")
-            self.MAO.compute_length_total_length()
-
-            print(f"\n STEP X - Computing Fragment from Markers")
-            print(f"\n STEP X - Computing Fragment from Overlapping")
-            print(f"\n STEP X - Computing Fragment from Partial Solution")
-            print(f"\n STEP X - Localization")
-
-            print(f"\n Compute Minimum Variables")
-            selected_sacs = self.MAO.find_minimum_sacs_set()
-            print(selected_sacs)
-            print(f"\n Compute Minimum P-Space")
-            selected_sacs, pspace_size = self.MAO.find_smallest_pspace()
-            print(f"{selected_sacs}\n{pspace_size}")
-            pass
+        print(f"\n PROPAGATE BOUNDS")
+        # Every deduction is applied per word, and only re-applied to the words where a bound it reads was tightened
+        scheduler = PropagationScheduler(self.MAO)
+        print(f"\n STEP 4 - Computing Length from Total Symbol Production")
+        scheduler.add("length_total_symbol_production",
+                      lambda words: self.MAO.compute_length_total_symbol_production(words=words),
+                      reads=["min_length", "max_length"])
+        print(f"\n STEP 5 - Computing Total Length from Total Symbol Production")
+        # TODO: Check this later with other L-systems there is potential information here (include_identities=True)
+        scheduler.add("total_length_total_symbol_production",
+                      lambda words: self.MAO.compute_total_length_total_symbol_production(include_identities=False,
+                                                                                          words=words),
+                      reads=["min_length", "max_length"])
+        evaluations = scheduler.run()
+        print(f"   Fixed point reached after {evaluations} deduction evaluations")
+
+        print(f"\n STEP 5 - Computing Length from Total Length")
+        self.MAO.compute_length_total_length()
+
+        print(f"\n STEP 1 - REFINE WORD METRICS")
+        # Refine unaccounted for growth & length
+        self.MAO.compute_unaccounted_growth_matrix()
+        self.MAO.compute_unaccounted_length_matrix()
+
+        print(f"\n STEP 3 - PARIKH ANALYSIS")
+        # A. Parikh Analysis
+        print(f"   Solve Parikh Growth Matrix")
+        growth_matrix = analyze_words_growth(self.problem)
+        print(f"   Solve Parikh Length Matrix")
+        length_matrix = analyze_words_length(self.problem)
+
+        print(f"\n STEP X - Computing Fragment from Markers")
+        print(f"\n STEP X - Computing Fragment from Overlapping")
+        print(f"\n STEP X - Computing Fragment from Partial Solution")
+        print(f"\n STEP X - Localization")
+
+        print(f"\n Compute Minimum Variables")
+        selected_sacs = self.MAO.find_minimum_sacs_set()
+        print(selected_sacs)
+        print(f"\n Compute Minimum P-Space")
+        selected_sacs, pspace_size = self.MAO.find_smallest_pspace()
+        print(f"{selected_sacs}\n{pspace_size}")
 
 
 
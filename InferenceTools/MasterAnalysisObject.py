@@ -1,9 +1,26 @@
 import copy
 import math
 
+import numpy as np
+
 from Utility.analysis_utils import create_length_equation
 
 
+# The bounds kept by the MAO, and whether each one is tightened by raising it (a lower bound) or by lowering it
+BOUNDS = {
+    "min_growth": True,
+    "max_growth": False,
+    "min_length": True,
+    "max_length": False,
+    "total_length_min": False,  # Lowered like the maximum, as set_total_length_min() always did
+    "total_length_max": False,
+}
+
+# Bounds are integers, clipped to +-BOUND_LIMIT. A word has fewer than 2**31 symbols, so a sum of count * bound over a
+# word stays below 2**62 and the int64 arithmetic of the deductions cannot overflow
+BOUND_LIMIT = np.iinfo(np.int32).max
+
+
 class MasterAnalysisObject:
     def __init__(self, problem):
         """
@@ -14,32 +31,40 @@ class MasterAnalysisObject:
         - problem: An object containing sacs_to_solve (list of sacs) and alphabet (with mappings dictionary).
         """
         self.problem = problem
-        self.flag = True
-
-        self.min_growth = []
-        self.max_growth = []
-        self.min_length = []
-        self.max_length = []
         self.fragments = []  # List of Fragment objects
 
         # These numbers get calculated a LOT so store them makes life easier
-        self.num_symbols = len(self.problem.evidence.alphabet.symbols)
+        self.num_symbols = self.problem.evidence.alphabet.num_symbol_ids()  # Symbol IDs index the growth bounds
         self.num_sacs = len(self.problem.evidence.sacs)
         self.num_words = len(self.problem.evidence.words)
+        self.successor_lengths = np.array([len(w) for w in self.problem.evidence.words[1:]], dtype=np.int64)
+
+        # The symbol of every SaC in evidence.sacs, and whether it is an identity
+        self.sac_symbols = np.array([sac.symbol for sac in self.problem.evidence.sacs], dtype=np.int64)
+        self.sac_is_identity = np.isin(self.sac_symbols, list(self.problem.evidence.alphabet.identities_ids))
 
-        self.min_growth = [[0 for _ in range(self.num_symbols)] for _ in range(self.num_sacs)]
-        self.max_growth = [[0 for _ in range(self.num_symbols)] for _ in range(self.num_sacs)]
+        # The bounds are indexed by the SaC's position in evidence.sacs (see Evidence.get_sac_id) and by symbol ID.
+        # Lengths and growths are whole numbers, so the bounds are integer intervals
+        self.min_growth = np.zeros((self.num_sacs, self.num_symbols), dtype=np.int64)
+        self.max_growth = np.zeros((self.num_sacs, self.num_symbols), dtype=np.int64)
 
-        self.min_length = [0 for _ in range(self.num_sacs)]
-        self.max_length = [0 for _ in range(self.num_sacs)]
+        self.min_length = np.zeros(self.num_sacs, dtype=np.int64)
+        self.max_length = np.zeros(self.num_sacs, dtype=np.int64)
 
-        self.symbol_counts = [[0 for _ in range(self.num_symbols)] for _ in range(self.num_words)]
-        self.word_unaccounted_growth = [[0 for _ in range(self.num_symbols)] for _ in range(self.num_words-1)]
-        self.word_unaccounted_length = [0 for _ in range(self.num_words-1)]
+        self.symbol_counts = np.zeros((self.num_words, self.num_symbols), dtype=np.int64)
+        self.word_unaccounted_growth = np.zeros((self.num_words-1, self.num_symbols), dtype=np.int64)
+        self.word_unaccounted_length = np.zeros(self.num_words-1, dtype=np.int64)
 
         # the sum of the successors in each word have to be within the min/max of the values stored here
-        self.total_length_min = [0 for _ in range(self.num_words-1)]
-        self.total_length_max = [0 for _ in range(self.num_words-1)]
+        self.total_length_min = np.zeros(self.num_words-1, dtype=np.int64)
+        self.total_length_max = np.zeros(self.num_words-1, dtype=np.int64)
+
+        # Cached products of the SaC counts and a bound, see _accounted()
+        self._products = {}
+
+        # The entries of every bound that were tightened since the flag was last reset
+        self.changes = {name: np.zeros(getattr(self, name).shape, dtype=bool) for name in BOUNDS}
+        self._flag = True
 
         # an equation if a dictionary containing a list of sacs and a value
         # e.g.: { 'sacs' : List[sac], 'value' : int }
@@ -54,35 +79,86 @@ class MasterAnalysisObject:
         self.compute_unaccounted_length_matrix()
         self.problem.MAO = self
 
+    @property
+    def flag(self):
+        """True if a bound was tightened since the flag was last reset, see changes."""
+        return self._flag or any(mask.any() for mask in self.changes.values())
+
+    @flag.setter
+    def flag(self, value):
+        # Resetting the flag also clears the change masks, setting it forces another pass
+        self._flag = bool(value)
+        if not value:
+            for mask in self.changes.values():
+                mask[...] = False
+
+    def tighten(self, name, index, values):
+        """
+        Tighten many entries of a bound at once, an entry only changes if the new value is tighter.
+
+        Lower bounds (min_growth, min_length) only increase and upper bounds only decrease. total_length_min, like
+        set_total_length_min(), only decreases. An index can appear more than once, the tightest value is kept.
+        Fractional values are rounded inward, up for bounds that are raised and down for bounds that are lowered.
+
+        :param name: The name of the bound, one of BOUNDS.
+        :param index: An index into the bound array (an integer array, a tuple of them for 2D bounds, or a mask).
+        :param values: The new values, broadcast against the index.
+        :return: The indices of the entries that changed, a tuple with an array per dimension as from np.nonzero().
+        """
+        bounds = getattr(self, name)
+        values = self._round_inward(name, values)
+        if isinstance(index, np.ndarray) and index.dtype == bool:
+            index = np.nonzero(index)
+        index = tuple(np.broadcast_arrays(*index)) if isinstance(index, tuple) else (np.asarray(index),)
+        before = bounds[index]  # Only the indexed entries are compared, not the whole bound
+        if BOUNDS[name]:
+            np.maximum.at(bounds, index, values)
+        else:
+            np.minimum.at(bounds, index, values)
+        tightened = bounds[index] != before
+        # An entry indexed more than once is reported once
+        changed = np.ravel_multi_index(tuple(i[tightened] for i in index), bounds.shape)
+        changed = np.unravel_index(np.unique(changed), bounds.shape)
+        self.changes[name][changed] = True
+        return changed
+
+    def _tighten_entry(self, name, index, value):
+        """Tighten a single entry of a bound, see tighten()."""
+        bounds = getattr(self, name)
+        value = self._round_inward(name, value)
+        if bounds[index] < value if BOUNDS[name] else bounds[index] > value:
+            bounds[index] = value
+            self.changes[name][index] = True
+
+    @staticmethod
+    def _round_inward(name, values):
+        """Round values to integers in the direction a bound is tightened, and clip them to +-BOUND_LIMIT."""
+        values = np.asarray(values)
+        if values.dtype.kind == "f":
+            values = np.ceil(values) if BOUNDS[name] else np.floor(values)
+        return np.clip(values, -BOUND_LIMIT, BOUND_LIMIT).astype(np.int64)
+
     def set_min_growth(self, sac, symbol, value):
-        if self.min_growth[self.problem.evidence.get_sac_id(sac)][symbol] < value:
-            self.min_growth[self.problem.evidence.get_sac_id(sac)][symbol] = value
-            self.flag = True
+        self._tighten_entry("min_growth", (self.problem.evidence.get_sac_id(sac), symbol), value)
 
     def set_max_growth(self, sac, symbol, value):
-        if self.max_growth[self.problem.evidence.get_sac_id(sac)][symbol] > value:
-            self.max_growth[self.problem.evidence.get_sac_id(sac)][symbol] = value
-            self.flag = True
+        self._tighten_entry("max_growth", (self.problem.evidence.get_sac_id(sac), symbol), value)
 
     def set_min_length(self, sac, value):
-        if self.min_length[self.problem.evidence.get_sac_id(sac)] < value:
-            self.min_length[self.problem.evidence.get_sac_id(sac)] = value
-            self.flag = True
+        self._tighten_entry("min_length", self.problem.evidence.get_sac_id(sac), value)
 
     def set_max_length(self, sac, value):
-        if self.max_length[self.problem.evidence.get_sac_id(sac)] > value:
-            self.max_length[self.problem.evidence.get_sac_id(sac)] = value
-            self.flag = True
+        self._tighten_entry("max_length", self.problem.evidence.get_sac_id(sac), value)
 
     def set_total_length_min(self, iWord, value):
-        if self.total_length_min[iWord] > value:
-            self.total_length_min[iWord] = value
-            self.flag = True
+        self._tighten_entry("total_length_min", iWord, value)
 
     def set_total_length_max(self, iWord, value):
-        if self.total_length_max[iWord] > value:
-            self.total_length_max[iWord] = value
-            self.flag = True
+        self._tighten_entry("total_length_max", iWord, value)
+
+    def _predecessor_words(self, words=None):
+        """The indices of the given predecessor words, or of every word but the last."""
+        return range(self.num_words - 1) if words is None else words
 
     # These get called a lot so it just keeps the code cleaner
     def get_min_growth(self, sac, symbol):
@@ -127,27 +203,24 @@ class MasterAnalysisObject:
         Computes the absolute minimum and maximum lengths for each symbol in evidence.
         """
         print("\nComputing Absolute Min/Max Length")
+        registry = self.problem.evidence.alphabet.sac_registry
         for iWord, w in enumerate(self.problem.evidence.words[:-1]):
-            reserve_right = 0
-            reserve_left = 0
-
-            # Compute reserve_right
-            for iSac, sac in enumerate(w):
+            # Every position reserves its minimum length in the next word. The reserves left and right of a position
+            # always add up to the reserve of the whole word, so it is computed once from the runs
+            reserve = 0
+            variable_sacs = {}
+            for sac_id, run_length in zip(*(run.tolist() for run in w.runs())):
+                sac = registry[sac_id]
                 if sac.symbol not in self.problem.evidence.alphabet.identities_ids:
-                    reserve_right += self.problem.absolute_min_length
+                    reserve += run_length * self.problem.absolute_min_length
+                    variable_sacs[sac_id] = sac
                 else:
-                    reserve_right += 1
+                    reserve += run_length
 
             # Compute Min/Max Length for each position
-            for iSac, sac in enumerate(w):
-                max_length = len(self.problem.evidence.words[iWord+1]) - (reserve_left + reserve_right)
-                if sac.symbol not in self.problem.evidence.alphabet.identities_ids:
-                    self.set_max_length(sac, max_length)
-                    reserve_right -= self.problem.absolute_min_length
-                    reserve_left += self.problem.absolute_min_length
-                else:
-                    reserve_right -= 1
-                    reserve_left += 1
+            for sac in variable_sacs.values():
+                max_length = len(self.problem.evidence.words[iWord+1]) - reserve
+                self.set_max_length(sac, max_length)
 
     def compute_absolute_minmax_growth(self):
         """
@@ -158,92 +231,104 @@ class MasterAnalysisObject:
         print("\nComputing Absolute Min/Max Growth")
         pass
 
-    def compute_length_total_symbol_production(self):
+    def compute_length_total_symbol_production(self, words=None):
         """
         Computes the minimum and maximum lengths of symbols in W1 based on their
         contributions to the total length of W2.
+
+        Every other SaC of the word produces at least count * min and at most count * max symbols. This is the sum
+        over the whole word minus the SaC's own share, so all SaCs of all words are handled with a few array
+        operations.
+
+        :param words: The indices of the predecessor words to analyze, all of them by default.
+        :return: The entries of the bounds that were tightened, by bound name, see tighten().
         """
-        for iWord, w in enumerate(self.problem.evidence.words[:-1]):
-            total_length = len(self.problem.evidence.words[iWord+1])
-            for sac1, count1 in w.sac_counts.items():
-                produced_min = 0
-                produced_max = 0
-                # no need to do this calculation for symbols with identity
-                for sac2, count2 in w.sac_counts.items():
-                    # for every other sac compute how much they produce
-                    if sac1 != sac2:
-                        produced_min += count2 * self.problem.MAO.get_min_length(sac2)
-                        produced_max += count2 * self.problem.MAO.get_max_length(sac2)
+        rows, counts = self._word_sac_counts(words)
+        total_lengths = self.successor_lengths[rows]
 
-                remainder_min = max(0,total_length - produced_max)
-                remainder_max = max(0,total_length - produced_min)
+        # What the other SaCs of the word produce, for every (word, SaC) pair
+        word_min = counts @ self.min_length
+        word_max = counts @ self.max_length
+        iRow, iSac = np.nonzero(counts)
+        count = counts[iRow, iSac]
+        produced_min = word_min[iRow] - count * self.min_length[iSac]
+        produced_max = word_max[iRow] - count * self.max_length[iSac]
 
-                min_length = remainder_min / count1
-                max_length = remainder_max / count1
+        remainder_min = np.maximum(0, total_lengths[iRow] - produced_max)
+        remainder_max = np.maximum(0, total_lengths[iRow] - produced_min)
 
-                self.problem.MAO.set_min_length(sac1, min_length)
-                self.problem.MAO.set_max_length(sac1, max_length)
+        # Exact integer division, rounded up for the minimum and down for the maximum
+        return {"min_length": self.tighten("min_length", iSac, -(-remainder_min // count)),
+                "max_length": self.tighten("max_length", iSac, remainder_max // count)}
 
-    def compute_total_length_total_symbol_production(self, include_identities=False):
+    def compute_total_length_total_symbol_production(self, include_identities=False, words=None):
         """
         Find the SAC that appear least and most frequently
         Max total length is the sum of the least frequent handling the most # of symbols + max of the rest
         Min total length is the sum of the most frequent handling the most # of symbols + min of the rest
+
+        The sums over "the rest" are the sums over the word minus the share of the most (least) frequent SaC. The
+        most and least frequent SaCs have to be different SaCs, a word with a single variable SaC gives no bound.
+
+        :param include_identities: Also let identity SaCs handle the symbols.
+        :param words: The indices of the predecessor words to analyze, all of them by default.
+        :return: The entries of the bounds that were tightened, by bound name, see tighten().
+        """
+        rows, counts = self._word_sac_counts(words)
+        if len(rows) == 0:
+            return {}
+
+        # The unaccounted for growth must not include that from variables, only identities
+        uag_total = self.symbol_counts[rows + 1].sum(axis=1)
+        if not include_identities:
+            # Subtract out identities from iWord
+            identities = np.asarray(self.problem.evidence.alphabet.identities_ids, dtype=np.int64)
+            uag_total = uag_total - self.symbol_counts[np.ix_(rows, identities)].sum(axis=1)
+
+        # Get the SaCs that occur the least and most frequently (but actually exist)
+        is_variable = (counts > 0) & ~self.sac_is_identity
+        max_value = np.where(is_variable, counts, 0).max(axis=1, initial=0)
+        min_value = np.where(is_variable, counts, np.iinfo(np.int64).max).min(axis=1, initial=np.iinfo(np.int64).max)
+        is_most = is_variable & (counts == max_value[:, None])
+        is_least = is_variable & (counts == min_value[:, None])
+        # A SaC only counts if there is a different SaC on the other side
+        other_least = is_least.sum(axis=1)[:, None] - is_least
+        other_most = is_most.sum(axis=1)[:, None] - is_most
+        is_most &= other_least > 0
+        is_least &= other_most > 0
+
+        # The sums over the whole word, of the SaCs taking part
+        taking_part = (counts > 0) & (~self.sac_is_identity | include_identities)
+        part_counts = np.where(taking_part, counts, 0)
+        word_min = part_counts @ self.min_length
+        word_max = part_counts @ self.max_length
+        rest_min = taking_part @ self.min_length
+        rest_max = taking_part @ self.max_length
+
+        # subtract out the length of the identities
+        identity_offset = ((counts > 0) & self.sac_is_identity).sum(axis=1) if include_identities else \
+            np.zeros(len(rows), dtype=np.int64)
+
+        iRow, iSac = np.nonzero(is_least)
+        remainder_max = uag_total[iRow] - (word_max[iRow] - counts[iRow, iSac] * self.max_length[iSac])
+        total_max = rest_max[iRow] - self.max_length[iSac] + np.maximum(0, remainder_max) // counts[iRow, iSac]
+        changes = {"total_length_max": self.tighten("total_length_max", rows[iRow], total_max - identity_offset[iRow])}
+
+        iRow, iSac = np.nonzero(is_most)
+        remainder_min = uag_total[iRow] - (word_min[iRow] - counts[iRow, iSac] * self.min_length[iSac])
+        total_min = rest_min[iRow] - self.min_length[iSac] + remainder_min // counts[iRow, iSac]  # Lowered, see BOUNDS
+        changes["total_length_min"] = self.tighten("total_length_min", rows[iRow], total_min - identity_offset[iRow])
+        return changes
+
+    def _word_sac_counts(self, words=None):
         """
+        The SaC counts of predecessor words.
 
-        # Get the list of SaCs that occur the least and most frequently (but actually exist)
-        for iWord, w in enumerate(self.problem.evidence.words[:-1]):
-            # get the sacs that occur most/least frequently
-
-            word_sac_counts = self.get_variable_sac_counts(w)
-            sorted_items = sorted(word_sac_counts, key=lambda x: x[1], reverse=True)
-            max_value = sorted_items[0][1]
-            sorted_items = sorted(word_sac_counts, key=lambda x: x[1])
-            min_value = sorted_items[0][1]
-
-            most_frequent = [(key, value) for key, value in word_sac_counts if value == max_value]
-            least_frequent = [(key, value) for key, value in word_sac_counts if value == min_value]
-
-            # The unaccounted for growth must not include that from variables, only identities
-            uag_total = sum(self.symbol_counts[iWord+1])
-            if not include_identities:
-                # Subtract out identities from iWord
-                for iSymbol, count in enumerate(self.symbol_counts[iWord]):
-                    if self.is_symbol_id_identity(iSymbol):
-                        uag_total -= count
-
-            for iMost, most in enumerate(most_frequent):
-                if not self.is_symbol_id_identity(most[0].symbol) or include_identities:
-                    for iLeast, least in enumerate(least_frequent):
-                        if most[0] != least[0] and (not self.is_symbol_id_identity(least[0].symbol) or include_identities):
-                            remainder_max = uag_total
-                            remainder_min = uag_total
-                            rest_min = 0
-                            rest_max = 0
-
-                            # Max total length is the sum of the least frequent handling the most # of symbols + max of the rest
-                            # Min total length is the sum of the most frequent handling the least # of symbols + min of the rest
-                            for sac, count in self.problem.evidence.words[iWord].sac_counts.items():
-                                # do not include the sac that occurs the most, and do not include identities (unless specified)
-                                if most[0] != sac and (not self.is_symbol_id_identity(sac.symbol) or include_identities):
-                                    remainder_min -= count * self.get_min_length(sac)
-                                    rest_min += self.get_min_length(sac)
-                                # do not include the sac that occurs the least, and do not include identities (unless specified)
-                                if least[0] != sac and (not self.is_symbol_id_identity(sac.symbol) or include_identities):
-                                    remainder_max -= count * self.get_max_length(sac)
-                                    rest_max += self.get_max_length(sac)
-                            total_min = rest_min + remainder_min / self.problem.evidence.words[iWord].sac_counts[most[0]]
-                            total_max = rest_max + max(0,remainder_max) / self.problem.evidence.words[iWord].sac_counts[least[0]]
-
-                            # subtract out the length of the identities
-                            if include_identities:
-                                identity_counts = self.get_identity_sac_counts(w)
-                                total_identity_count = len(identity_counts)
-                                total_min -= total_identity_count
-                                total_max -= total_identity_count
-
-                            self.set_total_length_max(iWord, total_max)
-                            self.set_total_length_min(iWord, total_min)
+        :param words: The indices of the predecessor words, all of them by default.
+        :return: A tuple (rows, counts) of the word indices and their (words x SaCs) rows of Evidence.sac_count_matrix().
+        """
+        rows = np.asarray(self._predecessor_words(words), dtype=np.int64)
+        return rows, self.problem.evidence.sac_count_matrix()[rows]
 
     def compute_total_length_symbiology(self):
         pass
@@ -2732,18 +2817,12 @@ void LSIProblemV3::ComputeSymbolLocalization()
 
     def compute_symbol_counts(self):
         """
-        Compute the growth of words by analyzing the frequency of symbols
-        in subsequent words within the evidence data.
+        Count the symbols of every word in the evidence data.
 
-        This function iterates through each word in the `problem.evidence.words` list (excluding the last word).
-        For each symbol in the alphabet, it counts the occurrences of the symbol in the next word's
-        `original_string`. The count is then stored in the `word_growth` attribute, indexed by the
-        current word's index and the symbol's unique ID in the alphabet.
+        The count of every symbol in the alphabet is taken from the Parikh vector of each word, so
+        `symbol_counts[iWord]` is indexed by the symbol's unique ID in the alphabet.
         """
-        for iWord, w in enumerate(self.problem.evidence.words):
-            for symbol in self.problem.evidence.alphabet.symbols:
-                count = self.problem.evidence.words[iWord].original_string.count(symbol)
-                self.symbol_counts[iWord][self.problem.evidence.alphabet.get_id(symbol)] = count
+        self.symbol_counts = self.problem.evidence.parikh_matrix().copy()
 
     def compute_unaccounted_growth_matrix(self):
         """
@@ -2755,17 +2834,10 @@ void LSIProblemV3::ComputeSymbolLocalization()
         For each symbol in the alphabet and each word (excluding the last word):
             - Calculate the accounted growth of the symbol in the word based on SAC counts.
             - Subtract the accounted growth from the total growth to determine the unaccounted growth.
+
+        The accounted growth is the product of the (words x SaCs) count matrix and min_growth, see _accounted().
         """
-        for symbol in self.problem.evidence.alphabet.symbols:
-            for iWord, w in enumerate(self.problem.evidence.words[:-1]):
-                accounted_growth_of_symbol_in_word = 0
-                for iSaC, sac in enumerate(self.problem.evidence.sacs):
-                    if sac in w.sac_counts:
-                        min_growth_of_symbol_by_sac = self.min_growth[iSaC][
-                            self.problem.evidence.alphabet.get_id(symbol)]
-                        sac_count = w.sac_counts[sac]
-                        accounted_growth_of_symbol_in_word += min_growth_of_symbol_by_sac * sac_count
-                self.word_unaccounted_growth[iWord][self.problem.evidence.alphabet.get_id(symbol)] = (self.symbol_counts[iWord+1][self.problem.evidence.alphabet.get_id(symbol)] - accounted_growth_of_symbol_in_word)
+        self.word_unaccounted_growth[...] = self.symbol_counts[1:] - self._accounted("min_growth")
 
     def compute_unaccounted_length_matrix(self):
         """
@@ -2778,15 +2850,34 @@ void LSIProblemV3::ComputeSymbolLocalization()
             - Calculate the accounted length based on SAC counts and their minimum lengths.
             - Subtract the accounted length from the total length of the next word to determine
               the unaccounted length.
+
+        The accounted length is the product of the (words x SaCs) count matrix and min_length, see _accounted().
         """
-        for iWord, w in enumerate(self.problem.evidence.words[:-1]):
-            accounted_length_in_word = 0
-            for iSaC, sac in enumerate(self.problem.evidence.sacs):
-                if sac in w.sac_counts:
-                    min_length_by_sac = self.min_length[iSaC]
-                    sac_count = w.sac_counts[sac]
-                    accounted_length_in_word += min_length_by_sac * sac_count
-            self.word_unaccounted_length[iWord] = len(self.problem.evidence.words[iWord+1]) - accounted_length_in_word
+        self.word_unaccounted_length[...] = self.successor_lengths - self._accounted("min_length")
+
+    def _accounted(self, name):
+        """
+        The product of the predecessor words' SaC counts and a bound, kept up to date incrementally.
+
+        The product and the bound it was computed from are cached. Only the SaCs whose bound changed since then are
+        multiplied again, so a refresh costs O(words x changed SaCs) instead of a full product.
+
+        :param name: The name of a SaC-indexed bound, e.g. "min_length" or "min_growth".
+        :return: The product, with one row per predecessor word.
+        """
+        bounds = getattr(self, name)
+        counts = self.problem.evidence.sac_count_matrix()[:-1]
+        if name not in self._products:
+            self._products[name] = (counts @ bounds, bounds.copy())
+            return self._products[name][0]
+
+        product, computed_from = self._products[name]
+        delta = bounds - computed_from
+        changed = np.flatnonzero(delta.reshape(len(delta), -1).any(axis=1))
+        if len(changed):
+            product += counts[:, changed] @ delta[changed]
+            computed_from[changed] = bounds[changed]
+        return product
 
     def compute_total_length_symbiology(self):
         """
@@ -2827,28 +2918,23 @@ void LSIProblemV3::ComputeSymbolLocalization()
           of a `sac` in the provided list of evidence words.
         """
         sacs = self.problem.evidence.sacs
-        identities = self.problem.evidence.alphabet.identities_ids
         naive_min = self.problem.absolute_min_length
 
-        # Compute min and max growth
-        for iSac, sac in enumerate(sacs):
-            if sac.symbol in identities:
-                self.min_growth[iSac][sac.symbol] = 1
-                self.max_growth[iSac][sac.symbol] = 1
-            else:
-                self.min_growth[iSac][sac.symbol] = 0
-                self.max_growth[iSac][sac.symbol] = 0
+        # Compute min and max growth, an identity produces itself once
+        sac_symbols = self.sac_symbols
+        is_identity = self.sac_is_identity
+        self.min_growth[np.arange(self.num_sacs), sac_symbols] = is_identity
+        self.max_growth[np.arange(self.num_sacs), sac_symbols] = is_identity
 
         shortest_word_length = max(len(word) for word in self.problem.evidence.words[1:])
 
+        self.min_length[is_identity] = 1
+        self.max_length[is_identity] = 1
         for iSac, sac in enumerate(sacs):
-            if sac.symbol in identities:
-                self.min_length[iSac] = 1
-                self.max_length[iSac] = 1
-            else:
+            if not is_identity[iSac]:
                 # find the shortest word after the sac appears
                 for iWord, w in enumerate(self.problem.evidence.words[:-1]):
-                    if sac in w.sacs:
+                    if any(other == sac for other in w.sac_counts):  # The distinct SaCs, compared as in a list
                         shortest_word_length = len(self.problem.evidence.words[iWord+1])
                 self.min_length[iSac] = naive_min
                 self.max_length[iSac] = shortest_word_length
@@ -2959,7 +3045,7 @@ void LSIProblemV3::ComputeSymbolLocalization()
                     continue  # Already selected or found
 
                 # Compute range product increase
-                range_size = self.get_max_length(sac) - self.get_min_length(sac) + 1
+                range_size = int(self.get_max_length(sac)) - int(self.get_min_length(sac)) + 1  # Python ints do not overflow
                 new_product = total_product * range_size
 
                 # Count how many uncovered words this sac can solve
@@ -0,0 +1,105 @@
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Set
+
+import numpy as np
+
+from InferenceTools.MasterAnalysisObject import MasterAnalysisObject
+
+# The bounds indexed by predecessor word, all other bounds are indexed by SaC
+WORD_BOUNDS = ("total_length_min", "total_length_max")
+
+
+class Deduction:
+    def __init__(self, name: str, function: Callable[[List[int]], Dict[str, tuple]], reads: Iterable[str]):
+        """
+        A deduction of the MAO that can be applied to a set of predecessor words.
+
+        :param name: The name of the deduction, for reporting.
+        :param function: A callable taking a list of word indices and returning the entries it tightened by bound
+                         name (see MasterAnalysisObject.tighten()), e.g. a bound MAO method with a words parameter.
+        :param reads: The names of the bounds (see MasterAnalysisObject.BOUNDS) the deduction reads.
+        """
+        self.name = name
+        self.function = function
+        self.reads = set(reads)
+        self.evaluations = 0
+
+
+class PropagationScheduler:
+    def __init__(self, mao: MasterAnalysisObject):
+        """
+        Apply the MAO deductions with a worklist until a fixed point is reached (AC-3 style).
+
+        Every (deduction, word) pair is evaluated once, then only the pairs whose inputs were tightened are queued
+        again. A tightened SaC bound queues the pairs of the words the SaC occurs in, a tightened word bound the pairs
+        of that word. The deductions only ever tighten bounds, so this reaches the same fixed point as repeating every
+        deduction over every word until nothing changes. The queued words of a deduction are evaluated together, in a
+        single call.
+
+        :param mao: The MasterAnalysisObject holding the bounds.
+        """
+        self.mao = mao
+        self.deductions: List[Deduction] = []
+        self.evaluations = 0
+
+        # The predecessor words every SaC of the evidence occurs in
+        counts = mao.problem.evidence.sac_count_matrix()[:-1]
+        self.words_of_sac = [np.flatnonzero(counts[:, iSac]).tolist() for iSac in range(counts.shape[1])]
+
+    def add(self, name: str, function: Callable[[List[int]], Dict[str, tuple]], reads: Iterable[str]) -> Deduction:
+        """
+        Add a deduction.
+
+        :param name: The name of the deduction, for reporting.
+        :param function: A callable taking a list of word indices and returning the entries it tightened.
+        :param reads: The names of the bounds the deduction reads.
+        :return: The Deduction.
+        """
+        deduction = Deduction(name, function, reads)
+        self.deductions.append(deduction)
+        return deduction
+
+    def run(self) -> int:
+        """
+        Evaluate the deductions until no bound changes.
+
+        :return: The number of (deduction, word) evaluations.
+        """
+        num_words = self.mao.num_words - 1
+        pending = [set(range(num_words)) for _ in self.deductions]  # The queued words of every deduction
+        queue = deque(iDeduction for iDeduction in range(len(self.deductions)) if num_words)
+        evaluations = 0
+
+        while queue:
+            iDeduction = queue.popleft()
+            deduction = self.deductions[iDeduction]
+            words = sorted(pending[iDeduction])
+            pending[iDeduction] = set()
+
+            changed = deduction.function(words)
+            deduction.evaluations += len(words)
+            evaluations += len(words)
+
+            for name, affected in self._changed_words(changed).items():
+                for iOther, other in enumerate(self.deductions):
+                    if name not in other.reads or not affected - pending[iOther]:
+                        continue
+                    if not pending[iOther]:
+                        queue.append(iOther)  # A deduction is queued exactly while it has pending words
+                    pending[iOther] |= affected
+
+        self.mao.flag = False
+        self.evaluations += evaluations
+        return evaluations
+
+    def _changed_words(self, changed: Dict[str, tuple]) -> Dict[str, Set[int]]:
+        """For every bound that was tightened, the predecessor words whose deductions read the changed entries."""
+        words = {}
+        for name, index in changed.items():
+            if len(index[0]) == 0:
+                continue
+            if name in WORD_BOUNDS:
+                words[name] = set(index[0].tolist())
+            else:
+                words[name] = {iWord for iSac in set(index[0].tolist()) for iWord in self.words_of_sac[iSac]}
+        return words
@@ -0,0 +1,167 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from LSystems.LSystem import LSystem
+
+
+def _run_derivations(factory: Callable[[], LSystem], n: int, seeds: List[np.random.SeedSequence]) -> List[List[np.ndarray]]:
+    """
+    Run one derivation of n generations per seed, in a worker process.
+
+    :param factory: A picklable callable that creates the L-system.
+    :param n: Number of iterations of every derivation.
+    :param seeds: The seed of every derivation.
+    :return: For every derivation, the symbol IDs of its n + 1 words.
+    """
+    derivations = []
+    for seed in seeds:
+        system = factory()
+        rng = np.random.default_rng(seed)
+        words = [system.words[-1].symbol_id_array()]
+        for word in system.generate(n, keep_last=1, rng=rng):
+            words.append(word.symbol_id_array())
+        derivations.append(words)
+    return derivations
+
+
+class EnsembleRunner:
+    def __init__(self, factory: Callable[[], LSystem], n: int, m: int, seed: int = 0, workers: int = None):
+        """
+        Generate M independent derivations of a stochastic L-system over a process pool.
+
+        Every derivation gets its own random stream, spawned from one SeedSequence, so the samples only depend on the
+        seed and not on the number of workers or the order in which the workers finish.
+
+        :param factory: A picklable callable (e.g. an LSystem subclass) that creates the L-system, a derivation starts
+                        from its last word.
+        :param n: Number of iterations of every derivation.
+        :param m: Number of derivations.
+        :param seed: The root seed.
+        :param workers: Number of worker processes, defaults to the number of CPUs. With 1 no pool is used.
+        """
+        self.factory = factory
+        self.n = n
+        self.m = m
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, chunk_size: int = None) -> Dict[str, np.ndarray]:
+        """
+        Generate the derivations.
+
+        :param chunk_size: The number of derivations sent to a worker at once, by default about four chunks per worker.
+        :return: The ensemble, see pack().
+        """
+        seeds = np.random.SeedSequence(self.seed).spawn(self.m)
+        chunk_size = chunk_size or max(1, -(-self.m // (self.workers * 4)))
+        chunks = [seeds[i:i + chunk_size] for i in range(0, self.m, chunk_size)]
+
+        if self.workers == 1:
+            results = [_run_derivations(self.factory, self.n, chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(_run_derivations, [self.factory] * len(chunks), [self.n] * len(chunks),
+                                            chunks))
+        derivations = [derivation for result in results for derivation in result]
+        return self.pack(derivations)
+
+    def pack(self, derivations: List[List[np.ndarray]]) -> Dict[str, np.ndarray]:
+        """
+        Pack derivations into flat arrays.
+
+        Word g of derivation d is symbols[starts[d, g]:starts[d, g] + lengths[d, g]]. The mapping of the alphabet is
+        stored alongside, so the words can be converted back to strings without the L-system.
+
+        :param derivations: For every derivation, the symbol IDs of its words.
+        :return: A dictionary of arrays: symbols, starts, lengths, mapping_symbols, mapping_ids and seed.
+        """
+        lengths = np.array([[len(word) for word in words] for words in derivations], dtype=np.int64)
+        lengths = lengths.reshape(len(derivations), self.n + 1)
+        starts = np.concatenate(([0], np.cumsum(lengths.ravel())[:-1])).reshape(lengths.shape).astype(np.int64)
+        words = [word for words in derivations for word in words]
+        symbols = np.concatenate(words) if words else np.zeros(0, dtype=np.int32)
+
+        # The smallest integer type that holds every symbol ID, including the negative IDs of the special symbols
+        mappings = self.factory().alphabet.mappings
+        low, high = min(mappings.values()), max(mappings.values())
+        dtype = next(dtype for dtype in (np.int8, np.int16, np.int32)
+                     if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max)
+        return {
+            "symbols": symbols.astype(dtype),
+            "starts": starts,
+            "lengths": lengths,
+            "mapping_symbols": np.array(list(mappings.keys())),
+            "mapping_ids": np.array(list(mappings.values()), dtype=np.int32),
+            "seed": np.array(self.seed),
+        }
+
+    def write(self, path: str, chunk_size: int = None) -> Dict[str, np.ndarray]:
+        """
+        Generate the derivations and write them to a compressed .npz file.
+
+        :param path: The file to write.
+        :param chunk_size: See run().
+        :return: The ensemble, see pack().
+        """
+        ensemble = self.run(chunk_size)
+        np.savez_compressed(path, **ensemble)
+        return ensemble
+
+    @staticmethod
+    def load(path: str) -> Dict[str, np.ndarray]:
+        """
+        Read an ensemble written by write().
+
+        :param path: The .npz file.
+        :return: The ensemble, see pack().
+        """
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+
+    @staticmethod
+    def word_string(ensemble: Dict[str, np.ndarray], derivation: int, generation: int) -> str:
+        """
+        Convert a word of an ensemble back to a string.
+
+        :param ensemble: The ensemble, see pack().
+        :param derivation: The derivation.
+        :param generation: The generation within the derivation, 0 is the word the derivation started from.
+        :return: The word as a string.
+        """
+        reverse_mappings = dict(zip(ensemble["mapping_ids"].tolist(), ensemble["mapping_symbols"].tolist()))
+        start = ensemble["starts"][derivation, generation]
+        symbols = ensemble["symbols"][start:start + ensemble["lengths"][derivation, generation]]
+        return ''.join(reverse_mappings[symbol_id] for symbol_id in symbols.tolist())
+
+
+def _benchmark_system() -> LSystem:
+    """A stochastic plant, used by the throughput benchmark below."""
+    from ProductionRules.ProductionRule import StochasticProductionRule
+    from WordsAndSymbols.Alphabet import Alphabet
+    from WordsAndSymbols.SaC import SaC, ANY_SYMBOL_ID
+    from WordsAndSymbols.Word import Word
+
+    alphabet = Alphabet(mappings={"X": 0}, identity_symbols={"F", "+", "-", "[", "]"})
+    system = LSystem("Stochastic Plant", "X", alphabet)
+    sac = SaC([ANY_SYMBOL_ID], alphabet.get_id("X"), [ANY_SYMBOL_ID])
+    system.add_rule(sac, StochasticProductionRule(sac, {
+        Word.from_string("F[+X]F[-X]+X", alphabet, 0, 0): 0.4,
+        Word.from_string("F[+X]F", alphabet, 0, 0): 0.3,
+        Word.from_string("F[-X]F", alphabet, 0, 0): 0.3,
+    }))
+    return system
+
+
+if __name__ == "__main__":
+    # Throughput benchmark: python -m LSystems.EnsembleRunner
+    m, n = 400, 7
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        ensemble = EnsembleRunner(_benchmark_system, n=n, m=m, seed=1, workers=workers).run()
+        elapsed = time.perf_counter() - start
+        symbols = len(ensemble["symbols"])
+        print(f"workers={workers}: {m / elapsed:8.1f} derivations/s, {symbols / elapsed / 1e6:6.2f} M symbols/s")
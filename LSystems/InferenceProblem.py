@@ -15,6 +15,7 @@ class InferenceProblem:
         self.ignore_list = [] # known symbols to ignore
         self.strings = [] # the observed raw strings
         self.MAO = None
+        self.run_length = False  # store the evidence as run-length encoded words
 
         k = -1
         l = -1
@@ -36,6 +37,7 @@ class InferenceProblem:
                     self.identities = set(settings.get("identities", []))
                     self.ignore = set(settings.get("ignore", []))
                     self.absolute_min_length = settings.get("Absolute Min Length")
+                    self.run_length = settings.get("Run Length", False)
             except FileNotFoundError:
                 print(f"Settings file '{settings_file}' not found.")
             except json.JSONDecodeError:
@@ -59,7 +61,7 @@ class InferenceProblem:
             k, l = infer_context_size(strings=self.strings, alphabet=a)
 
         # The evidence discovered about the problem
-        self.evidence = Evidence(strings=self.strings, alphabet=a, k=k, l=l)
+        self.evidence = Evidence(strings=self.strings, alphabet=a, k=k, l=l, run_length=self.run_length)
 
         print(f"\nWords (original vs computed)")
         for i, w in enumerate(self.evidence.words):
@@ -1,10 +1,25 @@
-from ProductionRules.ProductionRule import ProductionRule
+from typing import List
+
+import numpy as np
+
+from ProductionRules.ProductionRule import ProductionRule, DeterministicProductionRule, StochasticProductionRule, \
+    ParametricProductionRule
+from ProductionRules.RuleIndex import RuleIndex, WILDCARD
+from ProductionRules.StochasticSuccessorTable import StochasticSuccessorTable
+from ProductionRules.SuccessorTable import SuccessorTable
+from Utility.context_utils import get_context_windows
+from Utility.matrix_utils import vector_matrix_power, vector_matrix_powers
+from Utility.rolling_hash import combine, hash_symbols
 from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.CompactWord import CompactWord
+from WordsAndSymbols.CompressedWord import CompressedWord
+from WordsAndSymbols.ParameterTable import ParameterTable
 from WordsAndSymbols.SaC import SaC, ANY_SYMBOL_ID, EMPTY_SYMBOL_ID
 from WordsAndSymbols.Word import Word
+from WordsAndSymbols.WordBuilder import WordBuilder
 
 class LSystem:
-    def __init__(self, name: str, axiom: str, alphabet: Alphabet, k: int=0, l: int=0):
+    def __init__(self, name: str, axiom: str, alphabet: Alphabet, k: int=0, l: int=0, compressed: bool=False):
         """
         Initialize the L-system with an axiom, alphabet, and context depth.
 
@@ -12,14 +27,19 @@ class LSystem:
         :param alphabet: The Alphabet object for symbol management.
         :param k: Maximum left context depth.
         :param l: Maximum right context depth.
+        :param compressed: Store the generations of a D0L-system as CompressedWords.
         """
         self.name = name
         self.axiom = axiom
         self.alphabet = alphabet
         self.k = k
         self.l = l
+        self.compressed = compressed
         self.words = [Word.from_string(axiom, alphabet, k, l)]  # Store all words
         self.rules = []
+        self._rule_index = None  # Compiled on first use, see rule_index
+        self._successor_table = None  # Only used for D0L-systems, see is_d0l
+        self._stochastic_table = None  # Only used for seeded 0L-systems, see is_0l
 
 #        for w in self.words:
 #            sacs_in_word = list(set(w.sac_list))
@@ -33,31 +53,510 @@ class LSystem:
         :param rule: The production rule object.
         """
         self.rules.append((sac, rule))
+        self._rule_index = None
+        self._successor_table = None
+        self._stochastic_table = None
+
+    @property
+    def rule_index(self) -> RuleIndex:
+        """The rules compiled into a RuleIndex, rebuilt after a rule is added."""
+        if self._rule_index is None:
+            self._rule_index = RuleIndex(self.rules)
+        return self._rule_index
+
+    def is_context_free(self) -> bool:
+        """
+        Check if no rule has a left or right context.
+
+        :return: True if all rules are context-free.
+        """
+        for rule_sac, _ in self.rules:
+            left, _, right = rule_sac.key()
+            if left != WILDCARD or right != WILDCARD:
+                return False
+        return True
+
+    def is_0l(self) -> bool:
+        """
+        Check if the L-system is context-free with only deterministic and stochastic rules without parameters.
+
+        :return: True if the successors of a generation can be chosen independently of each other.
+        """
+        if not self.is_context_free():
+            return False
+        for _, rule in self.rules:
+            if isinstance(rule, StochasticProductionRule):
+                if any(any(word.parameters) for word in rule.words):
+                    return False
+            elif not isinstance(rule, DeterministicProductionRule) or any(rule.word.parameters):
+                return False
+        return True
+
+    def is_d0l(self) -> bool:
+        """
+        Check if the L-system is deterministic and context-free (a D0L-system).
+
+        Each generation of a D0L-system is a homomorphism of the previous one, so it can be computed with a successor
+        table instead of matching every symbol.
 
-    def apply_rule(self, sac: SaC) -> Word:
+        :return: True if all rules are deterministic, have no context and no parameters in their successor.
         """
-        Apply the first matching rule to a given SaC.
+        if not self.is_context_free():
+            return False
+        for _, rule in self.rules:
+            if not isinstance(rule, DeterministicProductionRule) or any(rule.word.parameters):
+                return False
+        return True
+
+    def has_vectorized_rules(self) -> bool:
+        """
+        Check if any parametric rule has a vectorized function.
+
+        :return: True if the parameters of a generation can be computed per rule instead of per position.
+        """
+        return any(isinstance(rule, ParametricProductionRule) and rule.vectorized_function is not None
+                   for _, rule in self.rules)
+
+    @property
+    def successor_table(self) -> SuccessorTable:
+        """The successor table of a D0L-system, rebuilt after a rule is added."""
+        if not self.is_d0l():
+            raise ValueError("A successor table is only defined for D0L-systems.")
+        if self._successor_table is None:
+            self._successor_table = SuccessorTable(self.rule_index, self.alphabet.sac_registry)
+        return self._successor_table
+
+    def apply_rule(self, sac: SaC, parameters: dict = None) -> Word:
+        """
+        Apply the most specific matching rule to a given SaC, see RuleIndex.
 
         :param sac: The SaC to which the rule should be applied.
+        :param parameters: Optional parameters of the SaC's position, passed to parametric rules.
         :return: The resulting Word if a rule matches, or the original SaC as a Word.
         """
-        for rule_sac, rule in self.rules:
-            if rule_sac == sac:
-                return rule.apply(sac)
-        return Word([sac])  # No matching rule, return the original SaC as a Word.
+        rule = self.rule_index.find(sac)
+        if rule is not None:
+            return rule.produce(sac, parameters=parameters)
+        registry = self.alphabet.sac_registry
+        return Word([sac], [registry.intern_sac(sac)], registry)  # No matching rule, return the original SaC as a Word.
 
-    def iterate(self, n: int):
+    def iterate(self, n: int, rng=None):
         """
         Perform n iterations of the L-system.
 
         :param n: Number of iterations to perform.
+        :param rng: Optional NumPy random generator (or seed) for the stochastic rules, see generate().
+        """
+        for _ in self.generate(n, rng=rng):
+            pass
+
+    def generate(self, n: int, keep_last: int = None, rng=None):
+        """
+        Perform n iterations of the L-system, yielding each new generation as it is produced.
+
+        :param n: Number of iterations to perform.
+        :param keep_last: If given, only the last keep_last words are kept in self.words, older generations (including
+                          the axiom) are dropped so memory does not grow with the sum of all generation lengths.
+        :param rng: Optional NumPy random generator (or seed) for the stochastic rules. With a generator the results
+                    are reproducible and the choices of a whole generation of a 0L-system are drawn at once. Without
+                    one the random module is used.
+        :return: A generator of the new Words.
+        """
+        if keep_last is not None and keep_last < 1:
+            raise ValueError("keep_last must be at least 1.")
+        if rng is not None and not isinstance(rng, np.random.Generator):
+            rng = np.random.default_rng(rng)
+
+        for _ in range(n):
+            word = self.rewrite(self.words[-1], rng)
+            self.words.append(word)
+            if keep_last is not None and len(self.words) > keep_last:
+                del self.words[:-keep_last]
+            yield word
+
+    def rewrite(self, word: Word, rng: np.random.Generator = None) -> Word:
+        """
+        Apply the rules to every symbol of a word in parallel.
+
+        :param word: The word to rewrite.
+        :param rng: Optional NumPy random generator for the stochastic rules.
+        :return: The next generation, a CompactWord (or CompressedWord if compressed is set) for D0L-systems and for
+                 0L-systems rewritten with a random generator.
+        """
+        if self.is_d0l():
+            registry = self.alphabet.sac_registry
+            if self.compressed:
+                if isinstance(word, CompressedWord) and word.successor_table is self.successor_table:
+                    return CompressedWord(word.sac_ids, word.depth + 1, self.successor_table)
+                if not isinstance(word, CompactWord) or word.registry is not registry:
+                    word = CompactWord.from_word(word, registry)
+                return CompressedWord(word.sac_ids, 1, self.successor_table)
+            if not isinstance(word, CompactWord) or word.registry is not registry:
+                word = CompactWord.from_word(word, registry)
+            return CompactWord(self.successor_table.apply(word.sac_ids), registry)
+        if rng is not None and self.is_0l():
+            registry = self.alphabet.sac_registry
+            if self._stochastic_table is None:
+                self._stochastic_table = StochasticSuccessorTable(self.rule_index, registry)
+            if not isinstance(word, CompactWord) or word.registry is not registry:
+                word = CompactWord.from_word(word, registry)
+            return CompactWord(self._stochastic_table.apply(word.sac_ids, rng), registry)
+        if not self.is_context_free():
+            return self._rewrite_context_sensitive(word, rng)
+        if self.has_vectorized_rules():
+            return self._rewrite_batched(word, rng)
+
+        rule_index = self.rule_index
+        builder = WordBuilder(self.alphabet.sac_registry)  # Counts the new word once, when it is complete
+        for sac, sac_parameters in zip(word.sacs, word.parameters):
+            rule = rule_index.find(sac)
+            if rule is None:
+                builder.add_sac(sac, sac_parameters)  # No matching rule, keep the original SaC and its parameters
+            else:
+                builder.append_word(rule.produce(sac, rng, sac_parameters))
+        return builder.build()
+
+    def _rewrite_batched(self, word: Word, rng: np.random.Generator = None) -> CompactWord:
+        """
+        Rewrite a word of a context-free parametric L-system, evaluating every vectorized rule once per generation.
+
+        The positions are grouped by the rule that matches them. A rule with a vectorized function gets the parameter
+        columns of all its positions (the parameters set on every one of them) in a single call, and its successor
+        parameters are written column by column. Other rules are applied per position, positions without a rule keep
+        their SaC and parameters.
+
+        :param word: The word to rewrite.
+        :param rng: Optional NumPy random generator for the stochastic rules.
+        :return: The next generation, a CompactWord with the parameters in a ParameterTable.
+        """
+        registry = self.alphabet.sac_registry
+        if not isinstance(word, CompactWord) or word.registry is not registry:
+            word = CompactWord.from_word(word, registry)
+        sac_ids = word.sac_ids
+        parameters = word.parameters
+        unique_ids, inverse = np.unique(sac_ids, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        group_starts = np.searchsorted(inverse[order], np.arange(len(unique_ids) + 1))
+
+        lengths = np.ones(len(sac_ids), dtype=np.int64)
+        batches, singles, identities = [], {}, []
+        for g, sac_id in enumerate(unique_ids.tolist()):
+            positions = order[group_starts[g]:group_starts[g + 1]]
+            sac = registry[sac_id]
+            rule = self.rule_index.find(sac)
+            if rule is None:
+                identities.append(positions)
+            elif isinstance(rule, ParametricProductionRule) and rule.vectorized_function is not None:
+                columns = {name: parameters.column(name)[positions] for name in parameters.names()
+                           if parameters.mask(name)[positions].all()}
+                template, successor_columns = rule.produce_batch(columns)
+                template = CompactWord.from_word(template, registry)
+                lengths[positions] = len(template)
+                batches.append((positions, template, successor_columns))
+            else:
+                for position in positions.tolist():
+                    successor = CompactWord.from_word(rule.produce(sac, rng, parameters[position]), registry)
+                    lengths[position] = len(successor)
+                    singles[position] = successor
+
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        result_ids = np.empty(offsets[-1], dtype=np.int32)
+        result_parameters = ParameterTable(int(offsets[-1]))
+        for positions in identities:
+            result_ids[offsets[positions]] = sac_ids[positions]
+            for name in parameters.names():
+                kept = positions[parameters.mask(name)[positions]]
+                if len(kept):
+                    result_parameters.set_columns(offsets[kept], {name: parameters.column(name)[kept]})
+        for positions, template, successor_columns in batches:
+            starts = offsets[positions]
+            for i, (template_id, columns) in enumerate(zip(template.sac_ids.tolist(), successor_columns)):
+                result_ids[starts + i] = template_id
+                if columns:
+                    result_parameters.set_columns(starts + i, {name: np.broadcast_to(values, starts.shape)
+                                                               for name, values in columns.items()})
+        for position, successor in singles.items():
+            start = offsets[position]
+            result_ids[start:start + len(successor)] = successor.sac_ids
+            for i, successor_parameters in enumerate(successor.parameters):
+                if successor_parameters:
+                    result_parameters[start + i] = successor_parameters
+
+        result = CompactWord(result_ids, registry)
+        result.parameters = result_parameters
+        return result
+
+    def _rewrite_context_sensitive(self, word: Word, rng: np.random.Generator = None) -> Word:
+        """
+        Rewrite a word with context-sensitive rules and determine the contexts of the new word.
+
+        The successors are written as symbol IDs, then the contexts of the new word are found with sliding windows
+        (see get_context_windows()) and its SaCs are interned, so the next generation is matched on its real contexts.
+        Identity symbols get no context, as in Word.from_string().
+
+        :param word: The word to rewrite.
+        :param rng: Optional NumPy random generator for the stochastic rules.
+        :return: The next generation.
+        """
+        rule_index = self.rule_index
+        symbol_ids, parameters = [], ParameterTable()
+        successors = {}  # Symbol IDs of every successor Word seen in this generation, by id()
+        for sac, sac_parameters in zip(word.sacs, word.parameters):
+            rule = rule_index.find(sac)
+            if rule is None:
+                symbol_ids.append(sac.symbol)  # No matching rule, keep the original symbol
+                parameters.append(sac_parameters)
+                continue
+            successor = rule.produce(sac, rng, sac_parameters)
+            if id(successor) not in successors:
+                successors[id(successor)] = (successor, [s.symbol for s in successor.sacs])
+            symbol_ids.extend(successors[id(successor)][1])
+            parameters.extend(successor.parameters)
+
+        k, l = self._context_window()
+        left_contexts, right_contexts = get_context_windows(symbol_ids, self.alphabet, k, l)
+        registry = self.alphabet.sac_registry
+        identities = set(self.alphabet.identities_ids)
+        sac_ids = []
+        for left, symbol_id, right in zip(left_contexts, symbol_ids, right_contexts):
+            if symbol_id in identities:
+                left = right = WILDCARD
+            sac_ids.append(registry.intern_key((left, symbol_id, right)))
+
+        result = Word([registry[sac_id] for sac_id in sac_ids], sac_ids, registry)
+        result.parameters = parameters
+        return result
+
+    def _context_window(self) -> tuple:
+        """
+        Return the context lengths kept for context-sensitive rewriting.
+
+        These are k and l, or the longest context of any rule when they are -1 (longest possible), as longer contexts
+        can never change which rule matches.
+        """
+        k, l = self.k, self.l
+        if k == -1 or l == -1:
+            lefts, rights = [0], [0]
+            for rule_sac, _ in self.rules:
+                left, _, right = rule_sac.key()
+                lefts.append(len(left) if left != WILDCARD else 0)
+                rights.append(len(right) if right != WILDCARD else 0)
+            k = max(lefts) if k == -1 else k
+            l = max(rights) if l == -1 else l
+        return k, l
+
+    def stream_generation(self, n: int, sink, chunk_size: int = 65536) -> int:
+        """
+        Write the generation n iterations after the last word to a sink without holding it in memory.
+
+        The last word is expanded depth first, chunk_size symbols at a time, so only one chunk per level is held at
+        once. The generation is not added to self.words. Only context-free L-systems can be streamed, as the successor
+        of a symbol must not depend on its neighbours.
+
+        :param n: Number of iterations to perform.
+        :param sink: A file-like object with a write() method or a callable, it receives the generation as strings.
+        :param chunk_size: The number of symbols expanded at once on each level.
+        :return: The length (in symbols) of the generation.
+        """
+        if not self.is_context_free():
+            raise ValueError("Only context-free L-systems can be streamed.")
+        write = sink.write if hasattr(sink, "write") else sink
+        reverse_mappings = self.alphabet.reverse_mappings
+        length = 0
+
+        # Each stack entry is a word and the position up to which it was expanded
+        stack = [(self.words[-1], 0)]
+        while stack:
+            word, position = stack.pop()
+            if len(stack) == n:  # The stack holds one entry per level above this word
+                if len(word):
+                    write(word.sacs_to_string(reverse_mappings))
+                    length += len(word)
+                continue
+            if position < len(word):
+                stack.append((word, position + chunk_size))
+                stack.append((self.rewrite(self._chunk(word, position, position + chunk_size)), 0))
+        return length
+
+    @staticmethod
+    def _chunk(word: Word, start: int, stop: int) -> Word:
+        """
+        Cut positions [start, stop) out of a word, with their parameters.
+
+        A CompressedWord is not expanded, only the SaCs of the chunk are found in its successor table.
+
+        :param word: The word.
+        :param start: The first position of the chunk.
+        :param stop: The position after the last one.
+        :return: The chunk, a CompactWord unless the word is a plain Word.
         """
+        if isinstance(word, CompressedWord):
+            table = word.successor_table
+            return CompactWord(table.window(word.sac_ids, word.depth, start, stop), table.registry)
+        if isinstance(word, CompactWord):
+            chunk = CompactWord(word.sac_ids[start:stop], word.registry)
+        else:
+            sac_ids = word.sac_ids[start:stop] if word.sac_ids is not None else None
+            chunk = Word(word.sacs[start:stop], sac_ids, word.registry)
+        chunk.parameters = word.parameters.take(np.arange(start, min(stop, len(word))))
+        return chunk
+
+    def growth_matrix(self) -> np.ndarray:
+        """
+        Compute the growth matrix of a D0L-system.
+
+        Entry [a, b] is the number of times symbol b occurs in the successor of symbol a, so the Parikh vector of a
+        generation is the Parikh vector of the previous generation times the growth matrix. A symbol without a rule
+        is its own successor. EmptySymbol is not counted.
+
+        :return: An int64 matrix indexed by symbol ID.
+        """
+        if not self.is_d0l():
+            raise ValueError("The growth matrix is only defined for D0L-systems.")
+        num_symbols = self.alphabet.num_symbol_ids()
+        matrix = np.eye(num_symbols, dtype=np.int64)
+        for symbol in self.alphabet.symbols:
+            symbol = self.alphabet.get_id(symbol)
+            rule = self.rule_index.find(SaC([ANY_SYMBOL_ID], symbol, [ANY_SYMBOL_ID]))
+            if rule is not None:
+                matrix[symbol] = rule.word.parikh_vector(num_symbols)
+        return matrix
+
+    def parikh_vectors(self, n: int) -> np.ndarray:
+        """
+        Compute the Parikh vectors of generations 0..n of a D0L-system without generating the words.
+
+        :param n: The last generation.
+        :return: An (n + 1) x (number of symbols) array, int64 if that is exact and object (Python integers) otherwise.
+        """
+        return vector_matrix_powers(self._axiom_parikh_vector(), self.growth_matrix(), n)
+
+    def parikh_vector(self, n: int) -> np.ndarray:
+        """
+        Compute the Parikh vector of generation n of a D0L-system by exponentiation by squaring of the growth matrix.
+
+        :param n: The generation.
+        :return: A vector indexed by symbol ID, int64 if that is exact and object (Python integers) otherwise.
+        """
+        return vector_matrix_power(self._axiom_parikh_vector(), self.growth_matrix(), n)
+
+    def lengths(self, n: int) -> np.ndarray:
+        """
+        Compute the lengths of generations 0..n of a D0L-system without generating the words.
+
+        :param n: The last generation.
+        :return: An array of n + 1 lengths, EmptySymbol is not counted.
+        """
+        return self.parikh_vectors(n).sum(axis=1)
+
+    def symbol_at(self, n: int, index: int) -> str:
+        """
+        Get the symbol at a position of generation n of a D0L-system without generating the word.
+
+        The position is found by descending from the axiom through the expansion lengths of the successors, which
+        takes n binary searches.
+
+        :param n: The generation.
+        :param index: The position in the generation.
+        :return: The symbol at the position.
+        """
+        sac_id = self.successor_table.locate(self._axiom_sac_ids(), n, index)
+        return self.alphabet.reverse_mappings[self.alphabet.sac_registry[sac_id].symbol]
+
+    def substring(self, n: int, start: int, stop: int) -> str:
+        """
+        Get the positions [start, stop) of generation n of a D0L-system without generating the word.
+
+        :param n: The generation.
+        :param start: The first position.
+        :param stop: The position after the last one, it is clipped to the length of the generation.
+        :return: The substring.
+        """
+        registry = self.alphabet.sac_registry
+        sac_ids = self.successor_table.window(self._axiom_sac_ids(), n, start, stop)
+        return CompactWord(sac_ids, registry).sacs_to_string(self.alphabet.reverse_mappings)
+
+    def fingerprints(self, n: int) -> list:
+        """
+        Compute a fingerprint (length and rolling hash of the symbols, see Utility.rolling_hash) of generations 0..n.
+
+        For a D0L-system the hashes are combined from the hashes and lengths of the successors, so no generation is
+        materialised and each one takes about the same time. Other L-systems are generated from the axiom (without
+        changing self.words) and hashed.
+
+        :param n: The last generation.
+        :return: A list of n + 1 (length, hash) tuples.
+        """
+        if self.is_d0l():
+            table = self.successor_table
+            sac_ids = self._axiom_sac_ids()
+            result = []
+            for depth in range(n + 1):
+                lengths = table.expansion_lengths(depth)[sac_ids]
+                hashes = table.expansion_hashes(depth)[sac_ids]
+                result.append((int(lengths.sum()), tuple(combine(hashes, lengths).tolist())))
+            return result
+        return [(len(word), tuple(hash_symbols(word.symbol_id_array()).tolist())) for word in self._generations(n)]
+
+    def reproduces(self, strings: List[str], start: int = 0) -> bool:
+        """
+        Check if the L-system produces the given strings as consecutive generations.
+
+        For a D0L-system the fingerprints of the generations are compared first, without generating them, and the
+        strings are only compared in full when the fingerprints match. Other L-systems have to generate the words
+        anyway, so each generation is compared directly and the generation stops at the first mismatch. A stochastic
+        system samples every generation once.
+
+        :param strings: The observed strings.
+        :param start: The generation of the first string.
+        :return: True if string i is generation start + i for every string.
+        """
+        observed = []
+        for string in strings:
+            try:
+                observed.append(self.alphabet.tokenize(string))
+            except ValueError:
+                return False  # A symbol that is not in the alphabet is never produced
+
+        last = start + len(strings) - 1
+        if not self.is_d0l():
+            word = Word.from_string(self.axiom, self.alphabet, self.k, self.l)
+            for generation in range(last + 1):
+                if generation > 0:
+                    word = self.rewrite(word)
+                if generation >= start:
+                    symbol_ids = observed[generation - start]
+                    if len(word) != len(symbol_ids) or not np.array_equal(word.symbol_id_array(), symbol_ids):
+                        return False
+            return True
+
+        fingerprints = self.fingerprints(last)[start:]
+        for symbol_ids, (length, hash_) in zip(observed, fingerprints):
+            if len(symbol_ids) != length or tuple(hash_symbols(symbol_ids).tolist()) != hash_:
+                return False
+
+        # The fingerprints match, confirm with a full comparison
+        for symbol_ids, word in zip(observed, self._generations(last)[start:]):
+            if not np.array_equal(word.symbol_id_array(), symbol_ids):
+                return False
+        return True
+
+    def _generations(self, n: int) -> List[Word]:
+        """Generate generations 0..n from the axiom without changing self.words."""
+        word = Word.from_string(self.axiom, self.alphabet, self.k, self.l)
+        if self.is_d0l():
+            return [CompressedWord(word.sac_id_array(), depth, self.successor_table) for depth in range(n + 1)]
+        words = [word]
         for _ in range(n):
-            new_sac_list = []
-            for sac in self.words[-1].sacs:  # Use the last word in the list
-                new_word = self.apply_rule(sac)
-                new_sac_list.extend(new_word.sacs)
-            self.words.append(Word(new_sac_list))  # Append the new word to the list
+            words.append(self.rewrite(words[-1]))
+        return words
+
+    def _axiom_sac_ids(self) -> np.ndarray:
+        return Word.from_string(self.axiom, self.alphabet, self.k, self.l).sac_id_array()
+
+    def _axiom_parikh_vector(self) -> np.ndarray:
+        axiom = Word.from_string(self.axiom, self.alphabet, self.k, self.l)
+        return axiom.parikh_vector(self.alphabet.num_symbol_ids())
 
     def display(self):
         """
@@ -1,8 +1,10 @@
-from typing import Union, Dict
+from typing import Union, Dict, List, Tuple
 from WordsAndSymbols.Word import Word
 from WordsAndSymbols.SaC import SaC
 import random
 
+import numpy as np
+
 class ProductionRule:
     def __init__(self, sac: SaC, word: Word):
         """
@@ -22,9 +24,22 @@ class ProductionRule:
         :return: The resulting Word if the rule matches, otherwise None.
         """
         if self.sac == sac:  # Handles AnySymbol and EmptySymbol via SaC equality logic
-            return self.word
+            return self.produce(sac)
         return None
 
+    def produce(self, sac: SaC, rng: np.random.Generator = None, parameters: dict = None) -> Union[Word, None]:
+        """
+        Produce the successor of a SaC without checking that the rule matches it.
+
+        This is used once the rule has already been selected, e.g. by a RuleIndex.
+
+        :param sac: The SaC being rewritten.
+        :param rng: Optional NumPy random generator, used by rules that make a random choice.
+        :param parameters: Optional parameters of the position being rewritten, used by parametric rules.
+        :return: The resulting Word.
+        """
+        return self.word
+
     def __repr__(self):
         """
         Display the production rule in human-readable format.
@@ -51,6 +66,19 @@ class StochasticProductionRule(ProductionRule):
         super().__init__(sac, None)  # word is not fixed in stochastic rules
         self.word_options = word_options
 
+        # Compiled once, so a choice is a single binary search over the cumulative weights
+        self.words = list(word_options.keys())
+        weights = np.asarray(list(word_options.values()), dtype=float)
+        if len(weights) == 0 or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("A stochastic rule needs non-negative weights with a positive sum.")
+        self.cumulative_weights = np.cumsum(weights)
+        self.total_weight = float(self.cumulative_weights[-1])
+        # Options after the last positive weight can never be chosen, leaving them out keeps rounding at the upper end
+        # from choosing them
+        self._num_choices = int(np.flatnonzero(weights > 0)[-1]) + 1
+        self._choice_weights = self.cumulative_weights[:self._num_choices]
+        self._cumulative_weights = self._choice_weights.tolist()  # random.choices() is faster with a list
+
     def apply(self, sac: SaC) -> Union[Word, None]:
         """
         Apply the stochastic rule to a matching SaC.
@@ -59,20 +87,63 @@ class StochasticProductionRule(ProductionRule):
         :return: A randomly selected Word if the rule matches, otherwise None.
         """
         if self.sac == sac:
-            choices, probabilities = zip(*self.word_options.items())
-            return random.choices(choices, weights=probabilities, k=1)[0]
+            return self.produce(sac)
         return None
 
+    def produce(self, sac: SaC, rng: np.random.Generator = None, parameters: dict = None) -> Word:
+        """
+        Randomly select one of the successors without checking that the rule matches the SaC.
+
+        :param sac: The SaC being rewritten.
+        :param rng: Optional NumPy random generator, the random module is used if it is not given.
+        :param parameters: Not used, the successors of stochastic rules do not depend on parameters.
+        :return: A randomly selected Word.
+        """
+        if rng is not None:
+            return self.sample(rng)
+        return random.choices(self.words[:self._num_choices], cum_weights=self._cumulative_weights, k=1)[0]
+
+    def sample(self, rng: np.random.Generator) -> Word:
+        """
+        Randomly select one of the successors.
+
+        :param rng: A NumPy random generator.
+        :return: A randomly selected Word.
+        """
+        return self.words[int(self.sample_batch(1, rng)[0])]
+
+    def sample_batch(self, m: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Randomly select m successors at once.
+
+        :param m: The number of choices.
+        :param rng: A NumPy random generator.
+        :return: An array with the index (into self.words) of every choice.
+        """
+        choices = np.searchsorted(self._choice_weights, rng.random(m) * self.total_weight, side="right")
+        return np.minimum(choices, self._num_choices - 1)  # Guard against rounding at the upper end
+
 class ParametricProductionRule(ProductionRule):
-    def __init__(self, sac: SaC, parametric_function):
+    def __init__(self, sac: SaC, parametric_function=None, vectorized_function=None):
         """
         Parametric production rule: SaC with parameters -> Word.
 
+        The successor is either produced per SaC by parametric_function, or for all matching positions of a word at
+        once by vectorized_function. The vectorized function takes a dictionary of parameter columns (one NumPy array
+        per parameter name, one value per matching position) and returns the successor word (the same symbols for
+        every position) and, for every position of the successor, a dictionary of its parameter columns (arrays with
+        one value per matching position, or single values).
+
         :param sac: The left-hand side of the rule.
         :param parametric_function: A callable that takes SaC parameters and produces a Word.
+        :param vectorized_function: A callable that takes parameter columns and produces the successor and its
+                                    parameter columns, see above.
         """
+        if parametric_function is None and vectorized_function is None:
+            raise ValueError("A parametric rule needs a parametric or a vectorized function.")
         super().__init__(sac, None)  # word is generated dynamically
         self.parametric_function = parametric_function
+        self.vectorized_function = vectorized_function
 
     def apply(self, sac: SaC) -> Union[Word, None]:
         """
@@ -86,5 +157,40 @@ class ParametricProductionRule(ProductionRule):
             self.sac._match_context(self.sac.left_context, sac.left_context) and
             self.sac._match_context(self.sac.right_context, sac.right_context)
         ):
+            return self.produce(sac)
+        return None
+
+    def produce(self, sac: SaC, rng: np.random.Generator = None, parameters: dict = None) -> Union[Word, None]:
+        """
+        Call the parametric function without checking that the rule matches the SaC.
+
+        Without a parametric function the vectorized function is called with the parameters of the position as
+        columns of length one.
+
+        :param sac: The SaC being rewritten.
+        :param rng: Not used, parametric rules are deterministic.
+        :param parameters: The parameters of the position being rewritten, e.g. a row of Word.parameters.
+        :return: The Word produced by the parametric function.
+        """
+        if self.parametric_function is not None:
             return self.parametric_function(sac)
-        return None
\ No newline at end of file
+
+        columns = {name: np.array([value]) for name, value in (parameters or {}).items()}
+        template, successor_columns = self.produce_batch(columns)
+        word = Word(template.sacs, template.sac_ids, template.registry)
+        for i, position_columns in enumerate(successor_columns):
+            for name, values in position_columns.items():
+                word.parameters[i][name] = np.asarray(values).reshape(-1)[0].item()
+        return word
+
+    def produce_batch(self, columns: Dict[str, np.ndarray]) -> Tuple[Word, List[Dict[str, np.ndarray]]]:
+        """
+        Call the vectorized function for many matching positions at once.
+
+        :param columns: The parameter columns of the matching positions.
+        :return: The successor word and the parameter columns of every position of the successor.
+        """
+        template, successor_columns = self.vectorized_function(columns)
+        if len(successor_columns) != len(template):
+            raise ValueError("The vectorized function must return parameter columns for every successor position.")
+        return template, successor_columns
@@ -0,0 +1,134 @@
+from typing import Dict, List, Tuple, Union
+
+from ProductionRules.ProductionRule import ProductionRule
+from WordsAndSymbols.SaC import SaC, canonical_context, ANY_SYMBOL_ID, EMPTY_SYMBOL_ID
+
+WILDCARD = (ANY_SYMBOL_ID,)
+
+
+class _SymbolRules:
+    def __init__(self):
+        """
+        The rules of a single predecessor symbol, split into tiers by how specific their contexts are.
+
+        Each tier maps the rule contexts to the first rule added with them. The context lengths present in a tier
+        are kept (longest first) so a SaC only needs one dict probe per length.
+        """
+        self.both: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], ProductionRule] = {}
+        self.both_lengths: List[Tuple[int, int]] = []
+        self.left: Dict[Tuple[int, ...], ProductionRule] = {}
+        self.left_lengths: List[int] = []
+        self.right: Dict[Tuple[int, ...], ProductionRule] = {}
+        self.right_lengths: List[int] = []
+        self.wildcard: Union[ProductionRule, None] = None
+
+    def add(self, left: Tuple[int, ...], right: Tuple[int, ...], rule: ProductionRule):
+        """
+        Add a rule with canonical left and right contexts, a context that is already present keeps its first rule.
+
+        :param left: The canonical left context of the rule.
+        :param right: The canonical right context of the rule.
+        :param rule: The production rule.
+        """
+        if left != WILDCARD and right != WILDCARD:
+            self.both.setdefault((left, right), rule)
+            lengths = (len(left), len(right))
+            if lengths not in self.both_lengths:
+                self.both_lengths.append(lengths)
+                self.both_lengths.sort(key=lambda x: (-(x[0] + x[1]), -x[0]))
+        elif left != WILDCARD:
+            self.left.setdefault(left, rule)
+            if len(left) not in self.left_lengths:
+                self.left_lengths.append(len(left))
+                self.left_lengths.sort(reverse=True)
+        elif right != WILDCARD:
+            self.right.setdefault(right, rule)
+            if len(right) not in self.right_lengths:
+                self.right_lengths.append(len(right))
+                self.right_lengths.sort(reverse=True)
+        elif self.wildcard is None:
+            self.wildcard = rule
+
+    def find(self, left: Tuple[int, ...], right: Tuple[int, ...]) -> Union[ProductionRule, None]:
+        """
+        Find the most specific rule whose contexts match the given SaC contexts.
+
+        A rule's left context matches if it is a suffix of the SaC's left context (the symbols closest to the
+        predecessor), its right context matches if it is a prefix of the SaC's right context.
+
+        :param left: The canonical left context of the SaC.
+        :param right: The canonical right context of the SaC.
+        :return: The matching rule, or None.
+        """
+        has_left = left != WILDCARD
+        has_right = right != WILDCARD
+
+        if has_left and has_right:
+            for left_length, right_length in self.both_lengths:
+                if left_length <= len(left) and right_length <= len(right):
+                    rule = self.both.get((left[len(left) - left_length:], right[:right_length]))
+                    if rule is not None:
+                        return rule
+        if has_left:
+            for length in self.left_lengths:
+                if length <= len(left):
+                    rule = self.left.get(left[len(left) - length:])
+                    if rule is not None:
+                        return rule
+        if has_right:
+            for length in self.right_lengths:
+                if length <= len(right):
+                    rule = self.right.get(right[:length])
+                    if rule is not None:
+                        return rule
+        return self.wildcard
+
+
+class RuleIndex:
+    def __init__(self, rules: List[Tuple[SaC, ProductionRule]]):
+        """
+        Compile a list of (SaC, rule) pairs into an index keyed on the predecessor symbol ID.
+
+        A SaC is matched against the rules of its own symbol first and then against the rules for AnySymbol. Within
+        a symbol the rule with both contexts is preferred over a rule with one context, which is preferred over a rule
+        without context. Longer contexts are preferred over shorter ones and the earliest rule wins a tie. The result
+        of a lookup is cached per SaC key, so every distinct SaC is only matched once.
+
+        :param rules: The (SaC, rule) pairs in the order they were added to the L-system.
+        """
+        self.rules = list(rules)
+        self.by_symbol: Dict[int, _SymbolRules] = {}
+        self._cache: Dict[tuple, Union[ProductionRule, None]] = {}
+
+        for rule_sac, rule in self.rules:
+            left, symbol, right = rule_sac.key()
+            self.by_symbol.setdefault(symbol, _SymbolRules()).add(left, right, rule)
+
+    def find(self, sac: SaC) -> Union[ProductionRule, None]:
+        """
+        Find the most specific rule that applies to a SaC.
+
+        :param sac: The SaC to rewrite.
+        :return: The matching rule, or None if no rule applies.
+        """
+        key = sac.key()
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        left, symbol, right = key
+        if symbol == EMPTY_SYMBOL_ID:
+            # EmptySymbol is matched by the rule of any symbol, keep the order in which the rules were added
+            rule = next((rule for rule_sac, rule in self.rules if rule_sac == sac), None)
+        else:
+            rule = None
+            for candidate in (symbol, ANY_SYMBOL_ID):
+                symbol_rules = self.by_symbol.get(candidate)
+                if symbol_rules is not None:
+                    rule = symbol_rules.find(left, right)
+                    if rule is not None:
+                        break
+
+        self._cache[key] = rule
+        return rule
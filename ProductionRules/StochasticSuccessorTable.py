@@ -0,0 +1,89 @@
+from typing import List
+
+import numpy as np
+
+from ProductionRules.ProductionRule import StochasticProductionRule
+from ProductionRules.RuleIndex import RuleIndex
+from ProductionRules.SuccessorTable import gather
+from WordsAndSymbols.SaCRegistry import SaCRegistry
+
+
+class StochasticSuccessorTable:
+    def __init__(self, rule_index: RuleIndex, registry: SaCRegistry):
+        """
+        Every possible successor of every SaC in a registry under deterministic and stochastic rules, as flat ID arrays.
+
+        The successor options of SaC ID i are options option_starts[i] .. option_starts[i] + option_counts[i] - 1 and
+        option j is flat[starts[j]:starts[j] + lengths[j]]. A generation is rewritten by drawing the choices of all
+        positions of each stochastic rule in one batch and gathering the chosen options, see SuccessorTable.
+
+        :param rule_index: The compiled rules, every rule must be deterministic or stochastic and context-free.
+        :param registry: The SaC registry the words and successors are interned in.
+        """
+        self.rule_index = rule_index
+        self.registry = registry
+        self.flat: List[int] = []
+        self.starts: List[int] = []
+        self.lengths: List[int] = []
+        self.option_starts: List[int] = []
+        self.stochastic_rules: List[StochasticProductionRule] = []
+        self.stochastic_rule_of: List[int] = []  # Index into stochastic_rules for every SaC ID, -1 if deterministic
+        self._rule_numbers = {}  # id() of a stochastic rule -> its index in stochastic_rules
+        self._arrays = None
+
+    def __len__(self) -> int:
+        """Return the number of SaC IDs the table covers."""
+        return len(self.option_starts)
+
+    def update(self):
+        """Extend the table to cover SaCs that were added to the registry since it was last built."""
+        sac_id = len(self.option_starts)
+        while sac_id < len(self.registry):
+            sac = self.registry[sac_id]
+            rule = self.rule_index.find(sac)
+            self.option_starts.append(len(self.starts))
+            if rule is None:
+                options = [[sac_id]]
+                self.stochastic_rule_of.append(-1)
+            elif isinstance(rule, StochasticProductionRule):
+                options = [[self.registry.intern_sac(s) for s in word.sacs] for word in rule.words]
+                if id(rule) not in self._rule_numbers:
+                    self._rule_numbers[id(rule)] = len(self.stochastic_rules)
+                    self.stochastic_rules.append(rule)
+                self.stochastic_rule_of.append(self._rule_numbers[id(rule)])
+            else:
+                options = [[self.registry.intern_sac(s) for s in rule.produce(sac).sacs]]
+                self.stochastic_rule_of.append(-1)
+            for option in options:
+                self.starts.append(len(self.flat))
+                self.lengths.append(len(option))
+                self.flat.extend(option)
+            sac_id += 1
+            self._arrays = None
+
+    def apply(self, sac_ids: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Rewrite a word given as SaC IDs, drawing the choices of the stochastic rules from a random generator.
+
+        The choices are drawn rule by rule, in the order the rules were first used, so the result only depends on the
+        word and the state of the generator.
+
+        :param sac_ids: The SaC ID of every position of the word.
+        :param rng: A NumPy random generator.
+        :return: The SaC IDs of the successor word, as an int32 array.
+        """
+        if len(sac_ids) and sac_ids.max() >= len(self.option_starts):
+            self.update()
+        if self._arrays is None:
+            self._arrays = (np.asarray(self.flat, dtype=np.int32), np.asarray(self.starts, dtype=np.int64),
+                            np.asarray(self.lengths, dtype=np.int64), np.asarray(self.option_starts, dtype=np.int64),
+                            np.asarray(self.stochastic_rule_of, dtype=np.int64))
+        flat, starts, lengths, option_starts, stochastic_rule_of = self._arrays
+
+        options = option_starts[sac_ids]
+        rule_of_position = stochastic_rule_of[sac_ids]
+        for number, rule in enumerate(self.stochastic_rules):
+            positions = np.flatnonzero(rule_of_position == number)
+            if len(positions):
+                options[positions] += rule.sample_batch(len(positions), rng)
+        return gather(flat, starts, lengths, options)
@@ -0,0 +1,229 @@
+import numpy as np
+
+from ProductionRules.RuleIndex import RuleIndex
+from Utility.matrix_utils import INT64_LIMIT
+from Utility.rolling_hash import symbol_values, segment_combine
+from WordsAndSymbols.SaCRegistry import SaCRegistry
+
+
+def gather(flat: np.ndarray, starts: np.ndarray, lengths: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Concatenate the segments flat[starts[i]:starts[i] + lengths[i]] for every i in indices.
+
+    :param flat: The concatenated segments.
+    :param starts: The start of every segment in flat.
+    :param lengths: The length of every segment.
+    :param indices: The segments to concatenate, in order.
+    :return: The concatenation, as an int32 array.
+    """
+    segment_lengths = lengths[indices]
+    ends = np.cumsum(segment_lengths)
+    if len(ends) == 0 or ends[-1] == 0:
+        return np.zeros(0, dtype=np.int32)
+
+    # For output position p of segment i: flat index = starts[i] + (p - first output of i)
+    offsets = np.repeat(starts[indices] - (ends - segment_lengths), segment_lengths)
+    return flat[offsets + np.arange(ends[-1])]
+
+
+def exact_cumsum(values: np.ndarray) -> np.ndarray:
+    """
+    Prefix sums of non-negative integers, int64 if the total cannot overflow and object (Python integers) otherwise.
+
+    :param values: The values, int64 or object.
+    :return: The prefix sums.
+    """
+    if values.dtype != object and int(values.max(initial=0)) * len(values) >= INT64_LIMIT:
+        values = values.astype(object)
+    return np.cumsum(values)
+
+
+class SuccessorTable:
+    def __init__(self, rule_index: RuleIndex, registry: SaCRegistry):
+        """
+        The successor of every SaC in a registry under a set of deterministic rules, stored as flat ID arrays.
+
+        The successors are concatenated in `flat`, the successor of SaC ID i is flat[starts[i]:starts[i] + lengths[i]].
+        A SaC without a matching rule is its own successor. With this table a whole generation of a D0L-system is
+        rewritten with a single gather over the SaC ID array of the previous generation.
+
+        :param rule_index: The compiled rules, every rule must be deterministic.
+        :param registry: The SaC registry the words and successors are interned in.
+        """
+        self.rule_index = rule_index
+        self.registry = registry
+        self.flat = np.zeros(0, dtype=np.int32)
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.lengths = np.zeros(0, dtype=np.int64)
+        self._expansion_lengths = []  # Entry d: length of every SaC after d generations
+        self._expansion_offsets = []  # Entry d: prefix sums of the entry d expansion lengths over flat
+        self._expansion_hashes = []  # Entry d: rolling hash of the symbols every SaC expands to after d generations
+
+    def __len__(self) -> int:
+        """Return the number of SaC IDs the table covers."""
+        return len(self.lengths)
+
+    def update(self):
+        """Extend the table to cover SaCs that were added to the registry since it was last built."""
+        flat, lengths = [], []
+        sac_id = len(self.lengths)
+        # Interning a successor can add new SaCs to the registry, they need a successor as well
+        while sac_id < len(self.registry):
+            sac = self.registry[sac_id]
+            rule = self.rule_index.find(sac)
+            if rule is None:
+                successor = [sac_id]
+            else:
+                successor = [self.registry.intern_sac(s) for s in rule.produce(sac).sacs]
+            flat.extend(successor)
+            lengths.append(len(successor))
+            sac_id += 1
+
+        if lengths:
+            lengths = np.asarray(lengths, dtype=np.int64)
+            starts = len(self.flat) + np.concatenate(([0], np.cumsum(lengths[:-1])))
+            self.flat = np.concatenate((self.flat, np.asarray(flat, dtype=np.int32)))
+            self.starts = np.concatenate((self.starts, starts))
+            self.lengths = np.concatenate((self.lengths, lengths))
+            self._expansion_lengths = []
+            self._expansion_offsets = []
+            self._expansion_hashes = []
+
+    def apply(self, sac_ids: np.ndarray) -> np.ndarray:
+        """
+        Rewrite a word given as SaC IDs.
+
+        :param sac_ids: The SaC ID of every position of the word.
+        :return: The SaC IDs of the successor word, as an int32 array.
+        """
+        if len(sac_ids) and sac_ids.max() >= len(self.lengths):
+            self.update()
+        return gather(self.flat, self.starts, self.lengths, sac_ids)
+
+    def expansion_lengths(self, n: int) -> np.ndarray:
+        """
+        Return the length every SaC expands to after n generations.
+
+        The lengths of all depths up to n are computed once and kept, each depth is a gather and a prefix sum over the
+        previous one. They are int64 while that is exact and object (Python integers) after that.
+
+        :param n: The number of generations.
+        :return: An array indexed by SaC ID.
+        """
+        self.update()
+        if not self._expansion_lengths:
+            self._expansion_lengths.append(np.ones(len(self.lengths), dtype=np.int64))
+        while len(self._expansion_lengths) <= n:
+            previous = self._expansion_lengths[-1]
+            # The offsets sum the lengths over all of flat, so they can overflow before a single length does
+            cumulative = exact_cumsum(previous[self.flat])
+            offsets = np.concatenate((np.zeros(1, dtype=cumulative.dtype), cumulative))
+            self._expansion_offsets.append(offsets)
+            self._expansion_lengths.append(offsets[self.starts + self.lengths] - offsets[self.starts])
+        return self._expansion_lengths[n]
+
+    def expansion_hashes(self, n: int) -> np.ndarray:
+        """
+        Return the rolling hash (see Utility.rolling_hash) of the symbols every SaC expands to after n generations.
+
+        The hash of an expansion is combined from the hashes and lengths of the expansions of its successor, so no
+        expansion is materialised.
+
+        :param n: The number of generations.
+        :return: An (number of SaCs, 2) int64 array indexed by SaC ID.
+        """
+        self.expansion_lengths(n)
+        if not self._expansion_hashes:
+            self._expansion_hashes.append(symbol_values(self.registry.symbol_ids()[:len(self.lengths)]))
+        while len(self._expansion_hashes) <= n:
+            depth = len(self._expansion_hashes) - 1
+            self._expansion_hashes.append(segment_combine(self._expansion_hashes[depth][self.flat],
+                                                          self._expansion_lengths[depth][self.flat],
+                                                          self.starts, self.lengths))
+        return self._expansion_hashes[n]
+
+    def expansion_counts(self, sac_ids: np.ndarray, n: int) -> np.ndarray:
+        """
+        Count the SaCs of the word that a word expands to after n generations.
+
+        :param sac_ids: The SaC IDs of the word to expand.
+        :param n: The number of generations.
+        :return: The number of occurrences of every SaC, indexed by SaC ID. Python integers if an int64 could overflow.
+        """
+        lengths = self.expansion_lengths(n)
+        exact = lengths.dtype != object and int(lengths.max(initial=0)) * len(sac_ids) < INT64_LIMIT
+        dtype = np.int64 if exact else object
+        counts = np.zeros(len(self.lengths), dtype=dtype)
+        np.add.at(counts, sac_ids, 1)
+        for _ in range(n):
+            successor_counts = np.zeros(len(self.lengths), dtype=dtype)
+            np.add.at(successor_counts, self.flat, np.repeat(counts, self.lengths))
+            counts = successor_counts
+        return counts
+
+    def locate(self, sac_ids: np.ndarray, n: int, index: int) -> int:
+        """
+        Find the SaC at a position of the word that a word expands to after n generations.
+
+        The position is found by descending from the word to generation n, at every level the child that contains the
+        position is found by binary search in the prefix sums of the expansion lengths.
+
+        :param sac_ids: The SaC IDs of the word to expand.
+        :param n: The number of generations.
+        :param index: The position in the expanded word.
+        :return: The SaC ID at the position.
+        """
+        cumulative = exact_cumsum(self.expansion_lengths(n)[sac_ids])
+        offsets = np.concatenate((np.zeros(1, dtype=cumulative.dtype), cumulative))
+        if not 0 <= index < offsets[-1]:
+            raise IndexError("Index out of bounds for the generation.")
+        child = int(np.searchsorted(offsets, index, side="right")) - 1
+        sac_id = int(sac_ids[child])
+        index -= offsets[child]
+        for depth in range(n - 1, -1, -1):
+            offsets = self._expansion_offsets[depth]
+            start = self.starts[sac_id]
+            target = offsets[start] + index
+            position = int(np.searchsorted(offsets, target, side="right")) - 1
+            sac_id = int(self.flat[position])
+            index = target - offsets[position]
+        return sac_id
+
+    def window(self, sac_ids: np.ndarray, n: int, start: int, stop: int) -> np.ndarray:
+        """
+        Find the SaCs of positions [start, stop) of the word that a word expands to after n generations.
+
+        Only the subtrees that overlap the window are descended into.
+
+        :param sac_ids: The SaC IDs of the word to expand.
+        :param n: The number of generations.
+        :param start: The first position in the expanded word.
+        :param stop: The position after the last one.
+        :return: The SaC IDs of the window, as an int32 array.
+        """
+        lengths = self.expansion_lengths(n)
+        stop = min(stop, sum(lengths[sac_ids].tolist()))  # Python integers, the total can overflow an int64
+        result = []
+        # Each stack entry is (children, depth of the children, window relative to the first child)
+        stack = [(sac_ids, n, start, stop)]
+        while stack:
+            children, depth, start, stop = stack.pop()
+            if depth == 0:
+                result.append(children[start:stop])
+                continue
+            lengths = self._expansion_lengths[depth]
+            position = 0
+            pending = []
+            for child in children.tolist():
+                length = int(lengths[child])
+                if position + length > start and position < stop:
+                    first = self.starts[child]
+                    pending.append((self.flat[first:first + self.lengths[child]], depth - 1,
+                                    max(start - position, 0), min(stop - position, length)))
+                position += length
+                if position >= stop:
+                    break
+            stack.extend(reversed(pending))
+        if not result:
+            return np.zeros(0, dtype=np.int32)
+        return np.concatenate(result).astype(np.int32)
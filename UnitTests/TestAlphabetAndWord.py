@@ -85,6 +85,22 @@ class TestAlphabetAndWord(unittest.TestCase):
             right_context = [self.alphabet.get_symbol(id_) for id_ in sac.right_context]
             print(f"Left: {left_context}, Symbol: {symbol}, Right: {right_context}")
 
+    def test_tokenize(self):
+        self.assertEqual(self.alphabet.tokenize("A[+FB]").tolist(), [1, 7, 5, 4, 2, 8])
+        self.assertEqual(self.alphabet.tokenize("A_X_B").tolist(), [1, 9, 2])
+
+        # Multi-character symbols added later are tokenized too
+        self.alphabet.add_symbol("Leaf", 10)
+        self.assertEqual(self.alphabet.tokenize("_Leaf_A_Leaf_").tolist(), [10, 1, 10])
+        self.assertEqual(Word.tokenize("_Leaf_C", self.alphabet), ["Leaf", "C"])
+
+        with self.assertRaisesRegex(ValueError, "Unknown symbol: Q"):
+            self.alphabet.tokenize("AQ")
+        with self.assertRaisesRegex(ValueError, "Unknown symbol: Lea"):
+            self.alphabet.tokenize("A_Lea_")
+        with self.assertRaisesRegex(ValueError, "unmatched underscores"):
+            self.alphabet.tokenize("A_Leaf")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
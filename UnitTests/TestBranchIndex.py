@@ -0,0 +1,39 @@
+import unittest
+
+from Utility.context_utils import get_context
+from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.BranchIndex import BranchIndex
+from WordsAndSymbols.Word import Word
+
+
+class TestBranchIndex(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"A": 0, "B": 1, "C": 2, "F": 3, "+": 4, "-": 5, "[": 6, "]": 7},
+            identity_symbols={"F", "+", "-", "[", "]"}
+        )
+        self.strings = ["A[+FB]-C", "B[-F+A]C[+F-A]", "AB[C[A]B]CA", "A]B[C", "[[A]B"]
+
+    def test_contexts_match_get_context(self):
+        for s in self.strings:
+            index = BranchIndex(s, self.alphabet)
+            for k, l in [(-1, -1), (0, 0), (1, 1), (2, 3)]:
+                for i in range(len(s)):
+                    self.assertEqual(get_context(s, i, self.alphabet, k, l, branch_index=index),
+                                     get_context(s, i, self.alphabet, k, l), f"{s} at {i}, k={k}, l={l}")
+
+    def test_structure(self):
+        index = Word.from_string("AB[C[A]B]CA", self.alphabet, 1, 1).branch_index(self.alphabet)
+        self.assertEqual(index.match.tolist(), [-1, -1, 8, -1, 6, -1, 4, -1, 2, -1, -1])
+        self.assertEqual(index.depth.tolist(), [0, 0, 0, 1, 1, 2, 1, 1, 0, 0, 0])
+        self.assertEqual(index.next[1], 9)  # B jumps over the whole branch
+        self.assertEqual(index.skip_branch(2), 8)
+        self.assertEqual(index.branch_start(7), 2)  # The inner branch is skipped
+        self.assertEqual(index.branch_start(5), 4)
+        self.assertEqual(index.branch_start(10), -1)
+        self.assertEqual(index.branch_start(8), 2)  # A "]" belongs to the branch it closes
+        self.assertEqual(index.enclosing.tolist(), [-1, -1, -1, 2, 2, 4, 4, 2, 2, -1, -1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.CompactWord import CompactWord
+from WordsAndSymbols.SaC import SaC, ANY_SYMBOL_ID
+from WordsAndSymbols.Word import Word
+
+
+class TestCompactWord(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"A": 0, "B": 1, "C": 2, "F": 3, "+": 4, "-": 5, "[": 6, "]": 7},
+            identity_symbols={"F", "+", "-", "[", "]"}
+        )
+        self.string = "AB[+FA]-C_B_"  # _B_ is a (single) symbol written with underscores
+        self.word = Word.from_string(self.string, self.alphabet, k=1, l=1)
+        self.compact = CompactWord.from_string(self.string, self.alphabet, k=1, l=1)
+
+    def test_same_as_word(self):
+        self.assertEqual(len(self.compact), len(self.word))
+        self.assertEqual(self.compact.sacs_to_string(self.alphabet.reverse_mappings),
+                         self.word.sacs_to_string(self.alphabet.reverse_mappings))
+        self.assertEqual(self.compact.sac_counts, self.word.sac_counts)
+        self.assertEqual(self.compact.symbol_counts, self.word.symbol_counts)
+        for i in range(len(self.word)):
+            self.assertIs(self.compact[i], self.word[i])
+        self.assertEqual(self.compact[-1], self.word[-1])
+        self.assertEqual(self.compact[1:3], self.word.sacs[1:3])
+        self.assertEqual(self.compact.find_by_symbol(0), self.word.find_by_symbol(0))
+
+    def test_parameters_are_sparse(self):
+        self.assertEqual(len(self.compact.parameters), len(self.word))
+        self.assertTrue(self.compact.parameters.is_empty())
+        self.compact.parameters[2]["n"] = 3
+        self.assertEqual(self.compact.parameters.mask("n").nonzero()[0].tolist(), [2])
+        self.assertEqual(self.compact.parameters[2], {"n": 3})
+
+    def test_append(self):
+        self.compact.append_word(Word([SaC([ANY_SYMBOL_ID], 2, [ANY_SYMBOL_ID])]))
+        self.compact.add_sac(SaC([ANY_SYMBOL_ID], 0, [ANY_SYMBOL_ID]))
+
+        self.assertEqual(self.compact.sacs_to_string(self.alphabet.reverse_mappings), "AB[+FA]-CBCA")
+        self.assertEqual(self.compact.symbol_counts[0], 3)
+        self.assertEqual(len(self.compact.parameters), len(self.compact))
+
+
+if __name__ == "__main__":
+    unittest.main()
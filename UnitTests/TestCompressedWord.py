@@ -0,0 +1,92 @@
+import io
+import unittest
+from unittest import mock
+from WordsAndSymbols.Word import Word
+from WordsAndSymbols.SaC import SaC, ANY_SYMBOL_ID
+from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.CompressedWord import CompressedWord
+from ProductionRules.ProductionRule import DeterministicProductionRule
+from LSystems.LSystem import LSystem
+from Utility.rolling_hash import hash_symbols
+
+
+class TestCompressedWord(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"X": 0, "Y": 1},
+            identity_symbols={"F", "+", "-"}
+        )
+
+    def _system(self, compressed):
+        system = LSystem("dragon", "FX", self.alphabet, compressed=compressed)
+        for symbol, successor in (("X", "X+YF+"), ("Y", "-FX-Y")):
+            sac = SaC([ANY_SYMBOL_ID], self.alphabet.get_id(symbol), [ANY_SYMBOL_ID])
+            system.add_rule(sac, DeterministicProductionRule(sac, Word.from_string(successor, self.alphabet, 0, 0)))
+        return system
+
+    def test_matches_flat_words(self):
+        flat = self._system(compressed=False)
+        compressed = self._system(compressed=True)
+        flat.iterate(6)
+        compressed.iterate(6)
+        num_symbols = len(self.alphabet.symbols)
+        reverse_mappings = self.alphabet.reverse_mappings
+
+        for flat_word, word in zip(flat.words[1:], compressed.words[1:]):
+            self.assertIsInstance(word, CompressedWord)
+            self.assertEqual(len(word), len(flat_word))
+            self.assertEqual(word.sacs_to_string(reverse_mappings), flat_word.sacs_to_string(reverse_mappings))
+            self.assertEqual(word.parikh_vector(num_symbols).tolist(), flat_word.parikh_vector(num_symbols).tolist())
+            self.assertEqual(word.symbol_counts, flat_word.symbol_counts)
+            self.assertEqual([sac.symbol for sac in word], [sac.symbol for sac in flat_word.sacs])
+            self.assertEqual([sac.symbol for sac in word[2:30]], [sac.symbol for sac in flat_word[2:30]])
+            self.assertEqual(word[-1].symbol, flat_word[len(flat_word) - 1].symbol)
+            self.assertEqual(word.content_hash(), tuple(hash_symbols(flat_word.symbol_id_array()).tolist()))
+
+        # Every generation only stores the axiom and its depth
+        self.assertEqual(compressed.words[-1].depth, 6)
+        self.assertEqual(len(compressed.words[-1].sac_ids), 2)
+
+    def test_hash_and_equality(self):
+        system = self._system(compressed=True)
+        other = self._system(compressed=True)
+        system.iterate(5)
+        other.iterate(5)
+        self.assertEqual(system.words[-1], other.words[-1])
+        self.assertEqual(hash(system.words[-1]), hash(other.words[-1]))
+        self.assertNotEqual(system.words[-1], system.words[-2])
+
+        # A hash collision is caught by the exact comparison
+        word = system.words[-1]
+        changed = CompressedWord(word.sac_ids[::-1], word.depth, word.successor_table)
+        self.assertEqual(changed.length, word.length)
+        changed._content_hash = word.content_hash()
+        self.assertNotEqual(changed, word)
+        # The same symbols from a different root are confirmed chunk by chunk
+        expanded_root = CompressedWord(word.successor_table.apply(word.sac_ids), word.depth - 1, word.successor_table)
+        self.assertEqual(expanded_root, word)
+
+    def test_stream_generation(self):
+        flat = self._system(compressed=False)
+        flat.iterate(6)
+        system = self._system(compressed=True)
+        system.iterate(4)
+
+        # The chunks are cut out of the compressed word without expanding it
+        sink = io.StringIO()
+        with mock.patch.object(CompressedWord, "sacs", new_callable=mock.PropertyMock, side_effect=AssertionError):
+            system.stream_generation(2, sink, chunk_size=3)
+        self.assertEqual(sink.getvalue(), flat.to_string())
+
+    def test_deep_generation(self):
+        system = self._system(compressed=True)
+        system.iterate(80)
+        word = system.words[-1]
+        self.assertEqual(word.length, 2 ** 82 - 2)
+        self.assertEqual(sum(word.parikh_vector(len(self.alphabet.symbols)).tolist()), word.length)
+        with self.assertRaises(TypeError):
+            word.add_sac(word[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
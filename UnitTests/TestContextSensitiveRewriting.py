@@ -0,0 +1,55 @@
+import random
+import unittest
+from WordsAndSymbols.Word import Word
+from WordsAndSymbols.SaC import SaC
+from WordsAndSymbols.Alphabet import Alphabet
+from ProductionRules.ProductionRule import DeterministicProductionRule
+from LSystems.LSystem import LSystem
+from Utility.context_utils import get_contexts, get_context_windows
+
+
+class TestContextSensitiveRewriting(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"a": 0, "b": 1},
+            identity_symbols={"F", "+", "[", "]"}
+        )
+        self.a, self.b = 0, 1
+
+    def _add_rule(self, system, left, symbol, right, successor):
+        sac = SaC(left, symbol, right)
+        system.add_rule(sac, DeterministicProductionRule(sac, Word.from_string(successor, self.alphabet, 0, 0)))
+
+    def test_signal_propagation(self):
+        system = LSystem("signal", "baaaa", self.alphabet, k=1, l=1)
+        self._add_rule(system, [self.b], self.a, [], "b")
+        self._add_rule(system, [], self.b, [], "a")
+        system.iterate(4)
+        self.assertEqual([word.sacs_to_string(self.alphabet.reverse_mappings) for word in system.words],
+                         ["baaaa", "abaaa", "aabaa", "aaaba", "aaaab"])
+
+        # The SaCs are the same as those of a word built from the string
+        for word in system.words:
+            expected = Word.from_string(word.sacs_to_string(self.alphabet.reverse_mappings), self.alphabet, 1, 1)
+            self.assertEqual(word.sac_ids, expected.sac_ids)
+
+    def test_branches(self):
+        system = LSystem("branches", "b[a]+a", self.alphabet, k=1, l=1)
+        self._add_rule(system, [self.b], self.a, [], "b")
+        self._add_rule(system, [], self.b, [], "a")
+        system.iterate(1)
+        # The "a" in the branch has no left context, "+" is ignored and the branch is skipped
+        self.assertEqual(system.to_string(), "a[a]+b")
+
+    def test_context_windows(self):
+        random.seed(3)
+        for _ in range(300):
+            string = "".join(random.choice("abF+[]") for _ in range(random.randrange(30)))
+            k, l = random.randrange(4), random.randrange(4)
+            left, right = get_contexts(string, self.alphabet, k, l)
+            windows = get_context_windows([self.alphabet.get_id(c) for c in string], self.alphabet, k, l)
+            self.assertEqual(windows, ([tuple(c) for c in left], [tuple(c) for c in right]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from Utility.context_utils import get_context, get_contexts, determine_context_depth, match_brackets
+from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.SaC import ANY_SYMBOL_ID
+
+
+class TestContextUtils(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"A": 0, "B": 1, "C": 2, "F": 3, "+": 4, "-": 5, "[": 6, "]": 7},
+            identity_symbols={"F", "+", "-", "[", "]"}
+        )
+        self.strings = ["A[+FB]-C", "B[-F+A]C[+F-A]", "AB[C[A]B]CA", "A]B[C", "[[A]B"]
+
+    def test_match_brackets(self):
+        self.assertEqual(match_brackets("A[B[C]]]"), [-1, 6, -1, 5, -1, 3, 1, -1])
+
+    def test_get_contexts_matches_get_context(self):
+        for s in self.strings:
+            for k, l in [(-1, -1), (0, 0), (1, 1), (2, 3)]:
+                left_contexts, right_contexts = get_contexts(s, self.alphabet, k=k, l=l)
+                for idx in range(len(s)):
+                    lc, _, rc = get_context(string=s, index=idx, alphabet=self.alphabet, k=k, l=l)
+                    self.assertEqual(left_contexts[idx], lc, f"{s} left of {idx}, k={k}")
+                    self.assertEqual(right_contexts[idx], rc, f"{s} right of {idx}, l={l}")
+
+    def test_branches_are_skipped(self):
+        left_contexts, right_contexts = get_contexts("AB[C[A]B]CA", self.alphabet, k=2, l=2)
+        a, b, c = (self.alphabet.get_id(x) for x in "ABC")
+
+        self.assertEqual(right_contexts[1], [c, a])  # B sees past the whole branch
+        self.assertEqual(left_contexts[9], [a, b])  # C sees past the whole branch
+        self.assertEqual(left_contexts[3], [ANY_SYMBOL_ID])  # Nothing to the left inside the branch
+        self.assertEqual(right_contexts[3], [b])
+
+    def test_determine_context_depth(self):
+        self.assertEqual(determine_context_depth(["AB[C[A]B]CA"], self.alphabet), (3, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
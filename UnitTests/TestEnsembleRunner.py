@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from WordsAndSymbols.Word import Word
+from WordsAndSymbols.SaC import SaC, ANY_SYMBOL_ID
+from WordsAndSymbols.Alphabet import Alphabet
+from ProductionRules.ProductionRule import StochasticProductionRule
+from LSystems.LSystem import LSystem
+from LSystems.EnsembleRunner import EnsembleRunner
+
+
+def stochastic_system():
+    alphabet = Alphabet(mappings={"X": 0}, identity_symbols={"F", "+"})
+    system = LSystem("stochastic", "X", alphabet)
+    sac = SaC([ANY_SYMBOL_ID], alphabet.get_id("X"), [ANY_SYMBOL_ID])
+    options = {Word.from_string("FX", alphabet, 0, 0): 0.5, Word.from_string("X+X", alphabet, 0, 0): 0.5}
+    system.add_rule(sac, StochasticProductionRule(sac, options))
+    return system
+
+
+class TestEnsembleRunner(unittest.TestCase):
+    def test_reproducible_across_workers(self):
+        serial = EnsembleRunner(stochastic_system, n=5, m=12, seed=3, workers=1).run()
+        parallel = EnsembleRunner(stochastic_system, n=5, m=12, seed=3, workers=2).run(chunk_size=5)
+        for key in ("symbols", "starts", "lengths"):
+            self.assertTrue(np.array_equal(serial[key], parallel[key]))
+
+        self.assertEqual(serial["lengths"].shape, (12, 6))
+        self.assertEqual(EnsembleRunner.word_string(serial, 0, 0), "X")
+        # The derivations are independent
+        strings = {EnsembleRunner.word_string(serial, d, 5) for d in range(12)}
+        self.assertGreater(len(strings), 1)
+
+    def test_write_and_load(self):
+        runner = EnsembleRunner(stochastic_system, n=4, m=3, seed=8, workers=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ensemble.npz")
+            written = runner.write(path)
+            loaded = EnsembleRunner.load(path)
+        for key, value in written.items():
+            self.assertTrue(np.array_equal(value, loaded[key]))
+        for d in range(3):
+            self.assertEqual(EnsembleRunner.word_string(loaded, d, 4), EnsembleRunner.word_string(written, d, 4))
+
+    def test_symbol_dtype_follows_ids(self):
+        def system():
+            # Few symbols, but IDs that do not fit in an int8
+            alphabet = Alphabet(mappings={"X": 200}, identity_symbols={"F", "+"})
+            lsystem = LSystem("stochastic", "X", alphabet)
+            sac = SaC([ANY_SYMBOL_ID], alphabet.get_id("X"), [ANY_SYMBOL_ID])
+            options = {Word.from_string("FX", alphabet, 0, 0): 0.5, Word.from_string("X+X", alphabet, 0, 0): 0.5}
+            lsystem.add_rule(sac, StochasticProductionRule(sac, options))
+            return lsystem
+
+        ensemble = EnsembleRunner(system, n=3, m=2, seed=1, workers=1).run()
+        self.assertEqual(ensemble["symbols"].dtype, np.int16)
+        self.assertEqual(EnsembleRunner.word_string(ensemble, 0, 0), "X")
+        self.assertEqual(EnsembleRunner(stochastic_system, n=1, m=1, seed=1, workers=1).run()["symbols"].dtype, np.int8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+import io
+import unittest
+from WordsAndSymbols.Word import Word
+from WordsAndSymbols.SaC import SaC, ANY_SYMBOL_ID
+from WordsAndSymbols.Alphabet import Alphabet
+import numpy as np
+from ProductionRules.ProductionRule import DeterministicProductionRule, StochasticProductionRule, \
+    ParametricProductionRule
+from LSystems.LSystem import LSystem
+from Utility.rolling_hash import hash_symbols
+
+
+class TestLSystem(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"X": 0, "Y": 1},
+            identity_symbols={"F", "+", "-"}
+        )
+
+    def _system(self):
+        system = LSystem("dragon", "X", self.alphabet)
+        for symbol, successor in (("X", "X+YF+"), ("Y", "-FX-Y")):
+            sac = SaC([ANY_SYMBOL_ID], self.alphabet.get_id(symbol), [ANY_SYMBOL_ID])
+            system.add_rule(sac, DeterministicProductionRule(sac, Word.from_string(successor, self.alphabet, 0, 0)))
+        return system
+
+    def test_generate(self):
+        system = self._system()
+        system.iterate(4)
+        expected = [word.sacs_to_string(self.alphabet.reverse_mappings) for word in system.words[1:]]
+
+        system = self._system()
+        words = [word.sacs_to_string(self.alphabet.reverse_mappings) for word in system.generate(4, keep_last=2)]
+        self.assertEqual(words, expected)
+        self.assertEqual(len(system.words), 2)
+        self.assertEqual(system.to_string(), expected[-1])
+
+        with self.assertRaises(ValueError):
+            next(system.generate(1, keep_last=0))
+
+    def test_stream_generation(self):
+        system = self._system()
+        system.iterate(6)
+        expected = system.to_string()
+
+        system = self._system()
+        sink = io.StringIO()
+        self.assertEqual(system.stream_generation(6, sink, chunk_size=3), len(expected))
+        self.assertEqual(sink.getvalue(), expected)
+        self.assertEqual(len(system.words), 1)  # The streamed generation is not stored
+
+        chunks = []
+        system.is_d0l = lambda: False  # Stream through the rule index instead of the successor table
+        system.stream_generation(6, chunks.append, chunk_size=2)
+        self.assertEqual("".join(chunks), expected)
+
+    def test_stream_context_sensitive(self):
+        system = self._system()
+        sac = SaC([self.alphabet.get_id("X")], self.alphabet.get_id("Y"), [])
+        system.add_rule(sac, DeterministicProductionRule(sac, Word.from_string("Y", self.alphabet, 0, 0)))
+        with self.assertRaises(ValueError):
+            system.stream_generation(2, io.StringIO())
+
+    def test_parikh_fast_forward(self):
+        system = self._system()
+        num_symbols = len(self.alphabet.symbols)
+        matrix = system.growth_matrix()
+        successor_counts = {"X": "X+YF+", "Y": "-FX-Y", "F": "F"}
+        for symbol, successor in successor_counts.items():
+            for other in "XYF+-":
+                self.assertEqual(matrix[self.alphabet.get_id(symbol), self.alphabet.get_id(other)],
+                                 successor.count(other))
+
+        system.iterate(6)
+        vectors = system.parikh_vectors(6)
+        for i, word in enumerate(system.words):
+            self.assertEqual(vectors[i].tolist(), word.parikh_vector(num_symbols).tolist())
+        self.assertEqual(system.lengths(6).tolist(), [len(word) for word in system.words])
+        self.assertEqual(system.parikh_vector(6).tolist(), vectors[6].tolist())
+
+        # Deep generations are computed exactly with Python integers
+        self.assertEqual(int(system.lengths(100)[-1]), 2 ** 102 - 3)
+        self.assertEqual(int(system.parikh_vector(100).sum()), 2 ** 102 - 3)
+
+    def test_growth_matrix_sparse_ids(self):
+        # Symbol IDs starting at 1, the matrix is still indexed by ID
+        self.alphabet = Alphabet(mappings={"X": 1, "Y": 2}, identity_symbols={"F", "+", "-"})
+        system = self._system()
+        matrix = system.growth_matrix()
+        self.assertEqual(matrix.shape[0], self.alphabet.num_symbol_ids())
+        self.assertEqual(matrix[self.alphabet.get_id("Y"), self.alphabet.get_id("F")], 1)
+        self.assertEqual(matrix[self.alphabet.get_id("Y"), self.alphabet.get_id("Y")], 1)
+
+        system.iterate(5)
+        self.assertEqual(system.lengths(5).tolist(), [len(word) for word in system.words])
+
+    def test_random_access(self):
+        system = self._system()
+        system.iterate(7)
+        expected = system.to_string()
+
+        system = self._system()
+        for i in (0, 1, 17, len(expected) - 1):
+            self.assertEqual(system.symbol_at(7, i), expected[i])
+        self.assertEqual(system.substring(7, 5, 60), expected[5:60])
+        self.assertEqual(system.substring(7, len(expected) - 3, len(expected) + 10), expected[-3:])
+        self.assertEqual(system.substring(7, 10, 10), "")
+        self.assertEqual(len(system.words), 1)  # Nothing was generated
+
+        with self.assertRaises(IndexError):
+            system.symbol_at(7, len(expected))
+
+        # Positions far beyond an int64 are reached with exact integers
+        self.assertIn(system.symbol_at(100, 2 ** 100), "XYF+-")
+
+    def test_fingerprints(self):
+        system = self._system()
+        system.iterate(5)
+        expected = [(len(word), tuple(hash_symbols(word.symbol_id_array()).tolist())) for word in system.words]
+        self.assertEqual(system.fingerprints(5), expected)
+
+        strings = [word.sacs_to_string(self.alphabet.reverse_mappings) for word in system.words]
+        system = self._system()
+        self.assertTrue(system.reproduces(strings[2:5], start=2))
+        self.assertFalse(system.reproduces(strings[2:5], start=1))
+        self.assertFalse(system.reproduces([strings[3].replace("+", "-", 1)], start=3))
+        self.assertFalse(system.reproduces(["X+YQ"], start=1))
+
+        system.is_d0l = lambda: False  # Generate and hash the words instead
+        self.assertEqual(system.fingerprints(5), expected)
+        self.assertTrue(system.reproduces(strings, start=0))
+        self.assertFalse(system.reproduces(strings[2:5], start=1))
+
+        # Every generation is rewritten once, and not past the first mismatch
+        rewrite, calls = system.rewrite, []
+        system.rewrite = lambda word, rng=None: calls.append(1) or rewrite(word, rng)
+        self.assertTrue(system.reproduces(strings[2:5], start=2))
+        self.assertEqual(len(calls), 4)
+        calls.clear()
+        self.assertFalse(system.reproduces(strings[2:5], start=1))
+        self.assertEqual(len(calls), 1)
+
+    def test_seeded_stochastic_generation(self):
+        def system():
+            result = LSystem("stochastic", "X", self.alphabet)
+            sac = SaC([ANY_SYMBOL_ID], self.alphabet.get_id("X"), [ANY_SYMBOL_ID])
+            options = {Word.from_string("FX", self.alphabet, 0, 0): 0.5, Word.from_string("X+X", self.alphabet, 0, 0): 0.5}
+            result.add_rule(sac, StochasticProductionRule(sac, options))
+            return result
+
+        first, second = system(), system()
+        self.assertTrue(first.is_0l())
+        self.assertFalse(first.is_d0l())
+        first.iterate(8, rng=11)
+        second.iterate(8, rng=np.random.default_rng(11))
+        self.assertEqual(first.to_string(), second.to_string())
+
+        third = system()
+        third.iterate(8, rng=12)
+        self.assertNotEqual(first.to_string(), third.to_string())
+
+        # Every X is rewritten to one or two X
+        for previous, word in zip(first.words, first.words[1:]):
+            count = previous.symbol_counts[self.alphabet.get_id("X")]
+            self.assertTrue(count <= word.symbol_counts[self.alphabet.get_id("X")] <= 2 * count)
+
+    def test_vectorized_parametric_rule(self):
+        # X(x) -> F(2x) X(x + 1), evaluated once per generation for all X
+        def grow(columns):
+            x = columns["x"]
+            return Word.from_string("FX", self.alphabet, 0, 0), [{"length": 2 * x}, {"x": x + 1}]
+
+        sac = SaC([ANY_SYMBOL_ID], self.alphabet.get_id("X"), [ANY_SYMBOL_ID])
+        rule = ParametricProductionRule(sac, vectorized_function=grow)
+        system = LSystem("growth", "X+X", self.alphabet)
+        system.add_rule(sac, rule)
+        system.words[0].parameters[0]["x"] = 1
+        system.words[0].parameters[2]["x"] = 10
+        system.iterate(3)
+
+        word = system.words[-1]
+        self.assertEqual(system.to_string(), "FFFX+FFFX")
+        self.assertEqual(list(word.parameters)[:4], [{"length": 2}, {"length": 4}, {"length": 6}, {"x": 4}])
+        self.assertEqual(word.parameters[4], {})
+        self.assertEqual(word.parameters[8]["x"], 13)
+
+        # Without a parametric function a single position is rewritten through the vectorized function
+        produced = rule.produce(sac, parameters={"x": 3})
+        self.assertEqual(list(produced.parameters), [{"length": 6}, {"x": 4}])
+
+        # A context-sensitive system rewrites position by position with the parameters of the word
+        context_sac = SaC([self.alphabet.get_id("Y")], self.alphabet.get_id("X"), [self.alphabet.get_id("Y")])
+        context = LSystem("context", "YXY", self.alphabet, 1, 1)
+        context.add_rule(context_sac, ParametricProductionRule(context_sac, vectorized_function=grow))
+        self.assertFalse(context.is_context_free())
+        context.words[0].parameters[1]["x"] = 3
+        context.words[0].parameters[2]["y"] = 1
+        context.iterate(1)
+        self.assertEqual(context.to_string(), "YFXY")
+        self.assertEqual(list(context.words[-1].parameters), [{}, {"length": 6}, {"x": 4}, {"y": 1}])
+
+        # Every streamed chunk keeps the parameters of its positions
+        streamed = LSystem("growth", "X+X", self.alphabet)
+        streamed.add_rule(sac, rule)
+        streamed.words[0].parameters[0]["x"] = 1
+        streamed.words[0].parameters[2]["x"] = 10
+        chunks = []
+        self.assertEqual(streamed.stream_generation(3, chunks.append, chunk_size=2), 9)
+        self.assertEqual("".join(chunks), "FFFX+FFFX")
+
+        # Many modules are rewritten without a call per module
+        modules = LSystem("modules", "X" * 100000, self.alphabet)
+        modules.add_rule(sac, rule)
+        modules.words[0].parameters.set_columns(np.arange(100000), {"x": np.arange(100000)})
+        modules.iterate(1)
+        self.assertEqual(len(modules.words[-1]), 200000)
+        self.assertEqual(modules.words[-1].parameters.column("x")[1::2].tolist(), list(range(1, 100001)))
+
+
+if __name__ == '__main__':
+    unittest.main()
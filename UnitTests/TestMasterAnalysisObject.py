@@ -0,0 +1,150 @@
+import contextlib
+import io
+import unittest
+import numpy as np
+from WordsAndSymbols.Alphabet import Alphabet
+from InferenceTools.Evidence import Evidence
+from InferenceTools.MasterAnalysisObject import MasterAnalysisObject, BOUND_LIMIT
+from InferenceTools.PropagationScheduler import PropagationScheduler
+
+
+class Problem:
+    """The part of an InferenceProblem used by the MAO."""
+    def __init__(self, strings, alphabet, k, l):
+        self.evidence = Evidence(strings, alphabet, k, l)
+        self.absolute_min_length = 1
+        self.MAO = None
+
+
+class TestMasterAnalysisObject(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"A": 0, "B": 1},
+            identity_symbols={"F", "+"}
+        )
+        # A -> AB, B -> A
+        self.problem = Problem(["A", "AB", "ABA", "ABAAB", "ABAABABA"], self.alphabet, 0, 0)
+        self.mao = MasterAnalysisObject(self.problem)
+
+    def test_naive_bounds(self):
+        self.assertEqual(self.mao.min_length.shape, (self.mao.num_sacs,))
+        self.assertEqual(self.mao.min_growth.shape, (self.mao.num_sacs, self.mao.num_symbols))
+        self.assertTrue((self.mao.min_length == 1).all())
+        self.assertTrue((self.mao.max_length == 8).all())
+        self.assertEqual(self.mao.symbol_counts[-1].tolist()[:2], [5, 3])
+
+    def test_tighten(self):
+        self.mao.flag = False
+        self.assertFalse(self.mao.flag)
+
+        changed = self.mao.tighten("max_length", np.array([0, 0, 1]), np.array([6, 5, 9]))
+        self.assertEqual(changed[0].tolist(), [0])
+        self.assertEqual(self.mao.max_length.tolist(), [5, 8])
+        changed = self.mao.tighten("min_length", np.array([True, True]), 2)
+        self.assertEqual(changed[0].tolist(), [0, 1])
+        self.assertTrue(self.mao.flag)
+        self.assertEqual(self.mao.changes["max_length"].tolist(), [True, False])
+
+        # A looser value changes nothing
+        self.mao.flag = False
+        self.mao.set_max_length(self.problem.evidence.sacs[0], 7)
+        self.mao.set_min_length(self.problem.evidence.sacs[0], 1)
+        self.assertFalse(self.mao.flag)
+        self.mao.set_max_length(self.problem.evidence.sacs[0], 3)
+        self.assertTrue(self.mao.changes["max_length"][0])
+
+    def test_analysis_passes(self):
+        passes = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.mao.compute_length_absolute_min_max()
+            while self.mao.flag and passes < 20:
+                passes += 1
+                self.mao.flag = False
+                self.mao.compute_unaccounted_growth_matrix()
+                self.mao.compute_unaccounted_length_matrix()
+                self.mao.compute_length_total_symbol_production()
+        # The passes reach a fixed point, where no bound changes
+        self.assertLess(passes, 20)
+        self.assertFalse(any(mask.any() for mask in self.mao.changes.values()))
+        self.assertEqual(self.mao.word_unaccounted_length.shape, (4,))
+
+    def test_integer_bounds(self):
+        sac = self.problem.evidence.sacs[0]
+        self.assertEqual(self.mao.min_length.dtype, np.int64)
+        self.assertEqual(self.mao.max_growth.dtype, np.int64)
+
+        # Fractions are rounded inward, and values out of range are clipped
+        self.mao.set_min_length(sac, 1.5)
+        self.mao.set_max_length(sac, 6.5)
+        self.assertEqual((self.mao.min_length[0], self.mao.max_length[0]), (2, 6))
+        self.mao.tighten("max_growth", (np.array([0]), np.array([0])), np.inf)
+        self.mao.tighten("min_growth", (np.array([0]), np.array([0])), -np.inf)
+        self.assertEqual((self.mao.min_growth[0, 0], self.mao.max_growth[0, 0]), (0, 0))
+        self.mao.tighten("total_length_min", np.array([0]), -np.inf)
+        self.assertEqual(self.mao.total_length_min[0], -BOUND_LIMIT)
+
+    def test_unaccounted_matrices(self):
+        counts = self.problem.evidence.sac_count_matrix()[:-1]
+        lengths = np.array([len(w) for w in self.problem.evidence.words[1:]])
+        np.testing.assert_array_equal(self.mao.word_unaccounted_length, lengths - counts @ self.mao.min_length)
+
+        # Only the changed SaC is refreshed, the result is the same as the full product
+        self.mao.set_min_length(self.problem.evidence.sacs[1], 3)
+        self.mao.set_min_growth(self.problem.evidence.sacs[0], 1, 2)
+        self.mao.compute_unaccounted_length_matrix()
+        self.mao.compute_unaccounted_growth_matrix()
+        np.testing.assert_array_equal(self.mao.word_unaccounted_length, lengths - counts @ self.mao.min_length)
+        np.testing.assert_array_equal(self.mao.word_unaccounted_growth,
+                                      self.mao.symbol_counts[1:] - counts @ self.mao.min_growth)
+        self.assertEqual(self.mao.word_unaccounted_growth[-1].tolist()[:2], [5, 3 - 2 * 3])
+
+    def test_total_symbol_production(self):
+        a = self.problem.evidence.get_sac_id(self.problem.evidence.words[0][0])
+        b = 1 - a
+        # "A" produces "AB", so A has length 2
+        self.mao.compute_length_total_symbol_production(words=[0])
+        self.assertEqual((self.mao.min_length[a], self.mao.max_length[a]), (2, 2))
+        self.assertEqual((self.mao.min_length[b], self.mao.max_length[b]), (1, 8))
+        # "AB" produces "ABA", A takes 2 of the 3 symbols, which leaves 1 for B
+        self.mao.compute_length_total_symbol_production(words=[1])
+        self.assertEqual((self.mao.min_length[b], self.mao.max_length[b]), (1, 1))
+
+        # A word with a single variable SaC gives no total length, the others do
+        self.mao.total_length_min[:] = self.mao.total_length_max[:] = 100
+        self.mao.compute_total_length_total_symbol_production()
+        self.assertEqual(self.mao.total_length_max[0], 100)
+        self.assertLess(self.mao.total_length_max[1], 100)
+
+    def test_propagation_scheduler(self):
+        strings = ["A", "AB", "ABA", "ABAAB", "ABAABABA", "ABAABABAABAAB"]
+        rescan = MasterAnalysisObject(Problem(strings, self.alphabet, 0, 0))
+        scheduled = MasterAnalysisObject(Problem(strings, self.alphabet, 0, 0))
+        rescan.problem.MAO, scheduled.problem.MAO = rescan, scheduled
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            rescan.compute_length_absolute_min_max()
+            full_evaluations = 0
+            while rescan.flag:
+                rescan.flag = False
+                rescan.compute_length_total_symbol_production()
+                rescan.compute_total_length_total_symbol_production()
+                full_evaluations += 2 * (rescan.num_words - 1)
+
+            scheduled.compute_length_absolute_min_max()
+            scheduler = PropagationScheduler(scheduled)
+            scheduler.add("length", lambda words: scheduled.compute_length_total_symbol_production(words=words),
+                          reads=["min_length", "max_length"])
+            scheduler.add("total_length",
+                          lambda words: scheduled.compute_total_length_total_symbol_production(words=words),
+                          reads=["min_length", "max_length"])
+            evaluations = scheduler.run()
+
+        # The same fixed point, with fewer evaluations
+        for name in ("min_length", "max_length", "total_length_min", "total_length_max"):
+            np.testing.assert_array_equal(getattr(scheduled, name), getattr(rescan, name))
+        self.assertLess(evaluations, full_evaluations)
+        self.assertFalse(scheduled.flag)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from WordsAndSymbols.ParameterTable import ParameterTable
+
+
+class TestParameterTable(unittest.TestCase):
+    def setUp(self):
+        self.table = ParameterTable.from_rows([{"n": 1}, {}, {"n": 2.5, "name": "leaf"}])
+
+    def test_rows(self):
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(list(self.table), [{"n": 1}, {}, {"n": 2.5, "name": "leaf"}])
+        self.assertEqual(self.table.column("n").dtype, np.float64)
+        self.assertEqual(self.table.mask("name").tolist(), [False, False, True])
+
+        self.table[1]["n"] = 4
+        del self.table[2]["name"]
+        self.assertEqual(dict(self.table[1]), {"n": 4})
+        self.assertNotIn("name", self.table[2])
+        with self.assertRaises(IndexError):
+            self.table[3]
+
+    def test_columns(self):
+        self.table.set_columns(np.array([0, 1]), {"age": np.array([7, 8])})
+        self.assertEqual(self.table.column("age")[:2].tolist(), [7, 8])
+        self.assertEqual(self.table.take([2, 0]).column("age").tolist(), [0, 7])
+
+    def test_append_and_extend(self):
+        table = ParameterTable()
+        for i in range(100):
+            table.append({"i": i} if i % 2 else {})
+        table.extend(self.table)
+        self.assertEqual(len(table), 103)
+        self.assertEqual(int(table.mask("i").sum()), 50)
+        self.assertEqual(table[102]["name"], "leaf")
+
+        # Extending copies the values
+        copy = self.table.copy()
+        copy[0]["n"] = 10
+        self.assertEqual(self.table[0]["n"], 1)
+        self.assertTrue(ParameterTable(4).is_empty())
+
+
+if __name__ == '__main__':
+    unittest.main()
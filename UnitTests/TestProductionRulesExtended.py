@@ -6,6 +6,7 @@ from ProductionRules.ProductionRule import StochasticProductionRule, ParametricP
 import random
 
 import random
+import numpy as np
 
 class TestProductionRuleExtended(unittest.TestCase):
     def setUp(self):
@@ -147,5 +148,33 @@ class TestProductionRuleExtended(unittest.TestCase):
         print("First A Results:", first_a_results)
         print("Second A Results:", second_a_results)
 
+    def test_stochastic_sample_batch(self):
+        # Define the stochastic rule: A -> {F with 70%, B with 30%}
+        words = [self._string_to_word("F"), self._string_to_word("B")]
+        rule = StochasticProductionRule(
+            sac=SaC([], self.alphabet.get_id("A"), []),
+            word_options={words[0]: 0.7, words[1]: 0.3}
+        )
+        self.assertEqual(rule.cumulative_weights.tolist(), [0.7, 1.0])
+
+        # The same seed gives the same choices
+        choices = rule.sample_batch(10000, np.random.default_rng(7))
+        self.assertEqual(choices.tolist(), rule.sample_batch(10000, np.random.default_rng(7)).tolist())
+        self.assertTrue(6700 <= (choices == 0).sum() <= 7300)
+        self.assertIn(rule.sample(np.random.default_rng(7)), words)
+
+        with self.assertRaises(ValueError):
+            StochasticProductionRule(sac=SaC([], self.alphabet.get_id("A"), []), word_options={words[0]: 0.0})
+
+        # An option with weight 0 at the end is never chosen, even at the upper end of the random range
+        class UpperEnd:
+            def random(self, m):
+                return np.ones(m)
+
+        rule = StochasticProductionRule(sac=SaC([], self.alphabet.get_id("A"), []),
+                                        word_options={words[0]: 0.3, words[1]: 0.0})
+        self.assertEqual(rule.sample_batch(5, UpperEnd()).tolist(), [0] * 5)
+        self.assertIs(rule.produce(rule.sac), words[0])
+
 if __name__ == "__main__":
     unittest.main()
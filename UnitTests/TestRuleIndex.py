@@ -0,0 +1,69 @@
+import unittest
+from WordsAndSymbols.Word import Word
+from WordsAndSymbols.SaC import SaC, ANY_SYMBOL_ID
+from WordsAndSymbols.Alphabet import Alphabet
+from ProductionRules.ProductionRule import DeterministicProductionRule
+from ProductionRules.RuleIndex import RuleIndex
+from LSystems.LSystem import LSystem
+
+
+class TestRuleIndex(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"A": 0, "B": 1, "C": 2, "[": 3, "]": 4},
+            identity_symbols={"[", "]"}
+        )
+        self.A, self.B, self.C = 0, 1, 2
+
+    def _rule(self, left, symbol, right, successor):
+        sac = SaC(left, symbol, right)
+        word = Word([SaC([], self.alphabet.get_id(c), []) for c in successor])
+        return sac, DeterministicProductionRule(sac, word)
+
+    def test_most_specific_rule(self):
+        rules = [
+            self._rule([], self.A, [], "A"),
+            self._rule([self.B], self.A, [], "B"),
+            self._rule([], self.A, [self.C], "C"),
+            self._rule([self.B], self.A, [self.C], "BC"),
+            self._rule([self.C, self.B], self.A, [], "CB"),
+        ]
+        index = RuleIndex(rules)
+        rule_of = {id(rule): sac for sac, rule in rules}
+
+        def found(left, right):
+            return rule_of[id(index.find(SaC(left, self.A, right)))]
+
+        self.assertIs(found([ANY_SYMBOL_ID], [ANY_SYMBOL_ID]), rules[0][0])
+        self.assertIs(found([self.C], [self.B]), rules[0][0])
+        self.assertIs(found([self.A, self.B], [ANY_SYMBOL_ID]), rules[1][0])
+        self.assertIs(found([self.C, self.B], [ANY_SYMBOL_ID]), rules[4][0])
+        self.assertIs(found([ANY_SYMBOL_ID], [self.C, self.A]), rules[2][0])
+        self.assertIs(found([self.C, self.B], [self.C]), rules[3][0])
+        self.assertIsNone(index.find(SaC([], self.B, [])))
+
+    def test_first_rule_wins_and_any_symbol(self):
+        rules = [
+            self._rule([], self.A, [], "B"),
+            self._rule([], self.A, [], "C"),
+            self._rule([], ANY_SYMBOL_ID, [], "A"),
+        ]
+        index = RuleIndex(rules)
+        self.assertIs(index.find(SaC([], self.A, [])), rules[0][1])
+        self.assertIs(index.find(SaC([self.C], self.B, [])), rules[2][1])
+
+    def test_lsystem_iterate(self):
+        system = LSystem("test", "BAC", self.alphabet, k=1, l=1)
+        system.add_rule(*self._rule([self.B], self.A, [self.C], "AA"))
+        system.add_rule(*self._rule([], self.B, [], "B"))
+        system.iterate(1)
+        self.assertEqual(system.to_string(), "BAAC")
+
+        # Adding a rule rebuilds the index
+        system.add_rule(*self._rule([], self.C, [], "CB"))
+        system.iterate(1)
+        self.assertEqual(system.to_string(), "BAACB")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.RunLengthWord import RunLengthWord
+from WordsAndSymbols.Word import Word
+from InferenceTools.Evidence import Evidence
+
+
+class TestRunLengthWord(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"A": 0, "B": 1, "F": 2, "+": 3, "[": 4, "]": 5},
+            identity_symbols={"F", "+", "[", "]"}
+        )
+        self.string = "ABABBBBBBBBBBBB[[+FFFFA]]AB+++BBBBBBBBA"
+
+    def test_same_as_word(self):
+        for k, l in ((0, 0), (1, 1), (2, 3), (-1, 1)):
+            word = Word.from_string(self.string, self.alphabet, k, l)
+            run_length_word = RunLengthWord.from_string(self.string, self.alphabet, k, l)
+            self.assertEqual(run_length_word.sac_ids.tolist(), list(word.sac_ids))
+            self.assertEqual(run_length_word.sac_counts, word.sac_counts)
+            self.assertEqual(run_length_word.symbol_counts, word.symbol_counts)
+            self.assertEqual(run_length_word.sacs_to_string(self.alphabet.reverse_mappings), self.string)
+            self.assertEqual(run_length_word[-1], word[-1])
+            self.assertEqual(run_length_word[3:9], word.sacs[3:9])
+            num_symbols = len(self.alphabet.symbols)
+            self.assertEqual(run_length_word.parikh_vector(num_symbols).tolist(),
+                             word.parikh_vector(num_symbols).tolist())
+
+    def test_runs(self):
+        word = RunLengthWord.from_string("A" + "B" * 100000 + "A", self.alphabet, 1, 1)
+        self.assertEqual(len(word), 100002)
+        self.assertEqual(word.run_lengths.tolist(), [1, 1, 99998, 1, 1])
+        self.assertEqual(word.symbol_counts[1], 100000)
+
+        word.add_sac(word[-1])
+        self.assertEqual(word.run_lengths.tolist(), [1, 1, 99998, 1, 2])
+        word.append_word(Word.from_string("AB", self.alphabet, 1, 1))
+        self.assertEqual(len(word), 100005)
+        self.assertEqual(len(word.parameters), 100005)
+
+        sac_ids, lengths = Word.from_string("AABA", self.alphabet, 0, 0).runs()
+        self.assertEqual(lengths.tolist(), [2, 1, 1])
+
+    def test_evidence(self):
+        strings = ["ABA", "ABABBBABA", "ABABBBABABBBBBBBBBABABBBABA"]
+        evidence = Evidence(strings, self.alphabet, 1, 1)
+        run_length = Evidence(strings, self.alphabet, 1, 1, run_length=True)
+        self.assertIsInstance(run_length.words[-1], RunLengthWord)
+        self.assertEqual(run_length.sac_ids, evidence.sac_ids)
+        self.assertTrue(np.array_equal(run_length.sac_count_matrix(), evidence.sac_count_matrix()))
+        self.assertTrue(np.array_equal(run_length.parikh_matrix(), evidence.parikh_matrix()))
+
+
+if __name__ == '__main__':
+    unittest.main()
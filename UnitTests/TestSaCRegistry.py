@@ -0,0 +1,65 @@
+import unittest
+
+from InferenceTools.Evidence import Evidence
+from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.SaC import SaC, ANY_SYMBOL_ID, EMPTY_SYMBOL_ID
+from WordsAndSymbols.SaCRegistry import SaCRegistry
+from WordsAndSymbols.Word import Word
+
+
+class TestSaCRegistry(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"A": 0, "B": 1, "F": 2, "+": 3, "-": 4, "[": 5, "]": 6},
+            identity_symbols={"F", "+", "-", "[", "]"}
+        )
+
+    def test_intern_assigns_dense_ids(self):
+        registry = SaCRegistry()
+        a = registry.intern([ANY_SYMBOL_ID], 0, [1])
+        b = registry.intern([0], 1, [ANY_SYMBOL_ID])
+        again = registry.intern([ANY_SYMBOL_ID], 0, [1])
+
+        self.assertEqual((a, b, again), (0, 1, 0))
+        self.assertEqual(len(registry), 2)
+        self.assertEqual(registry[b].symbol, 1)
+
+    def test_wildcard_contexts_share_an_id(self):
+        registry = SaCRegistry()
+        a = registry.intern([], 0, [ANY_SYMBOL_ID])
+        b = registry.intern([EMPTY_SYMBOL_ID], 0, [])
+
+        self.assertEqual(a, b)
+        self.assertEqual(registry.get_id(SaC([ANY_SYMBOL_ID], 0, [ANY_SYMBOL_ID])), a)
+        self.assertIsNone(registry.get_id(SaC([1], 0, [ANY_SYMBOL_ID])))
+
+    def test_from_string_stores_ids(self):
+        word = Word.from_string("AB[+FA]B", self.alphabet, k=1, l=1)
+
+        self.assertEqual(len(word.sac_ids), len(word))
+        for sac_id, sac in zip(word.sac_ids, word.sacs):
+            self.assertIs(self.alphabet.sac_registry[sac_id], sac)
+
+    def test_evidence_sac_id(self):
+        evidence = Evidence(["AB", "ABB[+FA]", "ABB[+FA]BB[+FA]"], self.alphabet, k=1, l=1)
+
+        for i, sac in enumerate(evidence.sacs):
+            self.assertEqual(evidence.get_sac_id(sac), i)
+            self.assertEqual(evidence.get_sac_id(SaC(sac.left_context, sac.symbol, sac.right_context)), i)
+
+        last_only = [sac for sac in evidence.words[-1].sacs if sac not in evidence.sacs]
+        self.assertTrue(last_only)
+        with self.assertRaises(ValueError):
+            evidence.get_sac_id(last_only[0])
+
+    def test_evidence_parikh_matrix_sparse_ids(self):
+        # Symbol IDs starting at 1, the columns are still indexed by ID
+        alphabet = Alphabet(mappings={"A": 1, "B": 2}, identity_symbols={"F"})
+        evidence = Evidence(["A", "AB", "ABF"], alphabet, k=0, l=0)
+
+        self.assertEqual(alphabet.num_symbol_ids(), 4)
+        self.assertEqual(evidence.parikh_matrix().tolist(), [[0, 1, 0, 0], [0, 1, 1, 0], [0, 1, 1, 1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+from WordsAndSymbols.Word import Word
+from WordsAndSymbols.SaC import SaC, ANY_SYMBOL_ID
+from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.CompactWord import CompactWord
+from ProductionRules.ProductionRule import DeterministicProductionRule, StochasticProductionRule
+from ProductionRules.RuleIndex import RuleIndex
+from ProductionRules.SuccessorTable import SuccessorTable
+from LSystems.LSystem import LSystem
+
+
+class TestSuccessorTable(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"X": 0, "Y": 1},
+            identity_symbols={"F", "+", "-"}
+        )
+
+    def _system(self):
+        system = LSystem("dragon", "X", self.alphabet)
+        for symbol, successor in (("X", "X+YF+"), ("Y", "-FX-Y")):
+            sac = SaC([ANY_SYMBOL_ID], self.alphabet.get_id(symbol), [ANY_SYMBOL_ID])
+            system.add_rule(sac, DeterministicProductionRule(sac, Word.from_string(successor, self.alphabet, 0, 0)))
+        return system
+
+    def test_apply(self):
+        system = self._system()
+        registry = self.alphabet.sac_registry
+        table = SuccessorTable(system.rule_index, registry)
+
+        word = Word.from_string("XFY", self.alphabet, 0, 0)
+        successor = CompactWord(table.apply(word.sac_id_array()), registry)
+        self.assertEqual(successor.sacs_to_string(self.alphabet.reverse_mappings), "X+YF+F-FX-Y")
+        self.assertEqual(len(table.apply(np.zeros(0, dtype=np.int32))), 0)
+
+    def test_iterate_d0l(self):
+        fast = self._system()
+        slow = self._system()
+        self.assertTrue(fast.is_d0l())
+
+        fast.iterate(6)
+        for _ in range(6):
+            # One generation at a time through the rule index
+            word = Word([])
+            for sac in slow.words[-1].sacs:
+                word.append_word(slow.apply_rule(sac))
+            slow.words.append(word)
+
+        for fast_word, slow_word in zip(fast.words, slow.words):
+            self.assertEqual(fast_word.sacs_to_string(self.alphabet.reverse_mappings),
+                             slow_word.sacs_to_string(self.alphabet.reverse_mappings))
+            self.assertEqual(fast_word.symbol_counts, slow_word.symbol_counts)
+
+    def test_deep_positions(self):
+        # Every symbol doubles, so no single length overflows at depth 60 but the total of 20 symbols does
+        letters = "ABCDEFGHIJKLMNOPQRST"
+        alphabet = Alphabet(mappings={c: i for i, c in enumerate(letters)}, identity_symbols=set())
+        system = LSystem("doubling", letters, alphabet)
+        for c in letters:
+            sac = SaC([ANY_SYMBOL_ID], alphabet.get_id(c), [ANY_SYMBOL_ID])
+            system.add_rule(sac, DeterministicProductionRule(sac, Word.from_string(c + c, alphabet, 0, 0)))
+
+        for n in (59, 60, 61):
+            size = 2 ** n
+            self.assertEqual(int(system.lengths(n)[-1]), 20 * size)
+            self.assertEqual(system.symbol_at(n, 0), "A")
+            self.assertEqual(system.symbol_at(n, size), "B")
+            self.assertEqual(system.symbol_at(n, 19 * size + 7), "T")
+            self.assertEqual(system.symbol_at(n, 20 * size - 1), "T")
+            self.assertEqual(system.substring(n, size - 2, size + 2), "AABB")
+            self.assertEqual(system.substring(n, 20 * size - 2, 20 * size + 5), "TT")
+            with self.assertRaises(IndexError):
+                system.symbol_at(n, 20 * size)
+
+    def test_not_d0l(self):
+        system = self._system()
+        sac = SaC([], self.alphabet.get_id("X"), [self.alphabet.get_id("Y")])
+        system.add_rule(sac, DeterministicProductionRule(sac, Word.from_string("Y", self.alphabet, 0, 0)))
+        self.assertFalse(system.is_d0l())
+
+        system = self._system()
+        sac = SaC([], self.alphabet.get_id("Y"), [])
+        options = {Word.from_string("Y", self.alphabet, 0, 0): 1.0}
+        system.add_rule(sac, StochasticProductionRule(sac, options))
+        self.assertFalse(system.is_d0l())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+from WordsAndSymbols.Alphabet import Alphabet
+from Utility.turtle_utils import interpret, rasterize
+
+
+class TestTurtleUtils(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet(
+            mappings={"X": 0},
+            identity_symbols={"F", "+", "-", "|", "[", "]"}
+        )
+
+    def _segments(self, string, **kwargs):
+        return interpret([self.alphabet.get_id(c) for c in string], self.alphabet, **kwargs)
+
+    def test_square(self):
+        segments = self._segments("F+F+XF+F")
+        self.assertEqual(segments.shape, (4, 2, 2))
+        self.assertTrue(np.allclose(segments[:, 0], [[0, 0], [0, 1], [-1, 1], [-1, 0]]))
+        self.assertTrue(np.allclose(segments[-1, 1], [0, 0]))
+
+    def test_branches(self):
+        segments = self._segments("F[+F[-F]F]|F", angle=45)
+        # The last step starts where the branch started, turned around
+        self.assertTrue(np.allclose(segments[-1], [[0, 1], [0, 0]]))
+        self.assertTrue(np.allclose(segments[2, 0], segments[1, 1]))
+        self.assertTrue(np.allclose(segments[3, 0], segments[1, 1]))
+        with self.assertRaises(ValueError):
+            self._segments("F]F")
+
+    def test_rasterize(self):
+        image = rasterize(self._segments("F+F+F+F"), 11)
+        self.assertEqual(image.shape, (11, 11))
+        # The outline of a square, one pixel from the border
+        self.assertTrue(image[1, 1:10].all() and image[9, 1:10].all() and image[1:10, 1].all())
+        self.assertFalse(image[2:9, 2:9].any())
+        self.assertFalse(rasterize(np.zeros((0, 2, 2)), 5).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
+
+from WordsAndSymbols.Alphabet import Alphabet
 from WordsAndSymbols.Word import Word
+from WordsAndSymbols.WordBuilder import WordBuilder
 from WordsAndSymbols.SaC import SaC, EMPTY_SYMBOL_ID, ANY_SYMBOL_ID
 
 
@@ -77,5 +80,55 @@ class TestWord(unittest.TestCase):
         str = word.sacs_to_string(self.reverse_mapping)
         self.assertEqual(str, "λC")
 
+    def test_count_vectors(self):
+        alphabet = Alphabet(mappings={"A": 0, "B": 1, "CC": 2, "F": 3}, identity_symbols={"F"})
+        word = Word.from_string("AB_CC_FA_CC_B", alphabet, k=0, l=0)
+
+        self.assertEqual(word.parikh_vector(4).tolist(), [2, 2, 2, 1])
+        counts = word.sac_count_vector(len(alphabet.sac_registry))
+        self.assertEqual(counts.sum(), len(word))
+        for sac, count in word.sac_counts.items():
+            self.assertEqual(counts[alphabet.sac_registry.get_id(sac)], count)
+
+        word.add_sac(alphabet.sac_registry[word.sac_ids[0]])
+        self.assertEqual(word.parikh_vector(4).tolist(), [3, 2, 2, 1])
+
+    def test_incremental_counts(self):
+        alphabet = Alphabet(mappings={"A": 0, "B": 1, "F": 2}, identity_symbols={"F"})
+        word = Word.from_string("ABF", alphabet, k=1, l=1)
+        other = Word.from_string("BBA", alphabet, k=1, l=1)
+
+        word.append_word(other)
+        word.add_sac(other[0])
+        expected = Word(word.sacs, list(word.sac_ids))
+        self.assertEqual(word.sac_counts, expected.sac_counts)
+        self.assertEqual(word.symbol_counts, {0: 2, 1: 4, 2: 1})
+
+        builder = WordBuilder(alphabet.sac_registry)
+        builder.append_word(Word.from_string("ABF", alphabet, k=1, l=1))
+        builder.append_word(other)
+        builder.add_sac(other[0])
+        built = builder.build()
+        self.assertEqual(built.sac_ids, word.sac_ids)
+        self.assertEqual(built.sac_counts, word.sac_counts)
+        self.assertEqual(len(built.parameters), len(built))
+
+    def test_add_sac_from_other_registry(self):
+        alphabet = Alphabet(mappings={"A": 0, "B": 1, "F": 2}, identity_symbols={"F"})
+        other_alphabet = Alphabet(mappings={"A": 0, "B": 1, "F": 2}, identity_symbols={"F"})
+        other_alphabet.sac_registry.intern([1], 1, [1])  # Shifts the IDs of the other registry
+        foreign = Word.from_string("BA", other_alphabet, k=0, l=0)[1]
+
+        word = Word.from_string("AB", alphabet, k=0, l=0)
+        word.add_sac(foreign)
+        self.assertEqual(word.sac_ids[2], alphabet.sac_registry.get_id(foreign))
+        self.assertEqual(alphabet.sac_registry[word.sac_ids[2]].symbol, 0)
+
+        builder = WordBuilder(alphabet.sac_registry)
+        builder.add_sac(foreign)
+        builder.append_word(Word.from_string("BA", other_alphabet, k=0, l=0))
+        self.assertEqual(builder.build().sac_ids, [word.sac_ids[0], word.sac_ids[1], word.sac_ids[0]])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,11 +2,10 @@ import math
 from typing import Tuple
 
 from Utility.analysis_utils import calculate_modified_weighted_mean
-from Utility.string_utils import substrings_from_left, substrings_from_right
 #from WordsAndSymbols.Alphabet import Alphabet
-from WordsAndSymbols.SaC import ANY_SYMBOL, ANY_SYMBOL_ID, EMPTY_SYMBOL
+from WordsAndSymbols.SaC import ANY_SYMBOL_ID
 
-def get_context(string, index, alphabet, k=-1, l=-1):
+def get_context(string, index, alphabet, k=-1, l=-1, branch_index=None):
     """
     Determine the context of a symbol in an L-system string.
 
@@ -16,6 +15,8 @@ def get_context(string, index, alphabet, k=-1, l=-1):
     - k (int): The maximum length of the left context (-1 for longest possible).
     - l (int): The maximum length of the right context (-1 for longest possible).
     - ignore_list (list): A list of symbols to ignore when determining context.
+    - branch_index (BranchIndex): Optional index of the string (see Word.branch_index()), the context is then found by
+      following its links instead of scanning the string.
 
     Returns:
     - tuple: (left_context, symbol, right_context) where:
@@ -23,6 +24,9 @@ def get_context(string, index, alphabet, k=-1, l=-1):
       - symbol (str): The target symbol.
       - right_context (list): The right context symbols.
     """
+    if branch_index is not None:
+        return branch_index.left_context(index, k), string[index], branch_index.right_context(index, l)
+
     # Helper function to skip ignored symbols
     def skip_ignored(seq):
         return [s for s in seq if s not in alphabet.ignore_list]
@@ -78,6 +82,170 @@ def get_context(string, index, alphabet, k=-1, l=-1):
     # Return results
     return left_context, symbol, right_context
 
+def match_brackets(symbols):
+    """
+    Find the matching bracket of every bracket in a sequence of symbols.
+
+    :param symbols: The string (or list of symbols) to index.
+    :return: A list where entry i is the position of the bracket matching symbols[i], or -1 if symbols[i] is not a
+             bracket or has no match.
+    """
+    match = [-1] * len(symbols)
+    open_brackets = []
+    for i, symbol in enumerate(symbols):
+        if symbol == "[":
+            open_brackets.append(i)
+        elif symbol == "]" and open_brackets:
+            j = open_brackets.pop()
+            match[i] = j
+            match[j] = i
+    return match
+
+def visible_positions(symbols, alphabet, match):
+    """
+    For every position, find the nearest symbol that can be part of its context on either side.
+
+    Scanning left, a complete branch [...] is skipped in one jump through the match index and an unmatched "[" (the
+    start of the branch holding the position) ends the context. Scanning right is the mirror image. Symbols in the
+    alphabet's ignore list are never part of a context.
+
+    :param symbols: The string (or list of symbols) to index.
+    :param alphabet: The alphabet providing the ignore list.
+    :param match: The matching bracket of every position, see match_brackets().
+    :return: Two lists (left, right) where entry i is the position of the nearest visible symbol, or -1 if none.
+    """
+    n = len(symbols)
+    left, right = [-1] * n, [-1] * n
+
+    last = -1
+    for i, symbol in enumerate(symbols):
+        left[i] = last
+        if symbol == "[":
+            last = -1
+        elif symbol == "]":
+            last = left[match[i]] if match[i] != -1 else -1
+        elif symbol not in alphabet.ignore_list:
+            last = i
+
+    last = -1
+    for i in range(n - 1, -1, -1):
+        right[i] = last
+        symbol = symbols[i]
+        if symbol == "]":
+            last = -1
+        elif symbol == "[":
+            last = right[match[i]] if match[i] != -1 else -1
+        elif symbol not in alphabet.ignore_list:
+            last = i
+
+    return left, right
+
+def get_contexts(symbols, alphabet, k=-1, l=-1):
+    """
+    Determine the context of every symbol in an L-system string in linear time.
+
+    This gives the same contexts as calling get_context() for each position, but the branch structure is indexed once
+    instead of being rescanned for every symbol.
+
+    :param symbols: The string (or list of symbols, e.g. with multi-character symbols) to analyze.
+    :param alphabet: The alphabet providing the mappings and the ignore list.
+    :param k: The maximum length of the left context (-1 for longest possible).
+    :param l: The maximum length of the right context (-1 for longest possible).
+    :return: A tuple (left_contexts, right_contexts) of lists of symbol IDs, one per position. A position without
+             context gets [ANY_SYMBOL_ID].
+    """
+    left, right = visible_positions(symbols, alphabet, match_brackets(symbols))
+    left_contexts, right_contexts = [], []
+
+    for i in range(len(symbols)):
+        context = []
+        j = left[i]
+        while j != -1 and (k == -1 or len(context) < k):
+            context.append(alphabet.mappings[symbols[j]])
+            j = left[j]
+        context.reverse()
+        left_contexts.append(context if context else [ANY_SYMBOL_ID])
+
+        context = []
+        j = right[i]
+        while j != -1 and (l == -1 or len(context) < l):
+            context.append(alphabet.mappings[symbols[j]])
+            j = right[j]
+        right_contexts.append(context if context else [ANY_SYMBOL_ID])
+
+    return left_contexts, right_contexts
+
+def get_context_windows(symbol_ids, alphabet, k, l):
+    """
+    Determine the context of every symbol in a word given as symbol IDs, keeping the contexts as sliding windows.
+
+    The left pass keeps the last k visible symbols as a tuple, a "[" pushes the window and starts an empty one and a
+    "]" restores the window from before its "[". The right pass is the mirror image in reverse. The contexts are the
+    same as those of get_contexts(), but the work per symbol is bounded by k and l and the contexts come out as tuples,
+    ready to be used as SaC keys.
+
+    :param symbol_ids: The symbol ID of every position.
+    :param alphabet: The alphabet providing the mappings and the ignore list.
+    :param k: The maximum length of the left context (at least 0).
+    :param l: The maximum length of the right context (at least 0).
+    :return: A tuple (left_contexts, right_contexts) of lists of tuples, one per position. A position without context
+             gets (ANY_SYMBOL_ID,).
+    """
+    open_id = alphabet.mappings.get("[")
+    close_id = alphabet.mappings.get("]")
+    ignored = {alphabet.mappings[symbol] for symbol in alphabet.ignore_list if symbol in alphabet.mappings}
+    no_context = (ANY_SYMBOL_ID,)
+    n = len(symbol_ids)
+    left_contexts, right_contexts = [no_context] * n, [no_context] * n
+
+    window, stack = (), []
+    for i, symbol_id in enumerate(symbol_ids):
+        if window:
+            left_contexts[i] = window
+        if symbol_id == open_id:
+            stack.append(window)
+            window = ()
+        elif symbol_id == close_id:
+            window = stack.pop() if stack else ()
+        elif symbol_id not in ignored and k > 0:
+            window = (window + (symbol_id,))[-k:]
+
+    window, stack = (), []
+    for i in range(n - 1, -1, -1):
+        symbol_id = symbol_ids[i]
+        if window:
+            right_contexts[i] = window
+        if symbol_id == close_id:
+            stack.append(window)
+            window = ()
+        elif symbol_id == open_id:
+            window = stack.pop() if stack else ()
+        elif symbol_id not in ignored and l > 0:
+            window = ((symbol_id,) + window)[:l]
+
+    return left_contexts, right_contexts
+
+def get_context_depths(symbols, alphabet):
+    """
+    Determine the length of the longest possible left and right context of every symbol in linear time.
+
+    :param symbols: The string (or list of symbols) to analyze.
+    :param alphabet: The alphabet providing the ignore list.
+    :return: A tuple (left_depths, right_depths) of lists of ints, one per position.
+    """
+    left, right = visible_positions(symbols, alphabet, match_brackets(symbols))
+    n = len(symbols)
+    left_depths, right_depths = [0] * n, [0] * n
+
+    for i in range(n):
+        if left[i] != -1:
+            left_depths[i] = left_depths[left[i]] + 1
+    for i in range(n - 1, -1, -1):
+        if right[i] != -1:
+            right_depths[i] = right_depths[right[i]] + 1
+
+    return left_depths, right_depths
+
 def determine_context_depth(strings, alphabet) -> Tuple[int, int]:
     """
     Determine the longest possible left and right context depths.
@@ -87,13 +255,12 @@ def determine_context_depth(strings, alphabet) -> Tuple[int, int]:
     max_i, max_j = 0, 0
 
     for s in strings:
+        left_depths, right_depths = get_context_depths(s, alphabet)
         for idx, char in enumerate(s):
             if char in alphabet.identities:
                 continue  # Turtle graphics and optionally 'F' do not have context
-            lc, s, rc = get_context(string=s, index=idx, k=-1, l=-1, alphabet=alphabet)
-
-            max_i = max(max_i, len(lc)) if lc != [ANY_SYMBOL_ID] else max_i
-            max_j = max(max_j, len(rc)) if rc != [ANY_SYMBOL_ID] else max_j
+            max_i = max(max_i, left_depths[idx])
+            max_j = max(max_j, right_depths[idx])
 
     return max_i, max_j
 
@@ -111,38 +278,14 @@ def histogram_context(strings, alphabet):
                   if symbol not in alphabet.ignore_list}
 
     for s in strings:
+        left_depths, right_depths = get_context_depths(s, alphabet)
         for idx, symbol in enumerate(s):
             if symbol in histo_left:
-                # Process left context
-                lc, _, _= get_context(string=s, index=idx, alphabet=alphabet, k=-1, l=-1)
-                if lc != [ANY_SYMBOL_ID] and lc != [ANY_SYMBOL]:
-                    subs = substrings_from_right(alphabet.ids_to_string(lc, True, True))
-                    #for ss in subs:
-                    #    if ss in histo_left[symbol]:
-                    #        histo_left[symbol][ss] += 1
-                    #    else:
-                    #        histo_left[symbol][ss] = 1
-
-                    for ss in subs:
-                        if len(ss) in histo_left[symbol]:
-                            histo_left[symbol][len(ss)] += 1
-                        else:
-                            histo_left[symbol][len(ss)] = 1
-
-                _, _ , rc = get_context(string=s, index=idx, alphabet=alphabet, k=-1, l=-1)
-                if rc != [ANY_SYMBOL_ID] and rc != [ANY_SYMBOL]:
-                    subs = substrings_from_left(alphabet.ids_to_string(rc, True, True))
-                    #for ss in subs:
-                    #    if ss in histo_right[symbol]:
-                    #        histo_right[symbol][ss] += 1
-                    #    else:
-                    #        histo_right[symbol][ss] = 1
-                    for ss in subs:
-                        if len(ss) in histo_right[symbol]:
-                            histo_right[symbol][len(ss)] += 1
-                        else:
-                            histo_right[symbol][len(ss)] = 1
-
+                # Every suffix of the left context (and prefix of the right context) is counted by its length
+                for length in range(1, left_depths[idx] + 1):
+                    histo_left[symbol][length] = histo_left[symbol].get(length, 0) + 1
+                for length in range(1, right_depths[idx] + 1):
+                    histo_right[symbol][length] = histo_right[symbol].get(length, 0) + 1
 
     return histo_left, histo_right
 
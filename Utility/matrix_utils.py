@@ -0,0 +1,68 @@
+import numpy as np
+
+# Largest value an int64 computation may reach before switching to Python integers
+INT64_LIMIT = 2 ** 62
+
+
+def power_dtype(vector, matrix, n):
+    """
+    Choose a dtype that holds vector @ matrix^k exactly for all k <= n.
+
+    Every entry of vector @ matrix^k is at most sum(vector) * r^k, where r is the largest row sum of the (non-negative)
+    matrix. If that bound fits in an int64 the product is computed with int64, otherwise with Python integers.
+
+    :param vector: A non-negative integer row vector.
+    :param matrix: A non-negative integer square matrix.
+    :param n: The highest power.
+    :return: np.int64 or object.
+    """
+    total = int(np.sum(vector))
+    row_sum = int(np.max(np.sum(matrix, axis=1), initial=0))
+    if row_sum <= 1:
+        return np.int64 if total < INT64_LIMIT else object
+    # Compare logarithms first so a huge n does not build a huge integer
+    if np.log2(max(total, 1)) + n * np.log2(row_sum) > 64:
+        return object
+    return np.int64 if total * row_sum ** n < INT64_LIMIT else object
+
+
+def vector_matrix_powers(vector, matrix, n):
+    """
+    Compute vector @ matrix^k for k = 0..n with exact integers.
+
+    :param vector: A non-negative integer row vector.
+    :param matrix: A non-negative integer square matrix.
+    :param n: The highest power.
+    :return: An (n + 1) x len(vector) array, int64 if that is exact and object (Python integers) otherwise.
+    """
+    dtype = power_dtype(vector, matrix, n)
+    matrix = np.asarray(matrix).astype(dtype)
+    result = np.empty((n + 1, len(vector)), dtype=dtype)
+    result[0] = np.asarray(vector).astype(dtype)
+    for k in range(n):
+        result[k + 1] = result[k] @ matrix
+    return result
+
+
+def vector_matrix_power(vector, matrix, n):
+    """
+    Compute vector @ matrix^n with exact integers, using exponentiation by squaring.
+
+    :param vector: A non-negative integer row vector.
+    :param matrix: A non-negative integer square matrix.
+    :param n: The power.
+    :return: A vector, int64 if that is exact and object (Python integers) otherwise.
+    """
+    # The squares of the matrix can grow faster than the vector, so their bound decides the dtype
+    dtype = power_dtype(np.ones(len(vector), dtype=np.int64), matrix, n)
+    if dtype is np.int64:
+        dtype = power_dtype(vector, matrix, n)
+    result = np.asarray(vector).astype(dtype)
+    square = np.asarray(matrix).astype(dtype)
+    while n > 0:
+        if n & 1:
+            result = result @ square
+        n >>= 1
+        if n:
+            square = square @ square
+    return result
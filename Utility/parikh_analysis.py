@@ -4,58 +4,48 @@ from LSystems.InferenceProblem import InferenceProblem
 
 
 def analyze_words_growth(problem: InferenceProblem):
-    num_sacs = len(problem.evidence.sacs_to_solve)
-    num_words = len(problem.evidence.words)
-    num_symbols = len(problem.evidence.alphabet.variables) + len(problem.evidence.alphabet.identities)
-
     # P: Matrix representing the predecessor words
     # S: Matrix representing the successor words
     # G: The growth matrix
-    P = np.zeros((num_words-1, num_sacs), dtype=int)
-    S = np.zeros((num_words-1, num_symbols), dtype=int)
 
     # set up the P matrix
     # Only include SaCs that need to be solved
-    for row, w in enumerate(problem.evidence.words[:-1]):
-        for col, sac in enumerate(problem.evidence.sacs_to_solve):
-            if sac in w.sac_counts:
-                P[row, col] += w.sac_counts[sac]
+    P = predecessor_matrix(problem)
 
     # set up the S matrix
     # Since identity symbols are not in the P matrix (as their rules are known)
     # The S matrix must only include unaccounted for growth
-    for iWord, w in enumerate(problem.evidence.words[1:]):
-        for symbol in problem.evidence.alphabet.symbols:
-            S[iWord,problem.evidence.alphabet.get_id(symbol)] = problem.MAO.word_unaccounted_growth[iWord][problem.evidence.alphabet.get_id(symbol)]
+    S = np.asarray(problem.MAO.word_unaccounted_growth).astype(int)
 
     G = solve_matrix_equation(P,S)
 
     return G
 
 def analyze_words_length(problem: InferenceProblem):
-    num_sacs = len(problem.evidence.sacs_to_solve)
-    num_words = len(problem.evidence.words)
-
     # P: Matrix representing the predecessor words
     # S: Matrix representing the successor words
     # L: The length matrix
-    P = np.zeros((num_words-1, num_sacs), dtype=int)
-    S = np.zeros((num_words-1, 1), dtype=int)
 
     # set up the P matrix
     # Only include SaCs that need to be solved
-    for row, w in enumerate(problem.evidence.words[:-1]):
-        for col, sac in enumerate(problem.evidence.sacs_to_solve):
-            if sac in w.sac_counts:
-                P[row, col] += w.sac_counts[sac]
-
-    for row, w in enumerate(problem.evidence.words[1:]):
-        S[row, 0] += problem.MAO.word_unaccounted_length[row]
+    P = predecessor_matrix(problem)
+    S = np.asarray(problem.MAO.word_unaccounted_length).astype(int).reshape(-1, 1)
 
     N = solve_matrix_equation(P,S)
 
     return N
 
+def predecessor_matrix(problem: InferenceProblem):
+    """
+    Build the P matrix, the number of times each SaC to solve occurs in each predecessor word.
+
+    :param problem: The problem holding the evidence.
+    :return: A (words - 1 x SaCs to solve) int matrix.
+    """
+    evidence = problem.evidence
+    columns = [evidence.get_sac_id(sac) for sac in evidence.sacs_to_solve]
+    return evidence.sac_count_matrix()[:-1, columns].astype(int)
+
 def solve_matrix_equation(P, S):
     """
     Solves the matrix equation P x N = S for N.
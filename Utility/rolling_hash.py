@@ -0,0 +1,90 @@
+import numpy as np
+
+# Every hash is a pair of polynomial hashes modulo two primes below 2^31, so a product of two residues fits an int64
+MODULI = np.array([2147483647, 2147483629], dtype=np.int64)
+BASES = np.array([1000003, 998244353], dtype=np.int64)
+
+# Symbol IDs start at MULTICHAR_SYMBOL_ID (-3), shift them so no symbol hashes to 0
+SYMBOL_OFFSET = 4
+
+
+def symbol_values(symbol_ids) -> np.ndarray:
+    """
+    Return the hash of every single symbol.
+
+    :param symbol_ids: An array of symbol IDs.
+    :return: An (N, 2) int64 array.
+    """
+    values = np.asarray(symbol_ids, dtype=np.int64) + SYMBOL_OFFSET
+    return values[:, None] % MODULI
+
+
+def powers(exponents) -> np.ndarray:
+    """
+    Compute BASE^e modulo each modulus for an array of exponents.
+
+    Exponents can be Python integers of any size (object arrays), they are reduced modulo p - 1 first.
+
+    :param exponents: An array of non-negative exponents.
+    :return: An (N, 2) int64 array.
+    """
+    exponents = np.asarray(exponents)
+    # BASE^(p - 1) = 1 modulo a prime p (Fermat), so the exponents can be reduced to int64
+    reduced = np.stack([(exponents % int(p - 1)).astype(np.int64) for p in MODULI], axis=1)
+    result = np.ones(reduced.shape, dtype=np.int64)
+    square = np.broadcast_to(BASES, reduced.shape).copy()
+    while reduced.any():
+        odd = (reduced & 1).astype(bool)
+        result[odd] = result[odd] * square[odd] % np.broadcast_to(MODULI, reduced.shape)[odd]
+        reduced >>= 1
+        square = square * square % MODULI
+    return result
+
+
+def segment_combine(hashes: np.ndarray, lengths, starts, counts) -> np.ndarray:
+    """
+    Combine the hashes of consecutive parts into the hashes of their concatenations.
+
+    The parts are grouped into segments, segment s consists of the parts starts[s] .. starts[s] + counts[s] - 1. The
+    hash of a concatenation a + b is hash(a) * BASE^len(b) + hash(b), so each part is multiplied by BASE to the total
+    length of the parts after it in its segment.
+
+    :param hashes: The (Q, 2) hashes of the parts.
+    :param lengths: The Q lengths of the parts, int64 or Python integers.
+    :param starts: The index of the first part of every segment.
+    :param counts: The number of parts of every segment.
+    :return: The (S, 2) hashes of the segments.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = starts + np.asarray(counts, dtype=np.int64)
+    lengths = np.asarray(lengths)
+    offsets = np.concatenate((np.zeros(1, dtype=lengths.dtype), np.cumsum(lengths)))
+
+    # Length of the parts after each part within its segment
+    segment = np.repeat(np.arange(len(starts)), ends - starts)
+    positions = np.arange(len(hashes))
+    terms = hashes * powers(offsets[ends[segment]] - offsets[positions + 1]) % MODULI
+
+    sums = np.concatenate((np.zeros((1, 2), dtype=np.int64), np.cumsum(terms, axis=0)))
+    return (sums[ends] - sums[starts]) % MODULI
+
+
+def combine(hashes: np.ndarray, lengths) -> np.ndarray:
+    """
+    Combine the hashes of consecutive parts into the hash of their concatenation.
+
+    :param hashes: The (Q, 2) hashes of the parts.
+    :param lengths: The Q lengths of the parts.
+    :return: The hash of the concatenation, a (2,) array.
+    """
+    return segment_combine(hashes, lengths, [0], [len(hashes)])[0]
+
+
+def hash_symbols(symbol_ids) -> np.ndarray:
+    """
+    Hash a sequence of symbols directly.
+
+    :param symbol_ids: An array of symbol IDs.
+    :return: The hash of the sequence, a (2,) array.
+    """
+    return combine(symbol_values(symbol_ids), np.ones(len(symbol_ids), dtype=np.int64))
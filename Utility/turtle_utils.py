@@ -0,0 +1,140 @@
+import numpy as np
+
+import GlobalSettings
+
+# Turtle commands, every symbol of a word is mapped to one of these
+NONE, FORWARD, LEFT, RIGHT, TURN_AROUND, PUSH, POP = range(7)
+COMMANDS = {
+    GlobalSettings.moveForward: FORWARD,
+    GlobalSettings.turnLeft: LEFT,
+    GlobalSettings.turnRight: RIGHT,
+    GlobalSettings.turn180: TURN_AROUND,
+    GlobalSettings.startBranch: PUSH,
+    GlobalSettings.endBranch: POP,
+}
+
+
+def turtle_commands(symbol_ids, alphabet) -> np.ndarray:
+    """
+    Map the symbols of a word to turtle commands, symbols that are not turtle symbols (e.g. variables) do nothing.
+
+    :param symbol_ids: The symbol IDs of the word.
+    :param alphabet: The alphabet of the word.
+    :return: An int8 array with the command of every position.
+    """
+    symbol_ids = np.asarray(symbol_ids)
+    commands = np.zeros(len(symbol_ids), dtype=np.int8)
+    for symbol, command in COMMANDS.items():
+        if symbol in alphabet.mappings:
+            commands[symbol_ids == alphabet.get_id(symbol)] = command
+    return commands
+
+
+def interpret(symbol_ids, alphabet, angle: float = 90.0, step: float = 1.0, heading: float = 90.0,
+              start=(0.0, 0.0)) -> np.ndarray:
+    """
+    Interpret a word with turtle graphics: F draws a step forward, + and - turn left and right by the angle, | turns
+    around, [ saves the state of the turtle and ] restores it.
+
+    The word is split at the brackets into runs. Within a run the headings and positions are cumulative sums relative
+    to the start of the run, only the start state of every run is found with a branch stack.
+
+    :param symbol_ids: The symbol IDs of the word, e.g. word.symbol_id_array().
+    :param alphabet: The alphabet of the word.
+    :param angle: The turning angle in degrees.
+    :param step: The length of a step.
+    :param heading: The initial heading in degrees, 90 points up.
+    :param start: The initial position.
+    :return: An (M, 2, 2) float64 array with the start and end point of the M lines drawn.
+    """
+    commands = turtle_commands(symbol_ids, alphabet)
+    turns = np.zeros(len(commands))
+    turns[commands == LEFT] = np.radians(angle)
+    turns[commands == RIGHT] = -np.radians(angle)
+    turns[commands == TURN_AROUND] = np.pi
+    forward = commands == FORWARD
+
+    # Run r holds the positions between bracket r - 1 and bracket r
+    is_bracket = (commands == PUSH) | (commands == POP)
+    brackets = np.flatnonzero(is_bracket)
+    run_of = np.cumsum(is_bracket) - is_bracket
+    num_runs = len(brackets) + 1
+
+    # Headings and steps relative to the start of every run
+    cumulative_turns = np.cumsum(turns)
+    run_turns = np.bincount(run_of, weights=turns, minlength=num_runs)
+    turns_before_run = np.concatenate(([0.0], np.cumsum(run_turns)[:-1]))
+    relative_headings = cumulative_turns - turns_before_run[run_of]
+    relative_steps = np.where(forward, np.exp(1j * relative_headings), 0)
+    cumulative_steps = np.cumsum(relative_steps)
+    run_steps = np.bincount(run_of, weights=relative_steps.real, minlength=num_runs) + \
+        1j * np.bincount(run_of, weights=relative_steps.imag, minlength=num_runs)
+    steps_before_run = np.concatenate(([0], np.cumsum(run_steps)[:-1]))
+    relative_positions = cumulative_steps - steps_before_run[run_of] - relative_steps  # Position before the step
+
+    # The start state of every run, from the end state of the previous run or from the branch stack
+    run_headings = np.empty(num_runs)
+    run_positions = np.empty(num_runs, dtype=complex)
+    current_heading, current_position = np.radians(heading), complex(*start)
+    stack = []
+    for run, (bracket_command, turn, displacement) in enumerate(zip(commands[brackets].tolist(), run_turns.tolist(),
+                                                                   (run_steps * step).tolist())):
+        run_headings[run], run_positions[run] = current_heading, current_position
+        current_position += np.exp(1j * current_heading) * displacement
+        current_heading += turn
+        if bracket_command == PUSH:
+            stack.append((current_heading, current_position))
+        elif not stack:
+            raise ValueError("Unbalanced brackets in the word.")
+        else:
+            current_heading, current_position = stack.pop()
+    run_headings[-1], run_positions[-1] = current_heading, current_position
+
+    drawn = np.flatnonzero(forward)
+    rotations = np.exp(1j * run_headings[run_of[drawn]])
+    starts = run_positions[run_of[drawn]] + rotations * relative_positions[drawn] * step
+    ends = starts + rotations * relative_steps[drawn] * step
+    segments = np.empty((len(drawn), 2, 2))
+    segments[:, 0, 0], segments[:, 0, 1] = starts.real, starts.imag
+    segments[:, 1, 0], segments[:, 1, 1] = ends.real, ends.imag
+    return segments
+
+
+def rasterize(segments: np.ndarray, width: int, height: int = None, padding: int = 1, bounds=None) -> np.ndarray:
+    """
+    Draw line segments into an image.
+
+    The segments are scaled uniformly to fit the image, every segment is sampled at least twice per pixel.
+
+    :param segments: An (M, 2, 2) array of segments, see interpret().
+    :param width: The width of the image in pixels.
+    :param height: The height of the image in pixels, the same as the width by default.
+    :param padding: The number of empty pixels around the drawing.
+    :param bounds: Optional (min_x, min_y, max_x, max_y) of the area drawn, the bounding box of the segments by
+                   default. Use the same bounds to compare drawings of different words.
+    :return: A (height, width) boolean array, True where a segment passes.
+    """
+    height = height or width
+    image = np.zeros((height, width), dtype=bool)
+    if len(segments) == 0:
+        return image
+
+    points = segments.reshape(-1, 2)
+    if bounds is None:
+        bounds = (*points.min(axis=0), *points.max(axis=0))
+    min_x, min_y, max_x, max_y = bounds
+    extent = max(max_x - min_x, max_y - min_y) or 1.0
+    scale = (min(width, height) - 1 - 2 * padding) / extent
+
+    pixels = (segments - np.array([min_x, min_y])) * scale + padding
+    lengths = np.linalg.norm(pixels[:, 1] - pixels[:, 0], axis=1)
+    samples = np.ceil(2 * lengths).astype(np.int64) + 1
+    segment_of = np.repeat(np.arange(len(pixels)), samples)
+    first_sample = np.cumsum(samples) - samples
+    t = (np.arange(len(segment_of)) - first_sample[segment_of]) / np.maximum(samples - 1, 1)[segment_of]
+    sampled = pixels[segment_of, 0] + t[:, None] * (pixels[segment_of, 1] - pixels[segment_of, 0])
+
+    x, y = np.rint(sampled[:, 0]).astype(np.int64), np.rint(sampled[:, 1]).astype(np.int64)
+    inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    image[height - 1 - y[inside], x[inside]] = True  # Row 0 is the top of the image
+    return image
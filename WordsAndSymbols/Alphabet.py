@@ -1,5 +1,13 @@
+import re
+
+import numpy as np
+
 from WordsAndSymbols.SaC import EMPTY_SYMBOL, EMPTY_SYMBOL_ID, ANY_SYMBOL, ANY_SYMBOL_ID, MULTICHAR_SYMBOL, \
     MULTICHAR_SYMBOL_ID
+from WordsAndSymbols.SaCRegistry import SaCRegistry
+
+# Marks a character that is not a single-character symbol in the ASCII lookup table of the tokenizer
+UNKNOWN_SYMBOL_ID = np.iinfo(np.int32).min
 
 
 class Alphabet:
@@ -14,6 +22,8 @@ class Alphabet:
         self.reverse_mappings = {v: k for k, v in self.mappings.items()}
         self.identities = list(identity_symbols) or list()
         self.homomorphisms = {}
+        self.sac_registry = SaCRegistry()  # The SaCs of every word built with this alphabet
+        self._tokenizer = None  # Compiled on first use, see tokenize()
         self.variables = list(self.mappings.keys() - self.identities)
         if ignore_list != None:
             self.ignore_list = ignore_list
@@ -39,6 +49,16 @@ class Alphabet:
         self.reverse_mappings.update({EMPTY_SYMBOL_ID: EMPTY_SYMBOL, ANY_SYMBOL_ID: ANY_SYMBOL, MULTICHAR_SYMBOL_ID: MULTICHAR_SYMBOL})
         self.ignore_list.update(EMPTY_SYMBOL, ANY_SYMBOL, MULTICHAR_SYMBOL)
 
+    def num_symbol_ids(self) -> int:
+        """
+        Return the length of a vector indexed by symbol ID, e.g. a Parikh vector.
+
+        Symbol IDs do not have to start at 0 or be contiguous, so this is the largest symbol ID plus one.
+
+        :return: The number of entries.
+        """
+        return max((symbol_id for symbol_id in self.reverse_mappings if symbol_id >= 0), default=-1) + 1
+
     def add_symbol(self, symbol, id_):
         """
         Add a new symbol to the alphabet with its corresponding ID.
@@ -48,6 +68,58 @@ class Alphabet:
         """
         self.mappings[symbol] = id_
         self.reverse_mappings[id_] = symbol
+        self._tokenizer = None
+
+    def tokenize(self, string: str) -> np.ndarray:
+        """
+        Convert a string to the IDs of its symbols in one pass.
+
+        Multi-character symbols are enclosed in underscores (e.g. "A_Leaf_B"). A string without underscores that only
+        holds ASCII characters is converted with a lookup table, any other string with a regular expression over all
+        the symbols of the alphabet, compiled on first use and again after the mappings change.
+
+        :param string: A string representation of a word.
+        :return: An int32 array with the symbol ID of every position.
+        """
+        if self._tokenizer is None or self._tokenizer[0] != len(self.mappings):
+            self._compile_tokenizer()
+        _, pattern, token_ids, table = self._tokenizer
+
+        if MULTICHAR_SYMBOL not in string and string.isascii():
+            symbol_ids = table[np.frombuffer(string.encode("ascii"), dtype=np.uint8)]
+            unknown = np.flatnonzero(symbol_ids == UNKNOWN_SYMBOL_ID)
+            if len(unknown):
+                raise ValueError(f"Unknown symbol: {string[unknown[0]]}")
+            return symbol_ids
+
+        tokens = pattern.findall(string)
+        try:
+            return np.array(list(map(token_ids.__getitem__, tokens)), dtype=np.int32)
+        except KeyError:
+            error = next(token for token in tokens if token not in token_ids)
+            if error[0] == MULTICHAR_SYMBOL and (len(error) == 1 or error[-1] != MULTICHAR_SYMBOL):
+                raise ValueError("Malformed string with unmatched underscores.") from None
+            raise ValueError(f"Unknown symbol: {error[1:-1] if error[0] == MULTICHAR_SYMBOL else error}") from None
+
+    def _compile_tokenizer(self):
+        """Build the regular expression and the ASCII lookup table used by tokenize()."""
+        symbols = sorted((symbol for symbol in self.mappings if symbol != MULTICHAR_SYMBOL), key=len, reverse=True)
+        single = [symbol for symbol in symbols if len(symbol) == 1]
+        # An enclosed symbol, a single-character symbol, or anything else (which is not in token_ids)
+        alternatives = [MULTICHAR_SYMBOL + "(?:" + "|".join(re.escape(symbol) for symbol in symbols) + ")" +
+                        MULTICHAR_SYMBOL]
+        if single:
+            alternatives.append("[" + "".join(re.escape(symbol) for symbol in single) + "]")
+        alternatives.append(f"{MULTICHAR_SYMBOL}[^{MULTICHAR_SYMBOL}]*{MULTICHAR_SYMBOL}?|.")
+        pattern = re.compile("|".join(alternatives), re.DOTALL)
+
+        token_ids = {MULTICHAR_SYMBOL + symbol + MULTICHAR_SYMBOL: self.mappings[symbol] for symbol in symbols}
+        token_ids.update({symbol: self.mappings[symbol] for symbol in single})
+        table = np.full(128, UNKNOWN_SYMBOL_ID, dtype=np.int32)
+        for symbol in single:
+            if symbol.isascii():
+                table[ord(symbol)] = self.mappings[symbol]
+        self._tokenizer = (len(self.mappings), pattern, token_ids, table)
 
     def get_id(self, symbol):
         """
@@ -0,0 +1,108 @@
+from typing import List
+
+import numpy as np
+
+from Utility.context_utils import match_brackets, visible_positions
+from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.SaC import ANY_SYMBOL_ID
+
+
+class BranchIndex:
+    def __init__(self, symbols, alphabet: Alphabet):
+        """
+        Index the branch structure of a word once, so scans can jump over whole branches.
+
+        For every position the index holds the position of the matching bracket, the branch depth, the "[" of the
+        branch holding it and the nearest position on either side that can be part of its context (see
+        get_contexts()). Following these links gives the context of a position in O(k + l) steps, however long the
+        branches in between are.
+
+        :param symbols: The string (or list of symbols, e.g. with multi-character symbols) to index.
+        :param alphabet: The alphabet providing the mappings and the ignore list.
+        """
+        self.alphabet = alphabet
+        self.symbol_ids = np.array([alphabet.mappings[symbol] for symbol in symbols], dtype=np.int32)
+        self.match = np.array(match_brackets(symbols), dtype=np.int64)
+        previous, following = visible_positions(symbols, alphabet, self.match.tolist())
+        self.previous = np.array(previous, dtype=np.int64)
+        self.next = np.array(following, dtype=np.int64)
+
+        # A bracket has the depth of the branch around it, the symbols between a matching pair are one deeper
+        opens = np.array([symbol == "[" for symbol in symbols], dtype=np.int64)
+        closes = np.array([symbol == "]" for symbol in symbols], dtype=np.int64)
+        self.depth = np.cumsum(opens) - opens - np.cumsum(closes)
+
+        # The "[" still open at every position, complete branches before the position are closed again
+        self.enclosing = np.full(len(symbols), -1, dtype=np.int64)
+        open_brackets = []
+        for i, symbol in enumerate(symbols):
+            if open_brackets:
+                self.enclosing[i] = open_brackets[-1]
+            if symbol == "[":
+                open_brackets.append(i)
+            elif symbol == "]" and open_brackets:
+                open_brackets.pop()
+
+    @staticmethod
+    def from_symbol_ids(symbol_ids, alphabet: Alphabet) -> 'BranchIndex':
+        """
+        Index a word given as symbol IDs.
+
+        :param symbol_ids: The symbol ID of every position.
+        :param alphabet: The alphabet of the word.
+        :return: A BranchIndex object.
+        """
+        return BranchIndex([alphabet.reverse_mappings[symbol_id] for symbol_id in np.asarray(symbol_ids).tolist()],
+                           alphabet)
+
+    def __len__(self) -> int:
+        return len(self.symbol_ids)
+
+    def left_context(self, index: int, k: int = -1) -> List[int]:
+        """
+        Get the left context of a position by following the previous visible positions.
+
+        :param index: The position.
+        :param k: The maximum length of the context (-1 for longest possible).
+        :return: The symbol IDs of the context, nearest symbol last, or [ANY_SYMBOL_ID] if there is none.
+        """
+        context = []
+        j = self.previous[index]
+        while j != -1 and (k == -1 or len(context) < k):
+            context.append(int(self.symbol_ids[j]))
+            j = self.previous[j]
+        context.reverse()
+        return context if context else [ANY_SYMBOL_ID]
+
+    def right_context(self, index: int, l: int = -1) -> List[int]:
+        """
+        Get the right context of a position by following the next visible positions.
+
+        :param index: The position.
+        :param l: The maximum length of the context (-1 for longest possible).
+        :return: The symbol IDs of the context, nearest symbol first, or [ANY_SYMBOL_ID] if there is none.
+        """
+        context = []
+        j = self.next[index]
+        while j != -1 and (l == -1 or len(context) < l):
+            context.append(int(self.symbol_ids[j]))
+            j = self.next[j]
+        return context if context else [ANY_SYMBOL_ID]
+
+    def skip_branch(self, index: int) -> int:
+        """
+        Jump over a branch.
+
+        :param index: A position.
+        :return: The position of the matching bracket if the position is a matched bracket, otherwise the position.
+        """
+        return int(self.match[index]) if self.match[index] != -1 else index
+
+    def branch_start(self, index: int) -> int:
+        """
+        Find the "[" that opens the branch holding a position.
+
+        :param index: A position.
+        :return: The position of the "[", or -1 if the position is not inside a branch.
+        """
+        return int(self.enclosing[index])
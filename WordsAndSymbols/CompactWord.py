@@ -0,0 +1,198 @@
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.ParameterTable import ParameterTable
+from WordsAndSymbols.SaC import SaC, EMPTY_SYMBOL_ID, EMPTY_SYMBOL, ANY_SYMBOL_ID, ANY_SYMBOL
+from WordsAndSymbols.SaCRegistry import SaCRegistry
+from WordsAndSymbols.Word import Word
+
+
+class CompactWord(Word):
+    def __init__(self, sac_ids, registry: SaCRegistry):
+        """
+        Initialize a Word stored as arrays of IDs instead of a list of SaC objects.
+
+        The SaC and symbol of every position are kept in int32 arrays and SaC objects are only looked up in the
+        registry when a position is accessed. The parameters are kept column by column in a ParameterTable.
+
+        :param sac_ids: The SaC ID of every position.
+        :param registry: The SaC registry the IDs refer to, usually the alphabet's.
+        """
+        self.registry = registry
+        self.sac_ids = np.asarray(sac_ids, dtype=np.int32)
+        self.symbol_ids = registry.symbol_ids()[self.sac_ids]
+        self.parameters = ParameterTable(len(self.sac_ids))
+        self._vectors = {}
+        self._sac_counts = None
+        self._symbol_counts = None
+        self.original_string = ""  # mainly for human analysis/debugging
+
+    @staticmethod
+    def from_string(string: str, alphabet: Alphabet, k: int, l: int) -> 'CompactWord':
+        """
+        Create a CompactWord from a string, see Word.from_string().
+
+        :param string: A string representation of the word.
+        :param alphabet: Alphabet class for the mapping, ignore list and SaC registry.
+        :param k: Maximum left context depth.
+        :param l: Maximum right context depth.
+        :return: A CompactWord object.
+        """
+        return CompactWord(Word.string_to_sac_ids(string, alphabet, k, l), alphabet.sac_registry)
+
+    @staticmethod
+    def from_word(word: Word, registry: SaCRegistry) -> 'CompactWord':
+        """
+        Create a CompactWord holding the same SaCs as a Word.
+
+        :param word: The Word to convert.
+        :param registry: The SaC registry to intern the word's SaCs in.
+        :return: A CompactWord object.
+        """
+        if word.sac_ids is not None and word.registry is registry:
+            compact = CompactWord(word.sac_ids, registry)
+        else:
+            compact = CompactWord([registry.intern_sac(sac) for sac in word.sacs], registry)
+        if isinstance(word.parameters, ParameterTable):
+            compact.parameters = word.parameters.copy()
+        else:
+            compact.parameters = ParameterTable.from_rows(word.parameters)
+        compact.original_string = word.original_string
+        return compact
+
+    @property
+    def sacs(self) -> List[SaC]:
+        """The SaC objects of the word. This builds a list, prefer indexing or the ID arrays for long words."""
+        return [self.registry[sac_id] for sac_id in self.sac_ids.tolist()]
+
+    @property
+    def sac_counts(self) -> Dict[SaC, int]:
+        if self._sac_counts is None:
+            self._sac_counts = self._count_sacs()
+        return self._sac_counts
+
+    @property
+    def symbol_counts(self) -> Dict[int, int]:
+        if self._symbol_counts is None:
+            self._symbol_counts = self._count_symbols()
+        return self._symbol_counts
+
+    def __len__(self) -> int:
+        """Return the number of symbols (SaCs) in the word."""
+        return len(self.sac_ids)
+
+    def __getitem__(self, index):
+        """Get the SaC object at the specified index, or a list of SaCs for a slice."""
+        if isinstance(index, slice):
+            return [self.registry[sac_id] for sac_id in self.sac_ids[index].tolist()]
+        return self.registry[int(self.sac_ids[index])]
+
+    def __iter__(self):
+        for sac_id in self.sac_ids.tolist():
+            yield self.registry[sac_id]
+
+    def __repr__(self) -> str:
+        """Provide a string representation of the Word for debugging."""
+        return f"CompactWord(sac_ids={self.sac_ids})"
+
+    def sacs_to_string(self, reverse_mapping: Dict[int, str]) -> str:
+        """
+        Convert the Word object to a string representation.
+
+        :param reverse_mapping: Dictionary mapping IDs back to characters.
+        :return: A string representation of the entire word.
+        """
+        lookup = {}
+        for symbol_id in np.unique(self.symbol_ids).tolist():
+            if symbol_id == EMPTY_SYMBOL_ID:
+                lookup[symbol_id] = EMPTY_SYMBOL
+            elif symbol_id == ANY_SYMBOL_ID:
+                lookup[symbol_id] = ANY_SYMBOL
+            else:
+                lookup[symbol_id] = reverse_mapping.get(symbol_id, "?")
+        return ''.join(map(lookup.__getitem__, self.symbol_ids.tolist()))
+
+    def add_sac(self, sac: SaC):
+        """Add a SaC object to the word. This copies the ID arrays, build long words in one step instead."""
+        sac_id = self.registry.intern_sac(sac)
+        self.sac_ids = np.append(self.sac_ids, np.int32(sac_id))
+        self.symbol_ids = np.append(self.symbol_ids, np.int32(sac.symbol))
+        self.parameters.append({})
+        self._vectors = {}
+        if self._sac_counts is not None:
+            self._sac_counts[self.registry[sac_id]] += 1
+        if self._symbol_counts is not None:
+            self._symbol_counts[sac.symbol] += 1
+
+    def append_word(self, other: Word):
+        """
+        Append another Word object to this Word.
+
+        :param other: Another Word object.
+        """
+        if not isinstance(other, CompactWord) or other.registry is not self.registry:
+            other = CompactWord.from_word(other, self.registry)
+        self.sac_ids = np.concatenate((self.sac_ids, other.sac_ids))
+        self.symbol_ids = np.concatenate((self.symbol_ids, other.symbol_ids))
+        self.parameters.extend(other.parameters)
+        self._vectors = {}
+        # Counts that were already computed are merged, the others are still computed on first use
+        if self._sac_counts is not None:
+            self._sac_counts.update(other.sac_counts)
+        if self._symbol_counts is not None:
+            self._symbol_counts.update(other.symbol_counts)
+
+    def revise_counts(self):
+        self._vectors = {}
+        self._sac_counts = None
+        self._symbol_counts = None
+
+    def sac_id_array(self) -> np.ndarray:
+        """Return the SaC ID of every position as an int32 array."""
+        return self.sac_ids
+
+    def symbol_id_array(self) -> np.ndarray:
+        """Return the symbol ID of every position as an int32 array."""
+        return self.symbol_ids
+
+    def find_by_symbol(self, symbol_id: int) -> List[int]:
+        """
+        Find all indices where the given symbol ID appears in the word.
+
+        :param symbol_id: The symbol ID to search for.
+        :return: A list of indices where the symbol appears.
+        """
+        return np.flatnonzero(self.symbol_ids == symbol_id).tolist()
+
+    def get_contexts(self, index: int) -> SaC:
+        """
+        Retrieve the SaC object at the given index.
+
+        :param index: Index of the desired SaC.
+        :return: The SaC object at the specified index.
+        """
+        if 0 <= index < len(self.sac_ids):
+            return self[index]
+        raise IndexError("Index out of bounds for Word.")
+
+    def _count_sacs(self) -> Counter:
+        """
+        Count the occurrences of each SaC in the word.
+
+        :return: A Counter where keys are SaCs and values are their counts.
+        """
+        counts = self.sac_count_vector(len(self.registry))
+        ids = np.flatnonzero(counts)
+        return Counter({self.registry[sac_id]: count for sac_id, count in zip(ids.tolist(), counts[ids].tolist())})
+
+    def _count_symbols(self) -> Counter:
+        """
+        Count the occurrences of each symbol in the word.
+
+        :return: A Counter where keys are symbol IDs and values are their counts.
+        """
+        ids, counts = np.unique(self.symbol_ids, return_counts=True)
+        return Counter(dict(zip(ids.tolist(), counts.tolist())))
@@ -0,0 +1,234 @@
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from ProductionRules.SuccessorTable import SuccessorTable
+from Utility.rolling_hash import combine
+from WordsAndSymbols.CompactWord import CompactWord
+from WordsAndSymbols.ParameterTable import ParameterTable
+from WordsAndSymbols.SaC import SaC
+from WordsAndSymbols.Word import Word
+
+
+class CompressedWord(Word):
+    def __init__(self, sac_ids, depth: int, successor_table: SuccessorTable):
+        """
+        Initialize a Word stored as a straight-line program: the expansion of a short word after some generations.
+
+        Generation n of a D0L-system is the expansion of the axiom after n generations, and the expansion of a SaC is
+        the concatenation of the expansions of its successor one generation shallower. Only the root word and the depth
+        are stored, everything else is derived from the per-depth tables of the shared SuccessorTable. The memory of a
+        list of generations is proportional to the rule set times the depth instead of the total string length.
+
+        :param sac_ids: The SaC IDs of the root word, usually the axiom.
+        :param depth: The number of generations the root word is expanded.
+        :param successor_table: The successor table of the D0L-system.
+        """
+        self.successor_table = successor_table
+        self.registry = successor_table.registry
+        self.sac_ids = np.asarray(sac_ids, dtype=np.int32)
+        self.depth = depth
+        self.length = int(successor_table.expansion_lengths(depth)[self.sac_ids].sum())  # May exceed sys.maxsize
+        self.parameters = ParameterTable(self.length)
+        self._vectors = {}
+        self._sac_counts = None
+        self._symbol_counts = None
+        self._content_hash = None
+        self.original_string = ""  # mainly for human analysis/debugging
+
+    @property
+    def sacs(self) -> List[SaC]:
+        """The SaC objects of the word. This expands the whole word, prefer indexing or chunks() for long words."""
+        return [self.registry[sac_id] for sac_id in self.sac_id_array().tolist()]
+
+    @property
+    def sac_counts(self) -> Dict[SaC, int]:
+        if self._sac_counts is None:
+            counts = self.sac_count_vector(len(self.registry))
+            ids = np.flatnonzero(counts).tolist()
+            self._sac_counts = Counter({self.registry[sac_id]: count for sac_id, count in zip(ids, counts[ids].tolist())})
+        return self._sac_counts
+
+    @property
+    def symbol_counts(self) -> Dict[int, int]:
+        if self._symbol_counts is None:
+            counts = Counter()
+            for sac, count in self.sac_counts.items():
+                counts[sac.symbol] += count
+            self._symbol_counts = counts
+        return self._symbol_counts
+
+    def __len__(self) -> int:
+        """Return the number of symbols (SaCs) in the word, use the length attribute if it may exceed sys.maxsize."""
+        return int(self.length)
+
+    def __getitem__(self, index):
+        """Get the SaC object at the specified index, or a list of SaCs for a slice, without expanding the word."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            sac_ids = self.successor_table.window(self.sac_ids, self.depth, start, stop)
+            return [self.registry[sac_id] for sac_id in sac_ids[::step].tolist()]
+        if index < 0:
+            index += self.length
+        return self.registry[self.successor_table.locate(self.sac_ids, self.depth, index)]
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            for sac_id in chunk.tolist():
+                yield self.registry[sac_id]
+
+    def __eq__(self, other):
+        """
+        Two compressed words are equal if they have the same symbols.
+
+        Words with a different length or content hash are rejected without expanding them. A matching hash can be a
+        collision, so it is confirmed by comparing the symbols chunk by chunk.
+        """
+        if not isinstance(other, CompressedWord):
+            return NotImplemented
+        if self.length != other.length or self.content_hash() != other.content_hash():
+            return False
+        if self.successor_table is other.successor_table and self.depth == other.depth and \
+                np.array_equal(self.sac_ids, other.sac_ids):
+            return True
+        return self._same_symbols(other)
+
+    def __hash__(self):
+        return hash(self.content_hash())
+
+    def __repr__(self) -> str:
+        """Provide a string representation of the Word for debugging."""
+        return f"CompressedWord(sac_ids={self.sac_ids}, depth={self.depth}, length={self.length})"
+
+    def chunks(self, chunk_size: int = 65536):
+        """
+        Expand the word depth first, chunk_size SaCs per level at a time.
+
+        :param chunk_size: The number of SaCs expanded at once on each level.
+        :return: A generator of SaC ID arrays that together form the word.
+        """
+        stack = [(self.sac_ids, self.depth, 0)]
+        while stack:
+            sac_ids, depth, position = stack.pop()
+            if depth == 0:
+                if len(sac_ids):
+                    yield sac_ids
+                continue
+            if position < len(sac_ids):
+                stack.append((sac_ids, depth, position + chunk_size))
+                stack.append((self.successor_table.apply(sac_ids[position:position + chunk_size]), depth - 1, 0))
+
+    def _same_symbols(self, other: 'CompressedWord') -> bool:
+        """Compare the symbols of two words of the same length, expanding both a chunk at a time."""
+        symbols, other_symbols = self.registry.symbol_ids(), other.registry.symbol_ids()
+        mine = (symbols[chunk] for chunk in self.chunks())
+        theirs = (other_symbols[chunk] for chunk in other.chunks())
+        a = b = np.zeros(0, dtype=np.int32)
+        while True:
+            if len(a) == 0:
+                a = next(mine, None)
+            if len(b) == 0:
+                b = next(theirs, None)
+            if a is None or b is None:
+                return a is None and b is None
+            n = min(len(a), len(b))
+            if not np.array_equal(a[:n], b[:n]):
+                return False
+            a, b = a[n:], b[n:]
+
+    def content_hash(self) -> tuple:
+        """
+        Return a rolling hash of the symbols of the word, combined from the hashes of the expansions of the root word.
+
+        :return: A tuple of two ints, see Utility.rolling_hash.
+        """
+        if self._content_hash is None:
+            hashes = self.successor_table.expansion_hashes(self.depth)[self.sac_ids]
+            lengths = self.successor_table.expansion_lengths(self.depth)[self.sac_ids]
+            self._content_hash = tuple(combine(hashes, lengths).tolist())
+        return self._content_hash
+
+    def sacs_to_string(self, reverse_mapping: Dict[int, str]) -> str:
+        """
+        Convert the Word object to a string representation.
+
+        :param reverse_mapping: Dictionary mapping IDs back to characters.
+        :return: A string representation of the entire word.
+        """
+        return ''.join(CompactWord(chunk, self.registry).sacs_to_string(reverse_mapping) for chunk in self.chunks())
+
+    def add_sac(self, sac: SaC):
+        raise TypeError("A CompressedWord is immutable, convert it with CompactWord.from_word() to modify it.")
+
+    def append_word(self, other: Word):
+        raise TypeError("A CompressedWord is immutable, convert it with CompactWord.from_word() to modify it.")
+
+    def revise_counts(self):
+        self._vectors = {}
+        self._sac_counts = None
+        self._symbol_counts = None
+
+    def sac_id_array(self) -> np.ndarray:
+        """Return the SaC ID of every position as an int32 array. This expands the whole word."""
+        chunks = list(self.chunks())
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int32)
+
+    def symbol_id_array(self) -> np.ndarray:
+        """Return the symbol ID of every position as an int32 array. This expands the whole word."""
+        return self.registry.symbol_ids()[self.sac_id_array()]
+
+    def sac_count_vector(self, num_sacs: int) -> np.ndarray:
+        """
+        Count the occurrences of each SaC from the successor table, without expanding the word.
+
+        :param num_sacs: The length of the vector, usually the number of SaCs in the registry.
+        :return: An array where entry i is the number of times SaC i occurs in the word.
+        """
+        key = ("sac_counts", num_sacs)
+        if key not in self._vectors:
+            counts = self.successor_table.expansion_counts(self.sac_ids, self.depth)
+            vector = np.zeros(num_sacs, dtype=counts.dtype)
+            size = min(num_sacs, len(counts))
+            vector[:size] = counts[:size]
+            self._vectors[key] = vector
+        return self._vectors[key]
+
+    def parikh_vector(self, num_symbols: int) -> np.ndarray:
+        """
+        Count the occurrences of each symbol from the successor table, without expanding the word.
+
+        Special symbols (AnySymbol, EmptySymbol) have negative IDs and are not counted.
+
+        :param num_symbols: The length of the vector, usually the number of symbols in the alphabet.
+        :return: An array where entry i is the number of times symbol i occurs in the word.
+        """
+        key = ("parikh", num_symbols)
+        if key not in self._vectors:
+            counts = self.successor_table.expansion_counts(self.sac_ids, self.depth)
+            symbol_ids = self.registry.symbol_ids()[:len(counts)]
+            counted = (symbol_ids >= 0) & (symbol_ids < num_symbols)
+            vector = np.zeros(num_symbols, dtype=counts.dtype)
+            np.add.at(vector, symbol_ids[counted], counts[counted])
+            self._vectors[key] = vector
+        return self._vectors[key]
+
+    def find_by_symbol(self, symbol_id: int) -> List[int]:
+        """
+        Find all indices where the given symbol ID appears in the word. This expands the whole word.
+
+        :param symbol_id: The symbol ID to search for.
+        :return: A list of indices where the symbol appears.
+        """
+        return np.flatnonzero(self.symbol_id_array() == symbol_id).tolist()
+
+    def get_contexts(self, index: int) -> SaC:
+        """
+        Retrieve the SaC object at the given index.
+
+        :param index: Index of the desired SaC.
+        :return: The SaC object at the specified index.
+        """
+        if 0 <= index < self.length:
+            return self[index]
+        raise IndexError("Index out of bounds for Word.")
@@ -0,0 +1,245 @@
+from collections.abc import MutableMapping
+from numbers import Number
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+
+class ParameterRow(MutableMapping):
+    def __init__(self, table: 'ParameterTable', index: int):
+        """
+        A dictionary view of the parameters of one position of a ParameterTable, changes are written to the table.
+
+        :param table: The table.
+        :param index: The position.
+        """
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, name):
+        if name not in self.table.masks or not self.table.masks[name][self.index]:
+            raise KeyError(name)
+        value = self.table.columns[name][self.index]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __setitem__(self, name, value):
+        self.table.set_value(self.index, name, value)
+
+    def __delitem__(self, name):
+        if name not in self.table.masks or not self.table.masks[name][self.index]:
+            raise KeyError(name)
+        self.table.masks[name][self.index] = False
+
+    def __iter__(self):
+        for name, mask in self.table.masks.items():
+            if mask[self.index]:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class ParameterTable:
+    def __init__(self, length: int = 0):
+        """
+        The parameters of every position of a word, stored column by column.
+
+        Every parameter name is a NumPy column with a mask of the positions where it is set. Integer and float values
+        are stored in int64 and float64 columns, any other value turns its column into an object column. The table
+        also behaves as a sequence of per-position dictionaries, so positions without parameters cost nothing and a
+        parametric rule can read and write the parameters of all matching positions at once.
+
+        :param length: The number of positions.
+        """
+        self.length = length
+        self.columns: Dict[str, np.ndarray] = {}
+        self.masks: Dict[str, np.ndarray] = {}
+        self._capacity = 0  # Columns are allocated for this many positions, so appending is amortised O(1)
+
+    @staticmethod
+    def from_rows(rows: Iterable[dict]) -> 'ParameterTable':
+        """
+        Create a table from a sequence of per-position dictionaries.
+
+        :param rows: The parameters of every position.
+        :return: A ParameterTable.
+        """
+        table = ParameterTable()
+        table.extend(rows)
+        return table
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> ParameterRow:
+        """Get a dictionary view of the parameters of a position."""
+        return ParameterRow(self, self._check_index(index))
+
+    def __setitem__(self, index: int, parameters: dict):
+        """Replace the parameters of a position."""
+        index = self._check_index(index)
+        for mask in self.masks.values():
+            mask[index] = False
+        for name, value in parameters.items():
+            self.set_value(index, name, value)
+
+    def __iter__(self):
+        """Iterate over the parameters of every position as dictionaries."""
+        if not self.columns:
+            for _ in range(self.length):
+                yield {}
+            return
+        for i in range(self.length):
+            yield {name: self.columns[name][i].item() if isinstance(self.columns[name][i], np.generic)
+                   else self.columns[name][i] for name, mask in self.masks.items() if mask[i]}
+
+    def __repr__(self) -> str:
+        return f"ParameterTable(length={self.length}, names={list(self.columns)})"
+
+    def names(self):
+        """Return the names of the parameters used by any position."""
+        return list(self.columns)
+
+    def is_empty(self) -> bool:
+        """Check if no position has any parameter."""
+        return not any(mask[:self.length].any() for mask in self.masks.values())
+
+    def copy(self) -> 'ParameterTable':
+        """Return an independent copy of the table."""
+        return self.take(np.arange(self.length))
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get the values of a parameter for all positions.
+
+        :param name: The parameter name.
+        :return: The values, positions where the parameter is not set hold 0 (or None for object columns).
+        """
+        if name not in self.columns:
+            return np.zeros(self.length)
+        return self.columns[name][:self.length]
+
+    def mask(self, name: str) -> np.ndarray:
+        """
+        Get the positions where a parameter is set.
+
+        :param name: The parameter name.
+        :return: A boolean array.
+        """
+        if name not in self.masks:
+            return np.zeros(self.length, dtype=bool)
+        return self.masks[name][:self.length]
+
+    def set_value(self, index: int, name: str, value):
+        """
+        Set one parameter of one position.
+
+        :param index: The position.
+        :param name: The parameter name.
+        :param value: The value.
+        """
+        index = self._check_index(index)
+        self._prepare_column(name, np.asarray([value]).dtype if isinstance(value, Number) else np.dtype(object))
+        self.columns[name][index] = value
+        self.masks[name][index] = True
+
+    def set_columns(self, positions: np.ndarray, columns: Dict[str, Union[np.ndarray, Number]]):
+        """
+        Set parameters of many positions at once.
+
+        :param positions: The positions.
+        :param columns: A value array (one value per position) or a single value for every parameter name.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        for name, values in columns.items():
+            values = np.asarray(values)
+            self._prepare_column(name, values.dtype)
+            self.columns[name][positions] = values
+            self.masks[name][positions] = True
+
+    def take(self, indices: np.ndarray) -> 'ParameterTable':
+        """
+        Gather the parameters of some positions into a new table.
+
+        :param indices: The positions, in the order of the new table.
+        :return: A ParameterTable with one position per index.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        table = ParameterTable(len(indices))
+        table._capacity = len(indices)
+        for name, values in self.columns.items():
+            table.columns[name] = values[indices]
+            table.masks[name] = self.masks[name][indices]
+        return table
+
+    def append(self, parameters: dict):
+        """
+        Add a position to the end of the table.
+
+        :param parameters: The parameters of the new position.
+        """
+        self._reserve(self.length + 1)
+        self.length += 1
+        for name, value in parameters.items():
+            self.set_value(self.length - 1, name, value)
+
+    def extend(self, other):
+        """
+        Add the positions of another table, or of a sequence of dictionaries, to the end of the table.
+
+        :param other: A ParameterTable or an iterable of dictionaries.
+        """
+        if not isinstance(other, ParameterTable):
+            for parameters in other:
+                self.append(parameters)
+            return
+
+        start = self.length
+        self._reserve(start + other.length)
+        self.length += other.length
+        for name, values in other.columns.items():
+            self._prepare_column(name, values.dtype)
+            self.columns[name][start:self.length] = values[:other.length]
+            self.masks[name][start:self.length] = other.masks[name][:other.length]
+
+    def _check_index(self, index: int) -> int:
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("Index out of bounds for parameters.")
+        return index
+
+    def _reserve(self, length: int):
+        """Make sure the columns have room for length positions."""
+        if length <= self._capacity:
+            return
+        self._capacity = max(length, 2 * self._capacity)
+        for name in self.columns:
+            self.columns[name] = self._resized(self.columns[name])
+            self.masks[name] = self._resized(self.masks[name])
+
+    def _resized(self, values: np.ndarray) -> np.ndarray:
+        resized = np.zeros(self._capacity, dtype=values.dtype) if values.dtype != object else \
+            np.full(self._capacity, None, dtype=object)
+        resized[:len(values)] = values[:self._capacity]
+        return resized
+
+    def _prepare_column(self, name: str, dtype: np.dtype):
+        """Create a column, or widen its dtype so it can hold values of the given dtype."""
+        if dtype == bool:
+            dtype = np.dtype(np.int64)
+        elif dtype.kind not in "iuf":
+            dtype = np.dtype(object)
+        if name not in self.columns:
+            self._capacity = max(self._capacity, self.length)
+            self.columns[name] = np.zeros(self._capacity, dtype=dtype) if dtype != object else \
+                np.full(self._capacity, None, dtype=object)
+            self.masks[name] = np.zeros(self._capacity, dtype=bool)
+            return
+        current = self.columns[name].dtype
+        widened = np.dtype(object) if object in (current, dtype) else np.promote_types(current, dtype)
+        if widened != current:
+            self.columns[name] = self.columns[name].astype(widened)
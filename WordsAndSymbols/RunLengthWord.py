@@ -0,0 +1,298 @@
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from Utility.context_utils import get_context_windows
+from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.ParameterTable import ParameterTable
+from WordsAndSymbols.SaC import SaC, EMPTY_SYMBOL_ID, EMPTY_SYMBOL, ANY_SYMBOL_ID, ANY_SYMBOL
+from WordsAndSymbols.SaCRegistry import SaCRegistry
+from WordsAndSymbols.Word import Word
+
+
+class RunLengthWord(Word):
+    def __init__(self, run_sac_ids, run_lengths, registry: SaCRegistry):
+        """
+        Initialize a Word stored as runs of repeated SaCs.
+
+        Every run is a SaC ID and a length, so memory and the work of the counts scale with the number of runs instead
+        of the number of symbols. Positions are found with a binary search over the ends of the runs. Adjacent runs of
+        the same SaC are merged and empty runs are dropped.
+
+        :param run_sac_ids: The SaC ID of every run.
+        :param run_lengths: The length of every run.
+        :param registry: The SaC registry the IDs refer to, usually the alphabet's.
+        """
+        run_sac_ids = np.asarray(run_sac_ids, dtype=np.int32)
+        run_lengths = np.asarray(run_lengths, dtype=np.int64)
+        keep = run_lengths > 0
+        run_sac_ids, run_lengths = run_sac_ids[keep], run_lengths[keep]
+        if len(run_sac_ids):
+            first = np.concatenate(([True], run_sac_ids[1:] != run_sac_ids[:-1]))
+            run_lengths = np.add.reduceat(run_lengths, np.flatnonzero(first))
+            run_sac_ids = run_sac_ids[first]
+
+        self.registry = registry
+        self.run_sac_ids = run_sac_ids
+        self.run_lengths = run_lengths
+        self.run_ends = np.cumsum(run_lengths)
+        self.parameters = ParameterTable(len(self))
+        self._vectors = {}
+        self._sac_counts = None
+        self._symbol_counts = None
+        self.original_string = ""  # mainly for human analysis/debugging
+
+    @staticmethod
+    def from_string(string: str, alphabet: Alphabet, k: int, l: int) -> 'RunLengthWord':
+        """
+        Create a RunLengthWord from a string, with the same SaCs as Word.from_string().
+
+        Inside a run of one symbol that is longer than k + l + 1 all positions but the first k and the last l have the
+        same contexts, so the contexts are found on a copy of the word where such runs are shortened to k + l + 1
+        symbols. Runs of brackets are kept, they change the branch structure. With k or l = -1 (longest possible
+        context) every position is kept.
+
+        :param string: A string representation of the word, multi-character symbols are enclosed in underscores.
+        :param alphabet: Alphabet class for the mapping, ignore list and SaC registry.
+        :param k: Maximum left context depth.
+        :param l: Maximum right context depth.
+        :return: A RunLengthWord object.
+        """
+        registry = alphabet.sac_registry
+        if k < 0 or l < 0:
+            word = RunLengthWord.from_word(Word.from_string(string, alphabet, k, l), registry)
+            word.original_string = string
+            return word
+
+        symbol_ids = alphabet.tokenize(string).astype(np.int64)
+        if len(symbol_ids) == 0:
+            return RunLengthWord([], [], registry)
+        starts = np.flatnonzero(np.concatenate(([True], symbol_ids[1:] != symbol_ids[:-1])))
+        lengths = np.diff(np.append(starts, len(symbol_ids)))
+        run_symbols = symbol_ids[starts]
+
+        # Shorten the long runs: the first k and last l positions keep their own SaC, the middle one stands for the rest
+        brackets = [alphabet.mappings[symbol] for symbol in ("[", "]") if symbol in alphabet.mappings]
+        window = k + l + 1
+        shortened = (lengths > window) & ~np.isin(run_symbols, brackets)
+        kept = np.where(shortened, window, lengths)
+        reduced_symbols = np.repeat(run_symbols, kept)
+        reduced_lengths = np.ones(len(reduced_symbols), dtype=np.int64)
+        middles = (np.cumsum(kept) - kept + k)[shortened]
+        reduced_lengths[middles] = lengths[shortened] - (window - 1)
+
+        left_contexts, right_contexts = get_context_windows(reduced_symbols.tolist(), alphabet, k, l)
+        identities = set(alphabet.identities_ids)
+        wildcard = (ANY_SYMBOL_ID,)
+        sac_ids = []
+        for left, symbol_id, right in zip(left_contexts, reduced_symbols.tolist(), right_contexts):
+            if symbol_id in identities:
+                left = right = wildcard
+            sac_ids.append(registry.intern_key((left, symbol_id, right)))
+
+        word = RunLengthWord(sac_ids, reduced_lengths, registry)
+        word.original_string = string
+        return word
+
+    @staticmethod
+    def from_word(word: Word, registry: SaCRegistry) -> 'RunLengthWord':
+        """
+        Create a RunLengthWord holding the same SaCs as a Word.
+
+        :param word: The Word to convert.
+        :param registry: The SaC registry to intern the word's SaCs in.
+        :return: A RunLengthWord object.
+        """
+        if word.sac_ids is None or word.registry is not registry:
+            sac_ids = [registry.intern_sac(sac) for sac in word.sacs]
+            run_length_word = RunLengthWord(sac_ids, np.ones(len(sac_ids), dtype=np.int64), registry)
+        else:
+            run_length_word = RunLengthWord(*word.runs(), registry)
+        if isinstance(word.parameters, ParameterTable):
+            run_length_word.parameters = word.parameters.copy()
+        else:
+            run_length_word.parameters = ParameterTable.from_rows(word.parameters)
+        run_length_word.original_string = word.original_string
+        return run_length_word
+
+    @property
+    def sac_ids(self) -> np.ndarray:
+        """The SaC ID of every position. This expands the runs, prefer runs() for long words."""
+        return self.sac_id_array()
+
+    @property
+    def sacs(self) -> List[SaC]:
+        """The SaC objects of the word. This expands the runs into a list, prefer runs() for long words."""
+        return [self.registry[sac_id] for sac_id in self.sac_id_array().tolist()]
+
+    @property
+    def sac_counts(self) -> Dict[SaC, int]:
+        if self._sac_counts is None:
+            self._sac_counts = self._count_sacs()
+        return self._sac_counts
+
+    @property
+    def symbol_counts(self) -> Dict[int, int]:
+        if self._symbol_counts is None:
+            self._symbol_counts = self._count_symbols()
+        return self._symbol_counts
+
+    def __len__(self) -> int:
+        """Return the number of symbols (SaCs) in the word."""
+        return int(self.run_ends[-1]) if len(self.run_ends) else 0
+
+    def __getitem__(self, index):
+        """Get the SaC object at the specified index, or a list of SaCs for a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Index out of bounds for Word.")
+        return self.registry[int(self.run_sac_ids[np.searchsorted(self.run_ends, index, side="right")])]
+
+    def __iter__(self):
+        for sac_id, length in zip(self.run_sac_ids.tolist(), self.run_lengths.tolist()):
+            sac = self.registry[sac_id]
+            for _ in range(length):
+                yield sac
+
+    def __repr__(self) -> str:
+        """Provide a string representation of the Word for debugging."""
+        return f"RunLengthWord(run_sac_ids={self.run_sac_ids}, run_lengths={self.run_lengths})"
+
+    def sacs_to_string(self, reverse_mapping: Dict[int, str]) -> str:
+        """
+        Convert the Word object to a string representation.
+
+        :param reverse_mapping: Dictionary mapping IDs back to characters.
+        :return: A string representation of the entire word.
+        """
+        parts = []
+        for sac_id, length in zip(self.run_sac_ids.tolist(), self.run_lengths.tolist()):
+            symbol_id = self.registry[sac_id].symbol
+            if symbol_id == EMPTY_SYMBOL_ID:
+                symbol_str = EMPTY_SYMBOL
+            elif symbol_id == ANY_SYMBOL_ID:
+                symbol_str = ANY_SYMBOL
+            else:
+                symbol_str = reverse_mapping.get(symbol_id, "?")
+            parts.append(symbol_str * length)
+        return ''.join(parts)
+
+    def add_sac(self, sac: SaC):
+        """Add a SaC object to the word, extending the last run if it holds the same SaC."""
+        sac_id = self.registry.intern_sac(sac)
+        parameters = self.parameters
+        self.__init__(np.append(self.run_sac_ids, np.int32(sac_id)), np.append(self.run_lengths, 1), self.registry)
+        parameters.append({})
+        self.parameters = parameters
+
+    def append_word(self, other: Word):
+        """
+        Append another Word object to this Word.
+
+        :param other: Another Word object.
+        """
+        if not isinstance(other, RunLengthWord) or other.registry is not self.registry:
+            other = RunLengthWord.from_word(other, self.registry)
+        parameters = self.parameters
+        self.__init__(np.concatenate((self.run_sac_ids, other.run_sac_ids)),
+                      np.concatenate((self.run_lengths, other.run_lengths)), self.registry)
+        parameters.extend(other.parameters)
+        self.parameters = parameters
+
+    def revise_counts(self):
+        self._vectors = {}
+        self._sac_counts = None
+        self._symbol_counts = None
+
+    def runs(self):
+        """
+        Return the runs of the word.
+
+        :return: A tuple (sac_ids, lengths) of arrays with the SaC ID and the length of every run.
+        """
+        return self.run_sac_ids, self.run_lengths
+
+    def run_symbol_ids(self) -> np.ndarray:
+        """Return the symbol ID of every run as an int32 array."""
+        return self.registry.symbol_ids()[self.run_sac_ids]
+
+    def sac_id_array(self) -> np.ndarray:
+        """Return the SaC ID of every position as an int32 array. This expands the runs."""
+        return np.repeat(self.run_sac_ids, self.run_lengths)
+
+    def symbol_id_array(self) -> np.ndarray:
+        """Return the symbol ID of every position as an int32 array. This expands the runs."""
+        return np.repeat(self.run_symbol_ids(), self.run_lengths)
+
+    def sac_count_vector(self, num_sacs: int) -> np.ndarray:
+        """
+        Count the occurrences of each SaC as a dense vector indexed by SaC ID, without expanding the runs.
+
+        :param num_sacs: The length of the vector, usually the size of the SaC registry.
+        :return: An int64 array where entry i is the number of times SaC i occurs in the word.
+        """
+        key = ("sac_counts", num_sacs)
+        if key not in self._vectors:
+            self._vectors[key] = np.bincount(self.run_sac_ids, weights=self.run_lengths,
+                                             minlength=num_sacs).astype(np.int64)
+        return self._vectors[key]
+
+    def parikh_vector(self, num_symbols: int) -> np.ndarray:
+        """
+        Count the occurrences of each symbol (the Parikh vector), without expanding the runs.
+
+        :param num_symbols: The length of the vector, usually the number of symbols in the alphabet.
+        :return: An int64 array where entry i is the number of times symbol i occurs in the word.
+        """
+        key = ("parikh", num_symbols)
+        if key not in self._vectors:
+            symbol_ids = self.run_symbol_ids()
+            counted = symbol_ids >= 0
+            self._vectors[key] = np.bincount(symbol_ids[counted], weights=self.run_lengths[counted],
+                                             minlength=num_symbols).astype(np.int64)
+        return self._vectors[key]
+
+    def find_by_symbol(self, symbol_id: int) -> List[int]:
+        """
+        Find all indices where the given symbol ID appears in the word.
+
+        :param symbol_id: The symbol ID to search for.
+        :return: A list of indices where the symbol appears.
+        """
+        return np.flatnonzero(self.symbol_id_array() == symbol_id).tolist()
+
+    def get_contexts(self, index: int) -> SaC:
+        """
+        Retrieve the SaC object at the given index.
+
+        :param index: Index of the desired SaC.
+        :return: The SaC object at the specified index.
+        """
+        if 0 <= index < len(self):
+            return self[index]
+        raise IndexError("Index out of bounds for Word.")
+
+    def _count_sacs(self) -> Counter:
+        """
+        Count the occurrences of each SaC in the word.
+
+        :return: A Counter where keys are SaCs and values are their counts.
+        """
+        counts = self.sac_count_vector(len(self.registry))
+        ids = np.flatnonzero(counts)
+        return Counter({self.registry[sac_id]: count for sac_id, count in zip(ids.tolist(), counts[ids].tolist())})
+
+    def _count_symbols(self) -> Counter:
+        """
+        Count the occurrences of each symbol in the word.
+
+        :return: A Counter where keys are symbol IDs and values are their counts.
+        """
+        counts = Counter()
+        for symbol_id, length in zip(self.run_symbol_ids().tolist(), self.run_lengths.tolist()):
+            counts[symbol_id] += length
+        return counts
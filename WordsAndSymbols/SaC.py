@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Tuple, Union
 
 ANY_SYMBOL = "*"
 EMPTY_SYMBOL = "λ"
@@ -7,6 +7,20 @@ ANY_SYMBOL_ID = -1  # Special ID for AnySymbol
 EMPTY_SYMBOL_ID = -2  # Special ID for EmptySymbol
 MULTICHAR_SYMBOL_ID = -3  # Special ID for Multchar_Symbol
 
+def canonical_context(context: List[int]) -> Tuple[int, ...]:
+    """
+    Convert a context into the hashable form used to identify SaCs.
+
+    An empty context, AnySymbol and EmptySymbol all match each other under SaC equality, so they collapse to
+    (ANY_SYMBOL_ID,).
+
+    :param context: List of IDs representing a context.
+    :return: The context as a tuple.
+    """
+    if not context or context == [ANY_SYMBOL_ID] or context == [EMPTY_SYMBOL_ID]:
+        return (ANY_SYMBOL_ID,)
+    return tuple(context)
+
 class SaC:
 
     def __init__(self, left_context: List[int], symbol: int, right_context: List[int]):
@@ -20,6 +34,15 @@ class SaC:
         self.left_context = left_context
         self.symbol = symbol
         self.right_context = right_context
+        self.id = None  # Set when the SaC is interned in a SaCRegistry
+
+    def key(self) -> Tuple[Tuple[int, ...], int, Tuple[int, ...]]:
+        """
+        Return the canonical (left context, symbol, right context) key of the SaC.
+
+        :return: A hashable key where wildcard contexts are collapsed to (ANY_SYMBOL_ID,).
+        """
+        return canonical_context(self.left_context), self.symbol, canonical_context(self.right_context)
 
     def __eq__(self, other):
         if not isinstance(other, SaC):
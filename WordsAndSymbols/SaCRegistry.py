@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from WordsAndSymbols.SaC import SaC
+
+
+class SaCRegistry:
+    def __init__(self):
+        """
+        Initialize an empty registry of SaCs.
+
+        Every distinct (left context, symbol, right context) is stored once and given a dense integer ID, in the order
+        the SaCs are first seen. Words built from the same alphabet share the registry, so a SaC can be identified by
+        its ID instead of being compared with the wildcard-aware SaC equality.
+        """
+        self.sacs: List[SaC] = []
+        self._ids: Dict[Tuple, int] = {}
+        self._symbol_ids = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        """Return the number of distinct SaCs in the registry."""
+        return len(self.sacs)
+
+    def __getitem__(self, sac_id: int) -> SaC:
+        """Get the SaC with the given ID."""
+        return self.sacs[sac_id]
+
+    def intern(self, left_context: List[int], symbol: int, right_context: List[int]) -> int:
+        """
+        Return the ID of a SaC, adding it to the registry if it is new.
+
+        :param left_context: List of IDs representing the left context.
+        :param symbol: The central symbol as an ID.
+        :param right_context: List of IDs representing the right context.
+        :return: The ID of the SaC.
+        """
+        sac = SaC(left_context, symbol, right_context)
+        sac_id = self._ids.get(sac.key())
+        if sac_id is None:
+            sac_id = self._add(sac)
+        return sac_id
+
+    def intern_key(self, key: Tuple) -> int:
+        """
+        Return the ID of the SaC with a canonical key (see SaC.key()), adding it to the registry if it is new.
+
+        This avoids building a SaC object for SaCs that are already in the registry.
+
+        :param key: A (left context, symbol, right context) tuple with canonical contexts.
+        :return: The ID of the SaC.
+        """
+        sac_id = self._ids.get(key)
+        if sac_id is None:
+            left_context, symbol, right_context = key
+            sac_id = self._add(SaC(list(left_context), symbol, list(right_context)))
+        return sac_id
+
+    def intern_sac(self, sac: SaC) -> int:
+        """
+        Return the ID of an existing SaC object, adding it to the registry if it is new.
+
+        :param sac: The SaC to intern.
+        :return: The ID of the SaC.
+        """
+        sac_id = self.get_id(sac)
+        if sac_id is None:
+            sac_id = self._add(sac)
+        return sac_id
+
+    def get_id(self, sac: SaC) -> Optional[int]:
+        """
+        Look up the ID of a SaC.
+
+        :param sac: The SaC to look up.
+        :return: The ID of the SaC, or None if it is not in the registry.
+        """
+        if sac.id is not None and sac.id < len(self.sacs) and self.sacs[sac.id] is sac:
+            return sac.id
+        return self._ids.get(sac.key())
+
+    def symbol_ids(self) -> np.ndarray:
+        """
+        Return the symbol ID of every SaC in the registry, indexed by SaC ID.
+
+        :return: An int32 array, so the symbols of a word's SaC ID array can be gathered in one step.
+        """
+        if len(self._symbol_ids) != len(self.sacs):
+            self._symbol_ids = np.fromiter((sac.symbol for sac in self.sacs), dtype=np.int32, count=len(self.sacs))
+        return self._symbol_ids
+
+    def _add(self, sac: SaC) -> int:
+        sac_id = len(self.sacs)
+        sac.id = sac_id
+        self.sacs.append(sac)
+        self._ids[sac.key()] = sac_id
+        return sac_id
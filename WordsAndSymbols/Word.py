@@ -1,8 +1,14 @@
+from collections import Counter
 from typing import List, Dict
 
+import numpy as np
+
 from WordsAndSymbols.Alphabet import Alphabet
+from WordsAndSymbols.BranchIndex import BranchIndex
+from WordsAndSymbols.ParameterTable import ParameterTable
+from WordsAndSymbols.SaCRegistry import SaCRegistry
 from WordsAndSymbols.SaC import SaC, EMPTY_SYMBOL_ID, EMPTY_SYMBOL, ANY_SYMBOL_ID, ANY_SYMBOL, MULTICHAR_SYMBOL
-from Utility.context_utils import get_context
+from Utility.context_utils import get_contexts, get_context_windows
 
 class Word:
     #ANY_SYMBOL = "*"
@@ -10,13 +16,18 @@ class Word:
     #ANY_SYMBOL_ID = -1  # Special ID for AnySymbol
     #EMPTY_SYMBOL_ID = -2  # Special ID for EmptySymbol
 
-    def __init__(self, sacs: List[SaC]):
+    def __init__(self, sacs: List[SaC], sac_ids: List[int] = None, registry: SaCRegistry = None):
         """       Initialize a Word object as a collection of SaC objects.
 
         :param sacs: List of SaC objects representing the word.
+        :param sac_ids: Optional list of the SaCs' IDs in the alphabet's SaC registry.
+        :param registry: The SaC registry the IDs refer to. Without it the IDs are dropped when the word is extended.
         """
         self.sacs = sacs
-        self.parameters = [{} for _ in sacs]  # Dictionary of parameters for each position
+        self.sac_ids = sac_ids
+        self.registry = registry
+        self.parameters = ParameterTable(len(sacs))  # Parameters of each position, stored column by column
+        self._vectors = {}  # Cached count vectors, see sac_count_vector() and parikh_vector()
         self.sac_counts = self._count_sacs()
         self.symbol_counts = self._count_symbols()
         self.original_string = "" # mainly for human analysis/debugging
@@ -62,41 +73,67 @@ class Word:
         :param l: Maximum right context depth.
         :return: A Word object.
         """
-        sac_list = []
-        idx = 0
-
-        while idx < len(string):
-            if string[idx] == MULTICHAR_SYMBOL:
-                # Multi-character symbol
-                end = string.find(MULTICHAR_SYMBOL, idx + 1)
-                if end == -1:
-                    raise ValueError("Malformed string with unmatched underscores.")
-                multi_char_symbol = string[idx + 1:end]
-                if multi_char_symbol not in alphabet.mappings:
-                    raise ValueError(f"Unknown symbol: {multi_char_symbol}")
-                symbol_id = alphabet.mappings[multi_char_symbol]
-                lc, s, rc = get_context(string=string, index=idx, k=k, l=l, alphabet=alphabet)
-                sac_list.append(SaC(lc, symbol_id, rc))
-                idx = end + 1
+        sac_ids = Word.string_to_sac_ids(string, alphabet, k, l)
+        sac_list = [alphabet.sac_registry[sac_id] for sac_id in sac_ids]
+        return Word(sac_list, sac_ids, alphabet.sac_registry)
+
+    @staticmethod
+    def tokenize(string: str, alphabet: Alphabet) -> List[str]:
+        """
+        Split a string into its symbols.
+
+        :param string: A string representation of the word, multi-character symbols are enclosed in underscores.
+        :param alphabet: Alphabet class for the mapping.
+        :return: A list with the symbol of every position.
+        """
+        return [alphabet.reverse_mappings[symbol_id] for symbol_id in alphabet.tokenize(string).tolist()]
+
+    @staticmethod
+    def string_to_sac_ids(string: str, alphabet: Alphabet, k: int, l: int) -> List[int]:
+        """
+        Convert a string to the IDs of its SaCs, interning them in the alphabet's SaC registry.
+
+        :param string: A string representation of the word, multi-character symbols are enclosed in underscores.
+        :param alphabet: Alphabet class for the mapping and ignore list.
+        :param k: Maximum left context depth.
+        :param l: Maximum right context depth.
+        :return: A list with the SaC ID of every position.
+        """
+        symbol_ids = alphabet.tokenize(string).tolist()
+        registry = alphabet.sac_registry
+        identities = set(alphabet.identities_ids)
+        wildcard = (ANY_SYMBOL_ID,)
+
+        # The contexts of all positions are found together, multi-character symbols count as one symbol
+        if k >= 0 and l >= 0:
+            left_contexts, right_contexts = get_context_windows(symbol_ids, alphabet, k, l)
+            return [registry.intern_key((wildcard, symbol_id, wildcard) if symbol_id in identities else
+                                        (left, symbol_id, right))
+                    for left, symbol_id, right in zip(left_contexts, symbol_ids, right_contexts)]
+
+        symbols = [alphabet.reverse_mappings[symbol_id] for symbol_id in symbol_ids]
+        left_contexts, right_contexts = get_contexts(symbols, alphabet, k=k, l=l)
+        sac_ids = []
+        for i, symbol_id in enumerate(symbol_ids):
+            if symbol_id not in identities:
+                sac_ids.append(registry.intern(left_contexts[i], symbol_id, right_contexts[i]))
             else:
-                single_char_symbol = string[idx]
-                if single_char_symbol not in alphabet.mappings:
-                    raise ValueError(f"Unknown symbol: {single_char_symbol}")
-                symbol_id = alphabet.mappings[single_char_symbol]
-                if single_char_symbol not in alphabet.identities:
-                    lc, s, rc = get_context(string=string, index=idx, k=k, l=l, alphabet=alphabet)
-                    sac_list.append(SaC(lc, symbol_id, rc))
-                else:
-                    sac_list.append(SaC([ANY_SYMBOL_ID], symbol_id, [ANY_SYMBOL_ID]))
-                idx += 1
+                sac_ids.append(registry.intern([ANY_SYMBOL_ID], symbol_id, [ANY_SYMBOL_ID]))
 
-        return Word(sac_list)
+        return sac_ids
 
     def add_sac(self, sac: SaC):
-        """Add a SaC object to the word."""
+        """Add a SaC object to the word, updating the counts with the new SaC's contribution."""
         self.sacs.append(sac)
-        self.parameters.append({})  # Add a new dictionary for the new position
-        self.sac_counts = self._count_sacs()
+        if self.sac_ids is not None:
+            if self.registry is None:
+                self.sac_ids = None  # The SaC's ID may be from another registry, so the IDs no longer cover the word
+            else:
+                self.sac_ids.append(self.registry.intern_sac(sac))
+        self.parameters.append({})  # Add an empty row for the new position
+        self._vectors = {}
+        self.sac_counts[sac] += 1
+        self.symbol_counts[sac.symbol] += 1
 
     def find_by_symbol(self, symbol_id: int) -> List[int]:
         """
@@ -125,36 +162,114 @@ class Word:
         :param other: Another Word object.
         """
         self.sacs.extend(other.sacs)
+        if self.sac_ids is None or self.registry is None:
+            self.sac_ids = None
+        elif other.sac_ids is not None and other.registry is self.registry:
+            self.sac_ids.extend(other.sac_ids)
+        else:
+            self.sac_ids.extend(self.registry.intern_sac(sac) for sac in other.sacs)
         self.parameters.extend(other.parameters)
-        self.sac_counts = self._count_sacs()
+        self._vectors = {}
+        self.sac_counts.update(other.sac_counts)
+        self.symbol_counts.update(other.symbol_counts)
 
     def revise_counts(self):
+        self._vectors = {}
         self.sac_counts = self._count_sacs()
         self.symbol_counts = self._count_symbols()
 
-    def _count_sacs(self) -> Dict[SaC, int]:
+    def sac_id_array(self) -> np.ndarray:
         """
-        Count the occurrences of each symbol in the word.
+        Return the SaC ID of every position as an int32 array.
 
-        :return: A dictionary where keys are symbol IDs and values are their counts.
+        :return: The SaC IDs, the word's SaCs must be interned in a SaC registry.
         """
-        counts = {}
-        for sac in self.sacs:
-            counts[sac] = counts.get(sac,0)+1
+        if self.sac_ids is None:
+            raise ValueError("The SaCs of the word are not interned in a SaC registry.")
+        if "sac_ids" not in self._vectors:
+            self._vectors["sac_ids"] = np.asarray(self.sac_ids, dtype=np.int32)
+        return self._vectors["sac_ids"]
 
-        return counts
+    def symbol_id_array(self) -> np.ndarray:
+        """
+        Return the symbol ID of every position as an int32 array.
 
-    def _count_symbols(self) -> Dict[int, int]:
+        :return: The symbol IDs.
         """
-        Count the occurrences of each symbol in the word.
+        if "symbol_ids" not in self._vectors:
+            self._vectors["symbol_ids"] = np.fromiter((sac.symbol for sac in self.sacs), dtype=np.int32,
+                                                      count=len(self.sacs))
+        return self._vectors["symbol_ids"]
 
-        :return: A dictionary where keys are symbol IDs and values are their counts.
+    def branch_index(self, alphabet: Alphabet) -> BranchIndex:
         """
-        counts = {}
-        for sac in self.sacs:
-            counts[sac.symbol] = counts.get(sac.symbol,0)+1
+        Return the index of the word's branch structure, built on first use.
+
+        :param alphabet: The alphabet of the word.
+        :return: A BranchIndex with the matching brackets, branch depths and context links of every position.
+        """
+        if "branch_index" not in self._vectors:
+            self._vectors["branch_index"] = BranchIndex.from_symbol_ids(self.symbol_id_array(), alphabet)
+        return self._vectors["branch_index"]
+
+    def runs(self):
+        """
+        Split the word into runs of repeated SaCs.
+
+        :return: A tuple (sac_ids, lengths) of arrays with the SaC ID and the length of every run.
+        """
+        sac_ids = self.sac_id_array()
+        if len(sac_ids) == 0:
+            return sac_ids, np.zeros(0, dtype=np.int64)
+        starts = np.flatnonzero(np.concatenate(([True], sac_ids[1:] != sac_ids[:-1])))
+        return sac_ids[starts], np.diff(np.append(starts, len(sac_ids))).astype(np.int64)
+
+    def sac_count_vector(self, num_sacs: int) -> np.ndarray:
+        """
+        Count the occurrences of each SaC as a dense vector indexed by SaC ID.
+
+        :param num_sacs: The length of the vector, usually the size of the SaC registry.
+        :return: An int64 array where entry i is the number of times SaC i occurs in the word.
+        """
+        key = ("sac_counts", num_sacs)
+        if key not in self._vectors:
+            self._vectors[key] = np.bincount(self.sac_id_array(), minlength=num_sacs)
+        return self._vectors[key]
+
+    def parikh_vector(self, num_symbols: int) -> np.ndarray:
+        """
+        Count the occurrences of each symbol (the Parikh vector) as a dense vector indexed by symbol ID.
+
+        Special symbols (AnySymbol, EmptySymbol) have negative IDs and are not counted.
+
+        :param num_symbols: The length of the vector, usually the number of symbols in the alphabet.
+        :return: An int64 array where entry i is the number of times symbol i occurs in the word.
+        """
+        key = ("parikh", num_symbols)
+        if key not in self._vectors:
+            symbol_ids = self.symbol_id_array()
+            self._vectors[key] = np.bincount(symbol_ids[symbol_ids >= 0], minlength=num_symbols)
+        return self._vectors[key]
+
+    def _count_sacs(self) -> Counter:
+        """
+        Count the occurrences of each SaC in the word.
 
-        return counts
+        :return: A Counter where keys are SaCs and values are their counts.
+        """
+        if self.sac_ids is None:
+            return Counter(self.sacs)
+        # Count the IDs, which avoids hashing SaC objects, then key the counts by the SaCs
+        sac_of_id = dict(zip(self.sac_ids, self.sacs))
+        return Counter({sac_of_id[sac_id]: count for sac_id, count in Counter(self.sac_ids).items()})
+
+    def _count_symbols(self) -> Counter:
+        """
+        Count the occurrences of each symbol in the word.
+
+        :return: A Counter where keys are symbol IDs and values are their counts.
+        """
+        return Counter(sac.symbol for sac in self.sacs)
 
     def display(self, reverse_mapping: Dict[int, str], mode: str = "string") -> None:
         """
@@ -0,0 +1,77 @@
+from typing import List
+
+from WordsAndSymbols.CompactWord import CompactWord
+from WordsAndSymbols.ParameterTable import ParameterTable
+from WordsAndSymbols.SaC import SaC
+from WordsAndSymbols.SaCRegistry import SaCRegistry
+from WordsAndSymbols.Word import Word
+
+
+class WordBuilder:
+    def __init__(self, registry: SaCRegistry = None):
+        """
+        Collect the SaCs of a word one at a time and count them only once, when the word is built.
+
+        Appending to a Word keeps its counts up to date after every call. When a long word is produced symbol by
+        symbol (e.g. one generation of an L-system) it is cheaper to build it here and count once at the end.
+
+        :param registry: The SaC registry to keep the SaC IDs in, without it the built word has no IDs.
+        """
+        self.registry = registry
+        self.sacs: List[SaC] = []
+        self.sac_ids = [] if registry is not None else None
+        self.parameters = ParameterTable()
+
+    def __len__(self) -> int:
+        """Return the number of symbols (SaCs) added so far."""
+        return len(self.sacs)
+
+    def add_sac(self, sac: SaC, parameters: dict = None):
+        """
+        Add a SaC object to the end of the word.
+
+        :param sac: The SaC to add.
+        :param parameters: Optional parameters of the new position.
+        """
+        self.sacs.append(sac)
+        if self.sac_ids is not None:
+            self.sac_ids.append(self.registry.intern_sac(sac))
+        self.parameters.append(parameters if parameters is not None else {})
+
+    def append_word(self, word: Word):
+        """
+        Add all SaCs of a word to the end of the word.
+
+        :param word: The Word to append.
+        """
+        self.sacs.extend(word.sacs)
+        if self.sac_ids is not None:
+            if word.sac_ids is not None and word.registry is self.registry:
+                self.sac_ids.extend(word.sac_ids)
+            else:
+                self.sac_ids.extend(self.registry.intern_sac(sac) for sac in word.sacs)
+        self.parameters.extend(word.parameters)  # Copies the values
+
+    def build(self) -> Word:
+        """
+        Finalise the word, its counts are computed once here.
+
+        :return: A Word holding the collected SaCs.
+        """
+        word = Word(self.sacs, self.sac_ids, self.registry)
+        word.parameters = self.parameters
+        return word
+
+    def build_compact(self, registry: SaCRegistry) -> CompactWord:
+        """
+        Finalise the word as a CompactWord, its counts are computed on first use.
+
+        :param registry: The SaC registry the SaCs belong to.
+        :return: A CompactWord holding the collected SaCs.
+        """
+        if self.sac_ids is not None and registry is self.registry:
+            word = CompactWord(self.sac_ids, registry)
+        else:
+            word = CompactWord([registry.intern_sac(sac) for sac in self.sacs], registry)
+        word.parameters = self.parameters
+        return word